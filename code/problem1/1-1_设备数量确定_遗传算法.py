@@ -1,8 +1,6 @@
 import numpy as np
 import random
 from itertools import combinations
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 
 # 定义点的坐标
 coordinates = {
@@ -57,10 +55,19 @@ def genetic_algorithm(coordinates, target_point_count=4, population_size=7, gene
     best_chromosome = max(population, key=fitness)
     return best_chromosome
 
-# 执行算法，获取最佳染色体
-best_solution = genetic_algorithm(coordinates)
-selected_points = [key for key, val in zip(coordinates.keys(), best_solution) if val == 1]
-print("Selected points:", selected_points)
 
-# 可视化结果
-fig = plt.figure()
+def main():
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
+
+    # 执行算法，获取最佳染色体
+    best_solution = genetic_algorithm(coordinates)
+    selected_points = [key for key, val in zip(coordinates.keys(), best_solution) if val == 1]
+    print("Selected points:", selected_points)
+
+    # 可视化结果
+    fig = plt.figure()
+
+
+if __name__ == '__main__':
+    main()
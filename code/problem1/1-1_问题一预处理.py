@@ -1,6 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 
 # 声速常量，单位为米/秒
 v_sound = 340
@@ -37,27 +35,36 @@ coordinates = {
     'G': (110.047, 27.121, 575),
 }
 
-# 创建三维图表
-fig = plt.figure(figsize=(10, 8))
-ax = fig.add_subplot(111, projection='3d')
-
-# 绘制监测点
-for coordinate, data in coordinates.items():
-    lon, lat, elev = data
-    ax.scatter([lon], [lat], [elev], color='red', s=100)
-
-# 绘制监测点之间的近似间隔
-for coordinate1, data1 in coordinates.items():
-    for coordinate2, data2 in coordinates.items():
-        if coordinate1 < coordinate2:
-            lon1, lat1, elev1 = data1
-            lon2, lat2, elev2 = data2
-            clearance_m = count_clearance(lat1, lon1, lat2, lon2)
-            ax.plot([lon1, lon2], [lat1, lat2], [elev1, elev2], color='gray', linestyle=':')
-
-# 设置坐标轴标签和图表标题
-ax.set_xlabel('Longitude')
-ax.set_ylabel('Latitude')
-ax.set_zlabel('Elevation (m)')
-plt.title('Monitoring coordinates and Approximate clearances')
-plt.show()
+
+def main():
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
+
+    # 创建三维图表
+    fig = plt.figure(figsize=(10, 8))
+    ax = fig.add_subplot(111, projection='3d')
+
+    # 绘制监测点
+    for coordinate, data in coordinates.items():
+        lon, lat, elev = data
+        ax.scatter([lon], [lat], [elev], color='red', s=100)
+
+    # 绘制监测点之间的近似间隔
+    for coordinate1, data1 in coordinates.items():
+        for coordinate2, data2 in coordinates.items():
+            if coordinate1 < coordinate2:
+                lon1, lat1, elev1 = data1
+                lon2, lat2, elev2 = data2
+                clearance_m = count_clearance(lat1, lon1, lat2, lon2)
+                ax.plot([lon1, lon2], [lat1, lat2], [elev1, elev2], color='gray', linestyle=':')
+
+    # 设置坐标轴标签和图表标题
+    ax.set_xlabel('Longitude')
+    ax.set_ylabel('Latitude')
+    ax.set_zlabel('Elevation (m)')
+    plt.title('Monitoring coordinates and Approximate clearances')
+    plt.show()
+
+
+if __name__ == '__main__':
+    main()
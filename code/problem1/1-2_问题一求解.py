@@ -1,6 +1,12 @@
 import numpy as np
 from scipy.optimize import minimize
 
+# 在 code 目录下以模块方式运行才能导入 sonicboom：python -m problem1.1-2_问题一求解
+from sonicboom.telemetry import hot_path, telemetry_from_env, traced
+
+# 设置环境变量 SONICBOOM_TELEMETRY=路径 后，每次求解都写入 JSON 行记录
+minimize = traced('1-2/minimize', minimize)
+
 # 声速常量，单位为米/秒
 v = 340
 
@@ -13,6 +19,7 @@ facilities = {
 }
 
 
+@hot_path('1-2/target')
 def target(vars):
     """
     目标函数，用于优化追踪目标的位置和时间。
@@ -53,12 +60,19 @@ def target(vars):
 # 初始化猜测值（用于循环迭代，优化结果，设定初始值）
 initial_guess = [110.5, 27.5, 1000, 33]
 
-# 使用 minimize 函数进行优化
-result = minimize(target, initial_guess)
 
-# 获取优化结果
-x, y, z, t = result.x
+def main():
+    # 使用 minimize 函数进行优化
+    result = minimize(target, initial_guess)
+
+    # 获取优化结果
+    x, y, z, t = result.x
+
+    # 输出优化结果
+    print("残骸发生音爆时的位置和时间：")
+    print(f"经度 = {x:.5f}°, 纬度 = {y:.5f}°, 高程 = {z:.2f} m, 时间 = {t:.3f} s")
+
 
-# 输出优化结果
-print("残骸发生音爆时的位置和时间：")
-print(f"经度 = {x:.5f}°, 纬度 = {y:.5f}°, 高程 = {z:.2f} m, 时间 = {t:.3f} s")
+if __name__ == '__main__':
+    with telemetry_from_env():
+        main()
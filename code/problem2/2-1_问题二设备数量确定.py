@@ -1,6 +1,11 @@
 import numpy as np
 from scipy.optimize import minimize
-import matplotlib.pyplot as plt
+
+# 在 code 目录下以模块方式运行才能导入 sonicboom：python -m problem2.2-1_问题二设备数量确定
+from sonicboom.telemetry import hot_path, telemetry_from_env, traced
+
+# 设置环境变量 SONICBOOM_TELEMETRY=路径 后，每次求解都写入 JSON 行记录
+minimize = traced('2-1/minimize', minimize)
 
 # 声速常量，单位为米/秒
 speed_of_sound = 343
@@ -45,6 +50,7 @@ def count_arrival_times(debris_places, debris_times, invigilators):
     return arrival_times
 
 
+@hot_path('2-1/target_function')
 def target_function(variables, invigilator_times, invigilators, num_debris):
     """
     目标函数，用于优化追踪目标的位置和时间。
@@ -64,53 +70,59 @@ def target_function(variables, invigilator_times, invigilators, num_debris):
     return np.sum((predicted_arrival_times - invigilator_times) ** 2)
 
 
-# 初始化最小波动性和最佳设备数量
-min_volatility = float('inf')
-best_configurations = []
-num_iterations = 7
-
-# 开始循环迭代，优化结果
-while len(best_configurations) < num_iterations:
-    # 随机生成不同数量的监测设备
-    num_invigilators = np.random.randint(4, 8)  # 随机选择设备数量
-    invigilators = invigilators_data[np.random.choice(len(facilities), num_invigilators, replace=False)]
-
-    valid_debris_places = []
-    for _ in range(num_debris):
-        while True:
-            pos = np.random.rand(3) * 1000
-            if np.all(np.sqrt(np.sum((invigilators[:, :2] - pos[:2]) ** 2, axis=1)) < 1000):
-                valid_debris_places.append(pos)
-                break
-
-    true_debris_places = np.array(valid_debris_places)
-    simulated_arrival_times = count_arrival_times(true_debris_places, true_debris_times, invigilators)
-
-    # 使用优化算法估计残骸的位置和时间
-    initial_guess = np.concatenate((np.random.rand(num_debris * 3), np.random.rand(num_debris)))
-    result = minimize(target_function, initial_guess, args=(simulated_arrival_times, invigilators, num_debris))
-    estimated_debris_places = result.x[:num_debris * 3].reshape(num_debris, 3)
-    estimated_debris_times = result.x[num_debris * 3:]
-
-    # 计算波动性
-    volatility = np.mean((true_debris_places - estimated_debris_places) ** 2) + \
-                 np.mean((true_debris_times - estimated_debris_times) ** 2)
-
-    # 保存结果
-    if num_invigilators == 7:
-        best_configurations.append((volatility, num_invigilators, tuple(map(tuple, invigilators))))
-
-# 统计设备被选中的次数
-facility_counts = {key: 0 for key in facilities.keys()}
-for _, _, invigilators in best_configurations:
-    for facility in invigilators:
-        facility_counts[chr(65 + np.where((invigilators_data == facility).all(axis=1))[0][0])] += 1
-
-# 找到出现次数最多的设备组合
-most_common_configuration = max(set(best_configurations), key=best_configurations.count)
-
-# 输出结果
-print("最佳设备组合:")
-for i, facility in enumerate(most_common_configuration[2]):
-    print(f"设备 {chr(65 + i)}: 经度 {facility[0]}, 纬度 {facility[1]}, 高度 {facility[2]}")
-print(f"最佳监测设备数量: {most_common_configuration[1]}")
+def main():
+    # 初始化最小波动性和最佳设备数量
+    min_volatility = float('inf')
+    best_configurations = []
+    num_iterations = 7
+
+    # 开始循环迭代，优化结果
+    while len(best_configurations) < num_iterations:
+        # 随机生成不同数量的监测设备
+        num_invigilators = np.random.randint(4, 8)  # 随机选择设备数量
+        invigilators = invigilators_data[np.random.choice(len(facilities), num_invigilators, replace=False)]
+
+        valid_debris_places = []
+        for _ in range(num_debris):
+            while True:
+                pos = np.random.rand(3) * 1000
+                if np.all(np.sqrt(np.sum((invigilators[:, :2] - pos[:2]) ** 2, axis=1)) < 1000):
+                    valid_debris_places.append(pos)
+                    break
+
+        true_debris_places = np.array(valid_debris_places)
+        simulated_arrival_times = count_arrival_times(true_debris_places, true_debris_times, invigilators)
+
+        # 使用优化算法估计残骸的位置和时间
+        initial_guess = np.concatenate((np.random.rand(num_debris * 3), np.random.rand(num_debris)))
+        result = minimize(target_function, initial_guess, args=(simulated_arrival_times, invigilators, num_debris))
+        estimated_debris_places = result.x[:num_debris * 3].reshape(num_debris, 3)
+        estimated_debris_times = result.x[num_debris * 3:]
+
+        # 计算波动性
+        volatility = np.mean((true_debris_places - estimated_debris_places) ** 2) + \
+                     np.mean((true_debris_times - estimated_debris_times) ** 2)
+
+        # 保存结果
+        if num_invigilators == 7:
+            best_configurations.append((volatility, num_invigilators, tuple(map(tuple, invigilators))))
+
+    # 统计设备被选中的次数
+    facility_counts = {key: 0 for key in facilities.keys()}
+    for _, _, invigilators in best_configurations:
+        for facility in invigilators:
+            facility_counts[chr(65 + np.where((invigilators_data == facility).all(axis=1))[0][0])] += 1
+
+    # 找到出现次数最多的设备组合
+    most_common_configuration = max(set(best_configurations), key=best_configurations.count)
+
+    # 输出结果
+    print("最佳设备组合:")
+    for i, facility in enumerate(most_common_configuration[2]):
+        print(f"设备 {chr(65 + i)}: 经度 {facility[0]}, 纬度 {facility[1]}, 高度 {facility[2]}")
+    print(f"最佳监测设备数量: {most_common_configuration[1]}")
+
+
+if __name__ == '__main__':
+    with telemetry_from_env():
+        main()
@@ -48,35 +48,40 @@ def target_function(variables, invigilator_times, invigilators, num_debris):
     return np.sum((forecast_arrival_times - invigilator_times) ** 2)
 
 
-# 初始化最小波动性和最佳设备数量
-min_volatility = float('inf')
-best_num_invigilators = 0
-best_estimates = None
-
-# 评估不同数量的监测设备
-for num_invigilators in range(4, 8):  # 从4到7的设备数量
-    invigilators = np.random.rand(num_invigilators, 3) * 1000  # 随机生成监测设备位置
-    simulated_arrival_times = count_arrival_times(true_debris_places, true_debris_times, invigilators)
-
-    # 使用优化算法估计残骸的位置和时间
-    initial_guess = np.concatenate((np.random.rand(num_debris * 3), np.random.rand(num_debris)))
-    result = minimize(target_function, initial_guess, args=(simulated_arrival_times, invigilators, num_debris))
-    estimated_debris_places = result.x[:num_debris * 3].reshape(num_debris, 3)
-    estimated_debris_times = result.x[num_debris * 3:]
-
-    # 计算波动性
-    volatility = np.mean((true_debris_places - estimated_debris_places) ** 2) + \
-                 np.mean((true_debris_times - estimated_debris_times) ** 2)
-
-    # 比较并保存最佳结果
-    if volatility < min_volatility:
-        min_volatility = volatility
-        best_num_invigilators = num_invigilators
-        best_estimates = (estimated_debris_places, estimated_debris_times)
-
-# 输出最佳结果
-print(f"最佳监测设备数量: {best_num_invigilators}")
-print("最佳估计的残骸位置:")
-print(best_estimates[0])
-print("最佳估计的残骸时间:")
-print(best_estimates[1])
+def main():
+    # 初始化最小波动性和最佳设备数量
+    min_volatility = float('inf')
+    best_num_invigilators = 0
+    best_estimates = None
+
+    # 评估不同数量的监测设备
+    for num_invigilators in range(4, 8):  # 从4到7的设备数量
+        invigilators = np.random.rand(num_invigilators, 3) * 1000  # 随机生成监测设备位置
+        simulated_arrival_times = count_arrival_times(true_debris_places, true_debris_times, invigilators)
+
+        # 使用优化算法估计残骸的位置和时间
+        initial_guess = np.concatenate((np.random.rand(num_debris * 3), np.random.rand(num_debris)))
+        result = minimize(target_function, initial_guess, args=(simulated_arrival_times, invigilators, num_debris))
+        estimated_debris_places = result.x[:num_debris * 3].reshape(num_debris, 3)
+        estimated_debris_times = result.x[num_debris * 3:]
+
+        # 计算波动性
+        volatility = np.mean((true_debris_places - estimated_debris_places) ** 2) + \
+                     np.mean((true_debris_times - estimated_debris_times) ** 2)
+
+        # 比较并保存最佳结果
+        if volatility < min_volatility:
+            min_volatility = volatility
+            best_num_invigilators = num_invigilators
+            best_estimates = (estimated_debris_places, estimated_debris_times)
+
+    # 输出最佳结果
+    print(f"最佳监测设备数量: {best_num_invigilators}")
+    print("最佳估计的残骸位置:")
+    print(best_estimates[0])
+    print("最佳估计的残骸时间:")
+    print(best_estimates[1])
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,12 @@
 import numpy as np
 from scipy.optimize import least_squares
 
+# 在 code 目录下以模块方式运行才能导入 sonicboom：python -m problem3.3-1问题三位置求解
+from sonicboom.telemetry import hot_path, telemetry_from_env, traced
+
+# 设置环境变量 SONICBOOM_TELEMETRY=路径 后，每次求解都写入 JSON 行记录
+least_squares = traced('3-1/least_squares', least_squares)
+
 # 声速常量，单位为米/秒
 v = 343
 
@@ -16,6 +22,7 @@ coordinates = {
 }
 
 
+@hot_path('3-1/leftovers')
 def leftovers(vars, coordinate_data):
     """
     计算预测时间与实际时间的残差。
@@ -38,16 +45,23 @@ def leftovers(vars, coordinate_data):
 
 initial_guess = [110.5, 27.5, 750, 0]  # 初始猜测值
 
-sources_places_times = []  # 用于存储音爆源的位置和时间
 
-# 对每个音爆源进行计算
-for i in range(4):
-    coordinate_data = [(coordinates[coordinate][0], coordinates[coordinate][1], coordinates[coordinate][2],
-                        coordinates[coordinate][3][i]) for coordinate in coordinates]
-    result = least_squares(leftovers, initial_guess, args=(coordinate_data,))
-    sources_places_times.append(result.x)
-    print(f"音爆源 {i + 1} 的计算结果：", result.x)
+def main():
+    sources_places_times = []  # 用于存储音爆源的位置和时间
+
+    # 对每个音爆源进行计算
+    for i in range(4):
+        coordinate_data = [(coordinates[coordinate][0], coordinates[coordinate][1], coordinates[coordinate][2],
+                            coordinates[coordinate][3][i]) for coordinate in coordinates]
+        result = least_squares(leftovers, initial_guess, args=(coordinate_data,))
+        sources_places_times.append(result.x)
+        print(f"音爆源 {i + 1} 的计算结果：", result.x)
+
+    # 输出计算结果
+    for i, source in enumerate(sources_places_times):
+        print(f"音爆源 {i + 1} 的位置和时间：经度 = {source[0]:.5f}, 纬度 = {source[1]:.5f}, 高程 = {source[2]:.2f} m")
+
 
-# 输出计算结果
-for i, source in enumerate(sources_places_times):
-    print(f"音爆源 {i + 1} 的位置和时间：经度 = {source[0]:.5f}, 纬度 = {source[1]:.5f}, 高程 = {source[2]:.2f} m")
+if __name__ == '__main__':
+    with telemetry_from_env():
+        main()
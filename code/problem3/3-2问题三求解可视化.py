@@ -1,7 +1,5 @@
 import numpy as np
 from scipy.optimize import least_squares
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 
 # 声速常量，单位为米/秒
 v = 343
@@ -40,27 +38,36 @@ def leftovers(vars, coordinate_data):
 
 initial_guess = [110.5, 27.5, 750, 0]  # 初始猜测值
 
-sources_places_times = []  # 用于存储音爆源的位置和时间
 
-# 对每个音爆源进行计算
-for i in range(4):
-    coordinate_data = [(coordinates[coordinate][0], coordinates[coordinate][1], coordinates[coordinate][2],
-                        coordinates[coordinate][3][i]) for coordinate in coordinates]
-    result = least_squares(leftovers, initial_guess, args=(coordinate_data,))
-    sources_places_times.append(result.x)
-    print(f"音爆源 {i + 1} 的计算结果：", result.x)
+def main():
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
 
-# 绘制三维散点图
-fig = plt.figure()
-ax = fig.add_subplot(111, projection='3d')
+    sources_places_times = []  # 用于存储音爆源的位置和时间
 
-for i, source in enumerate(sources_places_times):
-    x, y, z, _ = source
-    ax.scatter(x, y, z, label=f'Sonic boom source {i + 1}', s=100)
+    # 对每个音爆源进行计算
+    for i in range(4):
+        coordinate_data = [(coordinates[coordinate][0], coordinates[coordinate][1], coordinates[coordinate][2],
+                            coordinates[coordinate][3][i]) for coordinate in coordinates]
+        result = least_squares(leftovers, initial_guess, args=(coordinate_data,))
+        sources_places_times.append(result.x)
+        print(f"音爆源 {i + 1} 的计算结果：", result.x)
 
-ax.set_xlabel('X')
-ax.set_ylabel('Y')
-ax.set_zlabel('Z')
-ax.legend()
+    # 绘制三维散点图
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
 
-plt.show()
+    for i, source in enumerate(sources_places_times):
+        x, y, z, _ = source
+        ax.scatter(x, y, z, label=f'Sonic boom source {i + 1}', s=100)
+
+    ax.set_xlabel('X')
+    ax.set_ylabel('Y')
+    ax.set_zlabel('Z')
+    ax.legend()
+
+    plt.show()
+
+
+if __name__ == '__main__':
+    main()
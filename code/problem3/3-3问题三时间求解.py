@@ -1,6 +1,12 @@
 import numpy as np
 from scipy.optimize import minimize
 
+# 在 code 目录下以模块方式运行才能导入 sonicboom：python -m problem3.3-3问题三时间求解
+from sonicboom.telemetry import hot_path, telemetry_from_env, traced
+
+# 设置环境变量 SONICBOOM_TELEMETRY=路径 后，每次求解都写入 JSON 行记录
+minimize = traced('3-3/minimize', minimize)
+
 # 声速常量，单位为米/秒
 c = 340.0
 
@@ -16,6 +22,7 @@ facilities = {
 }
 
 
+@hot_path('3-3/target_function')
 def target_function(variables):
     """
     目标函数，计算残差的平方和。
@@ -51,12 +58,19 @@ constraints = [
     {'type': 'ineq', 'fun': lambda x: 126 - x[6]},  # t4 上界约束
 ]
 
-# 使用 minimize 函数进行优化
-management = minimize(target_function, x0, constraints=constraints)
 
-# 输出优化结果
-if management.success:
-    x, y, z, t1, t2, t3, t4 = management.x
-    print(f"残骸在空中发生音爆时的预估时间: {t1}, {t2}, {t3}, {t4}")
-else:
-    print("Optimization failed.")
+def main():
+    # 使用 minimize 函数进行优化
+    management = minimize(target_function, x0, constraints=constraints)
+
+    # 输出优化结果
+    if management.success:
+        x, y, z, t1, t2, t3, t4 = management.x
+        print(f"残骸在空中发生音爆时的预估时间: {t1}, {t2}, {t3}, {t4}")
+    else:
+        print("Optimization failed.")
+
+
+if __name__ == '__main__':
+    with telemetry_from_env():
+        main()
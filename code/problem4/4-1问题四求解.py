@@ -1,6 +1,12 @@
 import numpy as np
 from scipy.optimize import least_squares
 
+# 在 code 目录下以模块方式运行才能导入 sonicboom：python -m problem4.4-1问题四求解
+from sonicboom.telemetry import hot_path, telemetry_from_env, traced
+
+# 设置环境变量 SONICBOOM_TELEMETRY=路径 后，每次求解都写入 JSON 行记录
+least_squares = traced('4-1/least_squares', least_squares)
+
 v = 340  # m/s
 
 coordinates = {
@@ -14,6 +20,7 @@ coordinates = {
 }
 
 
+@hot_path('4-1/leftovers')
 def leftovers(vars, coordinate_data):
     x, y, z, t, time_error_param = vars
     leftovers = []
@@ -44,21 +51,28 @@ def optimized_places_times(coordinate_data, num_iterations=100):
     return np.mean(all_results, axis=0)
 
 
-# 计算不同情况下的音爆源位置和时间
-for i in range(4):
-    coordinate_data = [(coordinates[coordinate][0], coordinates[coordinate][1], coordinates[coordinate][2],
-                        coordinates[coordinate][3][i]) for
-                       coordinate in coordinates]
-    average_result = optimized_places_times(coordinate_data)
-    print(f"音爆源 {i + 1} 的平均计算结果：", average_result)
-
-# 添加额外的监测站后重新计算
-coordinates['H'] = (110.3, 27.4, 700, [120.0, 180.0, 240.0, 300.0])
-coordinates['I'] = (110.6, 27.9, 780, [110.0, 170.0, 230.0, 290.0])
-
-for i in range(4):
-    coordinate_data = [(coordinates[coordinate][0], coordinates[coordinate][1], coordinates[coordinate][2],
-                        coordinates[coordinate][3][i]) for
-                       coordinate in coordinates]
-    average_result = optimized_places_times(coordinate_data)
-    print(f"增加监测站后，音爆源 {i + 1} 的平均计算结果：", average_result)
+def main():
+    # 计算不同情况下的音爆源位置和时间
+    for i in range(4):
+        coordinate_data = [(coordinates[coordinate][0], coordinates[coordinate][1], coordinates[coordinate][2],
+                            coordinates[coordinate][3][i]) for
+                           coordinate in coordinates]
+        average_result = optimized_places_times(coordinate_data)
+        print(f"音爆源 {i + 1} 的平均计算结果：", average_result)
+
+    # 添加额外的监测站后重新计算，使用副本以免改动全局的 coordinates
+    extended = {**coordinates,
+                'H': (110.3, 27.4, 700, [120.0, 180.0, 240.0, 300.0]),
+                'I': (110.6, 27.9, 780, [110.0, 170.0, 230.0, 290.0])}
+
+    for i in range(4):
+        coordinate_data = [(extended[coordinate][0], extended[coordinate][1], extended[coordinate][2],
+                            extended[coordinate][3][i]) for
+                           coordinate in extended]
+        average_result = optimized_places_times(coordinate_data)
+        print(f"增加监测站后，音爆源 {i + 1} 的平均计算结果：", average_result)
+
+
+if __name__ == '__main__':
+    with telemetry_from_env():
+        main()
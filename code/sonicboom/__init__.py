@@ -0,0 +1,102 @@
+"""
+深圳杯 2024 音爆定位的公共求解库。
+
+各问题目录下的脚本保留比赛时的完整求解流程，本包把其中可复用的部分
+（正演模型、批量求解器等）抽取出来，便于批量处理大量音爆事件。
+
+子模块在首次访问对应名称时才导入：``import sonicboom`` 只加载本文件，
+用到 ``solve_joint`` 等时才导入 SciPy，画图时才导入 matplotlib，
+批量计算进程因此启动快，也不会加载图形界面后端。
+"""
+from importlib import import_module
+
+# 名称 -> 所在子模块
+_exports = {
+    'v_sound': 'forward',
+    'arrival_times': 'forward',
+    'leftovers_batch': 'forward',
+    'jacobian_batch': 'forward',
+    'SoundSpeedProfile': 'atmosphere',
+    'ConstantProfile': 'atmosphere',
+    'AltitudeProfile': 'atmosphere',
+    'LayeredProfile': 'atmosphere',
+    'standard_atmosphere': 'atmosphere',
+    'BatchSolution': 'solvers',
+    'solve_batch': 'solvers',
+    'solve_closed_form': 'closedform',
+    'StreamingStats': 'montecarlo',
+    'MonteCarloSummary': 'montecarlo',
+    'monte_carlo': 'montecarlo',
+    'Association': 'association',
+    'travel_time_bounds': 'association',
+    'associate': 'association',
+    'PrecisionMap': 'precision',
+    'crb_covariance': 'precision',
+    'precision_map': 'precision',
+    'Placement': 'placement',
+    'place_stations': 'placement',
+    'LocalFrame': 'geometry',
+    'project_stations': 'geometry',
+    'locate': 'geometry',
+    'SubsetSelection': 'subset',
+    'gdop_scores': 'subset',
+    'select_stations': 'subset',
+    'FitnessCache': 'genetic',
+    'GAResult': 'genetic',
+    'distance_fitness': 'genetic',
+    'genetic_algorithm': 'genetic',
+    'ScenarioBatch': 'simulation',
+    'sample_debris': 'simulation',
+    'simulate': 'simulation',
+    'evaluate_device_counts': 'simulation',
+    'BundleSolution': 'bundle',
+    'solve_bundle': 'bundle',
+    'JointSolution': 'joint',
+    'JointProblem': 'joint',
+    'solve_joint': 'joint',
+    'TravelTimeGrid': 'grid',
+    'grid_for_network': 'grid',
+    'TrackState': 'tracker',
+    'BallisticTracker': 'tracker',
+    'LocalizationService': 'service',
+    'Uncertainty': 'uncertainty',
+    'linearized_covariance': 'uncertainty',
+    'linearized_uncertainty': 'uncertainty',
+    'RobustSolution': 'robust',
+    'solve_robust': 'robust',
+    'Telemetry': 'telemetry',
+    'SamplingProfiler': 'telemetry',
+    'traced': 'telemetry',
+    'telemetry_from_env': 'telemetry',
+    'ResultCache': 'cache',
+    'cache_key': 'cache',
+    'datasets': 'data',
+    'load_dataset': 'data',
+    'EventTable': 'columnar',
+    'EventWriter': 'columnar',
+    'write_events': 'columnar',
+    'open_events': 'columnar',
+    'SyntheticWorkload': 'synthetic',
+    'WorkloadChunk': 'synthetic',
+    'plot_network': 'plotting',
+    'plot_sources': 'plotting',
+    'plot_results': 'plotting',
+    'LocalizationResults': 'results',
+    'save_results': 'results',
+    'load_results': 'results',
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
@@ -0,0 +1,134 @@
+"""
+多音爆源的到达时间关联。
+
+问题三假定每个监测点 ``times`` 列表的第 i 列属于第 i 个音爆源，但实际记录
+没有标签，需要为每个监测点的到达时间分配音爆源，组合数随监测点数呈阶乘增长。
+这里按监测点逐个扩展部分分配，先用监测点对之间的走时上界剪枝：
+同一音爆源在监测点 i、j 的到达时间差不可能超过 ``|s_i - s_j| / v``；
+再对剩余候选批量求解部分定位，以残差代价做束搜索。
+"""
+from itertools import permutations
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import v_sound
+from .solvers import solve_batch
+
+
+class Association(NamedTuple):
+    """关联结果。"""
+    assignment: np.ndarray  # (N, M) 第 n 个监测点分配给第 k 个音爆源的到达时间下标
+    times: np.ndarray  # (M, N) 按音爆源整理后的到达时间矩阵
+    x: np.ndarray  # (M, 4) 各音爆源的位置和时间
+    cost: float  # 全部音爆源的残差代价之和
+
+
+def travel_time_bounds(stations, v=v_sound, tolerance=0.0):
+    """
+    监测点对之间同一音爆源到达时间差的上界。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        v (float): 声速。
+        tolerance (float): 为拾取误差预留的时间余量（秒）。
+
+    Returns:
+        ndarray: 形状为 (N, N) 的时间差上界。
+    """
+    stations = np.asarray(stations, dtype=float)
+    clearance = np.sqrt(np.sum((stations[:, None] - stations[None]) ** 2, axis=-1))
+    return clearance / v + tolerance
+
+
+def associate(arrivals, stations, v=v_sound, tolerance=0.5, beam_width=64, min_stations=4,
+              max_nfev=30):
+    """
+    为各监测点的无标签到达时间分配音爆源。
+
+    以第一个被处理的监测点（距其余监测点最近的中心点）的到达时间定义音爆源编号，
+    其余监测点按与其距离由近到远依次加入；每加入一个监测点，枚举其到达时间的
+    全部排列，剔除违反走时上界的排列，达到 ``min_stations`` 个监测点后对候选
+    分配批量求解部分定位，只保留代价最小的 ``beam_width`` 个。
+
+    Args:
+        arrivals (ndarray): 形状为 (N, M) 的到达时间，每行是一个监测点记录到的
+            M 个音爆到达时间，顺序任意。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        v (float): 声速。
+        tolerance (float): 走时上界的时间余量（秒）。
+        beam_width (int): 束宽。
+        min_stations (int): 开始做部分定位打分所需的监测点数。
+        max_nfev (int): 部分定位打分时每个候选的最大迭代次数；不一致的候选代价
+            本来就很大，无需迭代到收敛。最终分配会重新精确求解。
+
+    Returns:
+        Association: 代价最小的一致分配及拟合的音爆源。
+    """
+    arrivals = np.asarray(arrivals, dtype=float)
+    stations = np.asarray(stations, dtype=float)
+    num_stations, num_sources = arrivals.shape
+    bounds = travel_time_bounds(stations, v, tolerance)
+
+    # 中心监测点作参考，其余按距离由近到远加入，近处的上界更紧，剪枝更早
+    reference = int(np.argmin(bounds.sum(axis=1)))
+    order = np.argsort(bounds[reference], kind='stable')
+    perms = np.array(list(permutations(range(num_sources))))
+
+    # 束状态：labeled[b, k, i] 为第 b 个候选中音爆源 k 在 order[i] 处的到达时间
+    labeled = arrivals[reference][None, :, None]
+    chosen = np.arange(num_sources)[None, :, None]
+    guess = None
+    cost = np.zeros(1)
+
+    for step in range(1, num_stations):
+        station = order[step]
+        # 各音爆源的代价相互独立，只需对 (候选, 音爆源, 到达时间) 三元组剪枝和打分，
+        # 排列的可行性和代价再由三元组组合得到
+        gap = np.abs(arrivals[station][None, None, :, None] - labeled[:, :, None, :])
+        ratio = np.max(gap / bounds[station, order[:step]], axis=3)  # (B, M, M)
+        pair_ok = ratio <= 1
+        rows = np.arange(num_sources)
+        feasible = np.all(pair_ok[:, rows, perms], axis=2)  # (B, P)
+
+        if step + 1 < min_stations:
+            # 尚不足以定位时按走时余量排序，只截断过多的候选
+            score = np.max(ratio[:, rows, perms], axis=2)
+            limit = beam_width * 16
+        else:
+            extended = np.concatenate([
+                np.broadcast_to(labeled[:, :, None, :], labeled.shape[:2] + (num_sources, step)),
+                np.broadcast_to(arrivals[station][None, None, :, None], labeled.shape[:2] + (num_sources, 1)),
+            ], axis=3)
+            pair_guess = None
+            if guess is not None:
+                pair_guess = np.broadcast_to(guess[:, :, None], guess.shape[:2] + (num_sources, 4))
+                pair_guess = pair_guess.reshape(-1, 4)
+            solution = solve_batch(extended.reshape(-1, step + 1), stations[order[:step + 1]],
+                                   pair_guess, v=v, max_nfev=max_nfev)
+            pair_cost = solution.cost.reshape(-1, num_sources, num_sources)
+            pair_x = solution.x.reshape(-1, num_sources, num_sources, 4)
+            score = np.sum(pair_cost[:, rows, perms], axis=2)
+            limit = beam_width
+
+        score = np.where(feasible, score, np.inf)
+        flat = np.argsort(score, axis=None, kind='stable')[:limit]
+        flat = flat[np.isfinite(score.ravel()[flat])]
+        if flat.size == 0:
+            raise ValueError('没有满足走时约束的到达时间分配，请检查声速或放宽 tolerance。')
+        beam, perm = np.unravel_index(flat, score.shape)
+
+        labeled = np.concatenate([labeled[beam], arrivals[station][perms[perm]][..., None]], axis=2)
+        chosen = np.concatenate([chosen[beam], perms[perm][..., None]], axis=2)
+        if step + 1 >= min_stations:
+            guess = pair_x[beam[:, None], rows, perms[perm]]
+            cost = score[beam, perm]
+
+    best = int(np.argmin(cost))
+    assignment = np.empty((num_stations, num_sources), dtype=int)
+    assignment[order] = chosen[best].T
+    times = np.empty((num_sources, num_stations))
+    times[:, order] = labeled[best]
+    solution = solve_batch(times, stations, None if guess is None else guess[best], v=v)
+    return Association(assignment=assignment, times=times, x=solution.x,
+                       cost=float(solution.cost.sum()))
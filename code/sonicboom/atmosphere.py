@@ -0,0 +1,253 @@
+"""
+随高度变化的声速剖面与预先计算的走时表。
+
+各脚本中的声速是常数，而且并不一致：``1-2``、``3-3``、``4-1``、``2-2`` 用 340，
+``2-1``、``3-1``、``3-2`` 用 343。音爆源位于 10 km 以上（见 ``1-2`` 的
+``min_altitude`` 惩罚项），这一高度范围内气温随高度变化，声速也随之变化。
+
+声速只随高度变化时，声线满足 Snell 定律，射线参数 p = sin(θ)/c(z) 沿声线不变：
+
+    X(p) = ∫ p c / sqrt(1 - p²c²) dz,    T(p) = ∫ 1 / (c sqrt(1 - p²c²)) dz
+
+对每个接收高度，一次性积分一组射线参数，得到以（水平距离 × 音爆源相对高度）
+为坐标的二维走时表。表中存的是等效慢度 T / 直线距离，它在整个区域内都很平滑，
+双线性插值后乘以直线距离即得走时，雅可比矩阵由插值函数直接求导。
+
+剖面对象可以代替声速常数传给 ``arrival_times``、``solve_batch`` 等函数的 ``v`` 参数。
+走时表按 ``receiver_step`` 间隔的接收高度计算并缓存在剖面对象内，同一监测网只在第一次求解时计算。
+"""
+import numpy as np
+
+from . import forward
+from .forward import _offsets
+
+
+class SoundSpeedProfile:
+    """
+    声速剖面的基类，子类实现 ``speed(z)``。
+
+    Args:
+        range_max (float): 走时表的最大水平距离（米），更远处按边缘的慢度外推。
+        height_max (float): 走时表中音爆源相对接收点的最大高度（米）。
+        shape (tuple): 走时表在水平距离和高度方向的点数。
+        substeps (int): 相邻两层高度之间积分的细分层数。
+        rays (int): 积分的射线条数。
+        receiver_step (float): 走时表所在接收高度的间隔（米），监测点高度处的表由相邻两张插值。
+    """
+
+    def __init__(self, range_max=200000, height_max=30000, shape=(201, 121), substeps=8,
+                 rays=2048, receiver_step=250.0):
+        self.range_max = float(range_max)
+        self.height_max = float(height_max)
+        self.shape = tuple(int(n) for n in shape)
+        self.substeps = int(substeps)
+        self.rays = int(rays)
+        self.receiver_step = float(receiver_step)
+        self.ranges = np.linspace(0, self.range_max, self.shape[0])
+        self.heights = np.linspace(0, self.height_max, self.shape[1])
+        self._tables = {}
+        self._stacks = {}
+
+    def speed(self, z):
+        """高度 z（米）处的声速。"""
+        raise NotImplementedError
+
+    def mean_speed(self, low=0.0, high=15000.0):
+        """高度区间上的调和平均声速，供只支持常声速的方法（如闭式解）使用。"""
+        z = np.linspace(low, high, 1001)
+        middle = (z[1:] + z[:-1]) / 2
+        return float(1.0 / np.mean(1.0 / np.asarray(self.speed(middle), dtype=float)))
+
+    def table(self, altitude):
+        """
+        接收高度为 ``altitude`` 时的等效慢度表。
+
+        走时表只在 ``receiver_step`` 的整数倍高度上积分并缓存，其他高度由上下相邻两张表
+        线性插值。插值对表逐元素进行，与查表时的双线性插值可交换。
+
+        Returns:
+            ndarray: 形状为 ``shape`` 的数组，[i, j] 为水平距离 ``ranges[i]``、
+                相对高度 ``heights[j]`` 处的 走时 / 直线距离。
+        """
+        position = float(altitude) / self.receiver_step
+        below = np.floor(position)
+        weight = position - below
+        lower = self._level(below)
+        if weight < 1e-9:
+            return lower
+        return (1 - weight) * lower + weight * self._level(below + 1)
+
+    def _level(self, index):
+        altitude = float(index) * self.receiver_step
+        if altitude not in self._tables:
+            self._tables[altitude] = self._compute(altitude)
+        return self._tables[altitude]
+
+    def _stacked(self, altitudes):
+        """各接收高度的表拼成的一维数组，按接收高度的组合缓存，迭代时不必每次重新拼接。"""
+        key = tuple(altitudes.tolist())
+        tables = self._stacks.get(key)
+        if tables is None:
+            tables = np.stack([self.table(altitude) for altitude in altitudes]).reshape(-1)
+            # 只保留最近用到的几组，逐个尝试监测点子集时不会无限增长
+            if len(self._stacks) >= 16:
+                del self._stacks[next(iter(self._stacks))]
+            self._stacks[key] = tables
+        return tables
+
+    def _compute(self, altitude):
+        num_ranges, num_heights = self.shape
+        # 细分层的中点声速，层边界与表的高度网格对齐
+        dz = self.height_max / ((num_heights - 1) * self.substeps)
+        middle = altitude + dz * (np.arange((num_heights - 1) * self.substeps) + 0.5)
+        speed = np.asarray(self.speed(middle), dtype=float)
+
+        # 射线参数取到最小声速对应的上限，越靠近上限越密（近水平的射线）
+        angle = np.linspace(0, np.pi / 2, self.rays, endpoint=False)
+        slowness = np.sin(angle)[:, None] / speed.max()
+        cosine = np.sqrt(np.maximum(1 - (slowness * speed) ** 2, 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # 声线在某层翻转后到不了更高处，之后的累计值记为 NaN
+            blocked = np.cumsum(slowness * speed >= 1, axis=1) > 0
+            offset = np.where(blocked, np.nan, dz * slowness * speed / cosine)
+            delay = np.where(blocked, np.nan, dz / (speed * cosine))
+        reach = np.cumsum(offset, axis=1)[:, self.substeps - 1::self.substeps]
+        elapsed = np.cumsum(delay, axis=1)[:, self.substeps - 1::self.substeps]
+
+        table = np.empty(self.shape)
+        # 与接收点同高时沿水平方向传播
+        table[:, 0] = 1.0 / self.speed(altitude)
+        for j in range(1, num_heights):
+            valid = np.isfinite(reach[:, j - 1])
+            x, t, p = reach[valid, j - 1], elapsed[valid, j - 1], slowness[valid, 0]
+            travel = np.interp(self.ranges, x, t)
+            # 超出最远声线的距离按近水平声线的射线参数（即 dT/dX）线性外推
+            beyond = self.ranges > x[-1]
+            travel[beyond] = t[-1] + (self.ranges[beyond] - x[-1]) * p[-1]
+            table[:, j] = travel / np.hypot(self.ranges, self.heights[j])
+        return table
+
+    def _lookup(self, sources, stations):
+        """插值等效慢度，返回各分量偏移、直线距离和插值所需的量。"""
+        stations = np.asarray(stations, dtype=float)
+        offsets, distance = _offsets(sources, stations)
+        horizontal = np.sqrt(offsets[0] ** 2 + offsets[1] ** 2)
+        # 音爆源低于接收点时按镜像处理，常声速时与直线走时一致
+        height = np.abs(offsets[2])
+
+        altitudes, inverse = np.unique(stations[..., 2], return_inverse=True)
+        tables = self._stacked(altitudes)
+        which = np.broadcast_to(inverse.reshape(stations.shape[:-1]), distance.shape)
+
+        num_ranges, num_heights = self.shape
+        step_r, step_h = self.ranges[1], self.heights[1]
+        fr = horizontal / step_r
+        fh = height / step_h
+        i = np.clip(np.floor(fr), 0, num_ranges - 2).astype(np.intp)
+        j = np.clip(np.floor(fh), 0, num_heights - 2).astype(np.intp)
+        fr = np.clip(fr - i, 0.0, 1.0)
+        fh = np.clip(fh - j, 0.0, 1.0)
+        flat = (which * num_ranges + i) * num_heights + j
+        corners = (tables[flat], tables[flat + 1], tables[flat + num_heights],
+                   tables[flat + num_heights + 1])
+        return offsets, distance, horizontal, height, fr, fh, corners
+
+    def arrival_times(self, sources, stations):
+        """与 ``forward.arrival_times`` 相同，走时由走时表插值。"""
+        _, distance, _, _, fr, fh, (s00, s01, s10, s11) = self._lookup(sources, stations)
+        slowness = (1 - fr) * ((1 - fh) * s00 + fh * s01) + fr * ((1 - fh) * s10 + fh * s11)
+        return distance * slowness + np.asarray(sources, dtype=float)[..., 3, None]
+
+    def jacobian_columns(self, sources, stations):
+        """与 ``forward.jacobian_columns`` 相同，由插值函数求导。"""
+        offsets, distance, horizontal, height, fr, fh, (s00, s01, s10, s11) = \
+            self._lookup(sources, stations)
+        slowness = (1 - fr) * ((1 - fh) * s00 + fh * s01) + fr * ((1 - fh) * s10 + fh * s11)
+        along_r = ((1 - fh) * (s10 - s00) + fh * (s11 - s01)) / self.ranges[1]
+        along_h = ((1 - fr) * (s01 - s00) + fr * (s11 - s10)) / self.heights[1]
+
+        inverse = np.divide(1.0, distance, out=np.zeros_like(distance), where=distance > 0)
+        radial = np.divide(distance * along_r, horizontal, out=np.zeros_like(distance),
+                           where=horizontal > 0)
+        columns = np.empty(distance.shape[:-1] + (4,) + distance.shape[-1:])
+        for k in range(2):
+            columns[..., k, :] = offsets[k] * (slowness * inverse + radial)
+        columns[..., 2, :] = (offsets[2] * slowness * inverse
+                              + np.sign(offsets[2]) * distance * along_h)
+        columns[..., 3, :] = 1.0
+        return columns
+
+
+class ConstantProfile(SoundSpeedProfile):
+    """常声速，走时和雅可比矩阵直接用解析式计算，不建表。"""
+
+    def __init__(self, v=340, **kwargs):
+        super().__init__(**kwargs)
+        self.v = float(v)
+
+    def speed(self, z):
+        return np.full(np.shape(z), self.v)
+
+    def mean_speed(self, low=0.0, high=15000.0):
+        return self.v
+
+    def arrival_times(self, sources, stations):
+        return forward.arrival_times(sources, stations, self.v)
+
+    def jacobian_columns(self, sources, stations):
+        return forward.jacobian_columns(sources, stations, self.v)
+
+
+class AltitudeProfile(SoundSpeedProfile):
+    """
+    按高度采样、采样点之间线性插值的声速剖面。
+
+    Args:
+        altitudes (array_like): 递增的采样高度（米）。
+        speeds (array_like): 各采样高度处的声速，范围之外取端点值。
+    """
+
+    def __init__(self, altitudes, speeds, **kwargs):
+        super().__init__(**kwargs)
+        self.altitudes = np.asarray(altitudes, dtype=float)
+        self.speeds = np.asarray(speeds, dtype=float)
+
+    def speed(self, z):
+        return np.interp(z, self.altitudes, self.speeds)
+
+
+class LayeredProfile(SoundSpeedProfile):
+    """
+    分层均匀的声速剖面。
+
+    Args:
+        boundaries (array_like): 递增的层底高度（米），第一层向下延伸。
+        speeds (array_like): 各层的声速，与 ``boundaries`` 等长。
+    """
+
+    def __init__(self, boundaries, speeds, **kwargs):
+        super().__init__(**kwargs)
+        self.boundaries = np.asarray(boundaries, dtype=float)
+        self.speeds = np.asarray(speeds, dtype=float)
+
+    def speed(self, z):
+        layer = np.searchsorted(self.boundaries, z, side='right') - 1
+        return self.speeds[np.clip(layer, 0, len(self.speeds) - 1)]
+
+
+def standard_atmosphere(surface_temperature=288.15, **kwargs):
+    """
+    国际标准大气的声速剖面：对流层每千米降温 6.5 K，11–20 km 等温，之上每千米升温 1 K，
+    声速 c = 20.05 sqrt(T)。
+
+    Args:
+        surface_temperature (float): 海平面气温（K）。
+        **kwargs: 传给 ``SoundSpeedProfile`` 的走时表参数。
+
+    Returns:
+        AltitudeProfile: 声速剖面。
+    """
+    altitudes = np.array([0.0, 11000.0, 20000.0, 32000.0])
+    tropopause = surface_temperature - 6.5 * 11
+    temperatures = np.array([surface_temperature, tropopause, tropopause, tropopause + 12])
+    return AltitudeProfile(altitudes, 20.05 * np.sqrt(temperatures), **kwargs)
@@ -0,0 +1,266 @@
+"""
+求解器基准测试。
+
+对各问题脚本中的求解逻辑和本包的批量求解器，在不同规模的合成数据上记录
+墙钟时间、残差函数调用次数、峰值内存和解的误差，结果写成 JSON 便于比较版本间的回归。
+
+脚本的求解和打印都在 ``main()`` 中，``load_script`` 按文件路径导入脚本模块，
+直接调用其中的残差函数和目标函数。
+
+用法（在 ``code`` 目录下）::
+
+    python -m sonicboom.bench --scales 7x4 50x1000 200x100000 --output bench.json
+"""
+import argparse
+import importlib.util
+import json
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from .forward import arrival_times
+from .solvers import default_initial_guess, solve_batch
+
+code_dir = Path(__file__).resolve().parents[1]
+
+scripts = {
+    '1-2': code_dir / 'problem1' / '1-2_问题一求解.py',
+    '3-1': code_dir / 'problem3' / '3-1问题三位置求解.py',
+    '3-3': code_dir / 'problem3' / '3-3问题三时间求解.py',
+    '4-1': code_dir / 'problem4' / '4-1问题四求解.py',
+}
+
+
+def load_script(path, **overrides):
+    """
+    按文件路径导入脚本模块，不运行其中的 ``main()``。
+
+    Args:
+        path (Path): 脚本路径。
+        **overrides: 覆盖脚本中的全局变量（如声速 ``v``）。
+
+    Returns:
+        module: 脚本模块。
+    """
+    spec = importlib.util.spec_from_file_location('bench_' + Path(path).stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for name, value in overrides.items():
+        setattr(module, name, value)
+    return module
+
+
+def synthetic_dataset(num_stations, num_events, group_size=4, error_std=0.01, v=340, seed=0):
+    """
+    生成米制坐标下的合成监测网和音爆事件。
+
+    每 ``group_size`` 个事件共用一个位置（对应 3-3 中同一残骸的多次音爆），
+    发生时间各不相同。
+
+    Args:
+        num_stations (int): 监测点数。
+        num_events (int): 事件数。
+        group_size (int): 共用位置的事件数。
+        error_std (float): 到达时间噪声的标准差。
+        v (float): 声速。
+        seed (int): 随机种子。
+
+    Returns:
+        tuple: (stations (N, 3), sources (E, 4), times (E, N))。
+    """
+    rng = np.random.default_rng(seed)
+    stations = np.column_stack([rng.uniform(-30000, 30000, (num_stations, 2)),
+                                rng.uniform(0, 1000, num_stations)])
+    num_groups = -(-num_events // group_size)
+    positions = np.column_stack([rng.uniform(-20000, 20000, (num_groups, 2)),
+                                 rng.uniform(10000, 15000, num_groups)])
+    sources = np.column_stack([np.repeat(positions, group_size, axis=0)[:num_events],
+                               rng.uniform(0, 100, num_events)])
+    times = rng.normal(0, error_std, (num_events, num_stations))
+    for start in range(0, num_events, 8192):
+        times[start:start + 8192] += arrival_times(sources[start:start + 8192], stations, v)
+    return stations, sources, times
+
+
+def _script_12(stations, times, guess, v):
+    from scipy.optimize import minimize
+    script = load_script(scripts['1-2'], v=v)
+    estimates, nfev = [], 0
+    for event_times, x0 in zip(times, guess):
+        script.facilities = {
+            str(i): {'longitude': s[0], 'latitude': s[1], 'altitude': s[2], 'arrival_time': t}
+            for i, (s, t) in enumerate(zip(stations, event_times))}
+        result = minimize(script.target, x0)
+        estimates.append(result.x)
+        nfev += result.nfev
+    return np.array(estimates), nfev
+
+
+def _script_least_squares(name, stations, times, guess, v):
+    from scipy.optimize import least_squares
+    script = load_script(scripts[name], v=v)
+    estimates, nfev = [], 0
+    for event_times, x0 in zip(times, guess):
+        coordinate_data = [(s[0], s[1], s[2], t) for s, t in zip(stations, event_times)]
+        if name == '4-1':
+            x0 = np.append(x0, 0.0)
+        result = least_squares(script.leftovers, x0, args=(coordinate_data,))
+        x = result.x
+        if name == '4-1':
+            # 4-1 的残差加上 time_error_param，它与 t 不可区分，两者之和才是发生时间
+            x = np.append(x[:3], x[3] + x[4])
+        estimates.append(x)
+        nfev += result.nfev
+    return np.array(estimates), nfev
+
+
+def _script_33(stations, times, guess, v, group_size=4):
+    from scipy.optimize import minimize
+    script = load_script(scripts['3-3'], c=v)
+    estimates, nfev = [], 0
+    for start in range(0, len(times) - group_size + 1, group_size):
+        block = times[start:start + group_size]
+        script.facilities = {str(i): {'x': s[0], 'y': s[1], 'z': s[2], 'times': list(block[:, i])}
+                            for i, s in enumerate(stations)}
+        x0 = np.concatenate([guess[start, :3], guess[start:start + group_size, 3]])
+        # 3-3 的时间约束针对比赛数据，这里只保留高程约束
+        result = minimize(script.target_function, x0, constraints=script.constraints[:1])
+        estimates.extend(np.column_stack([np.tile(result.x[:3], (group_size, 1)), result.x[3:]]))
+        nfev += result.nfev
+    return np.array(estimates), nfev
+
+
+def _batch(stations, times, guess, v):
+    solution = solve_batch(times, stations, guess, v=v)
+    return solution.x, int(solution.nfev.sum())
+
+
+def _joint(stations, times, guess, v, group_size=4):
+    from .joint import solve_joint
+    num_groups = len(times) // group_size
+    usable = num_groups * group_size
+    solution = solve_joint(times[:usable], stations, groups=np.repeat(np.arange(num_groups), group_size),
+                           initial_positions=guess[:usable:group_size, :3],
+                           initial_times=guess[:usable, 3], v=v)
+    x = np.column_stack([np.repeat(solution.positions, group_size, axis=0), solution.times])
+    return x, solution.nfev
+
+
+solvers = {
+    'script-1-2': _script_12,
+    'script-3-1': lambda *args: _script_least_squares('3-1', *args),
+    'script-3-3': _script_33,
+    'script-4-1': lambda *args: _script_least_squares('4-1', *args),
+    'batch': _batch,
+    'joint': _joint,
+}
+
+# 逐事件调用 SciPy 的求解路径只取前若干个事件，避免大规模时运行过久
+per_event = {'script-1-2', 'script-3-1', 'script-3-3', 'script-4-1'}
+
+
+def run_benchmark(solver, num_stations, num_events, per_event_limit=200, joint_limit=20000,
+                  memory=True, v=340, seed=0):
+    """
+    在一个规模上运行一个求解器并记录指标。
+
+    Args:
+        solver (str): ``solvers`` 中的名称。
+        num_stations (int): 监测点数。
+        num_events (int): 事件数。
+        per_event_limit (int): 逐事件求解路径最多求解的事件数。
+        joint_limit (int): 联合求解路径最多求解的事件数。
+        memory (bool): 是否额外运行一次以测量峰值内存。
+        v (float): 声速。
+        seed (int): 随机种子。
+
+    Returns:
+        dict: 一条基准测试记录。
+    """
+    stations, sources, times = synthetic_dataset(num_stations, num_events, v=v, seed=seed)
+    if solver in per_event:
+        sources, times = sources[:per_event_limit], times[:per_event_limit]
+    elif solver == 'joint':
+        sources, times = sources[:joint_limit], times[:joint_limit]
+    guess = default_initial_guess(stations, times)
+    function = solvers[solver]
+
+    start = time.perf_counter()
+    estimates, nfev = function(stations, times, guess, v)
+    wall_time = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        function(stations, times, guess, v)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    solved = len(estimates)
+    position_error = np.linalg.norm(estimates[:, :3] - sources[:solved, :3], axis=1)
+    return {
+        'solver': solver,
+        'stations': num_stations,
+        'events': num_events,
+        'solved_events': solved,
+        'wall_time': wall_time,
+        'time_per_event': wall_time / max(solved, 1),
+        'nfev': int(nfev),
+        'peak_memory_bytes': peak,
+        'position_rmse': float(np.sqrt(np.mean(position_error ** 2))),
+        'position_median_error': float(np.median(position_error)),
+        'time_rmse': float(np.sqrt(np.mean((estimates[:, 3] - sources[:solved, 3]) ** 2))),
+    }
+
+
+def parse_scale(text):
+    """把 ``'7x4'`` 形式的规模解析为 (监测点数, 事件数)。"""
+    stations, events = text.lower().split('x')
+    return int(stations), int(float(events))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='音爆定位求解器基准测试')
+    parser.add_argument('--scales', nargs='+', default=['7x4', '20x1000', '200x100000'],
+                        help='监测点数x事件数，例如 7x4 200x1e5')
+    parser.add_argument('--solvers', nargs='+', default=list(solvers), choices=list(solvers))
+    parser.add_argument('--per-event-limit', type=int, default=200)
+    parser.add_argument('--joint-limit', type=int, default=20000)
+    parser.add_argument('--no-memory', action='store_true', help='不测量峰值内存')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='JSON 输出路径，默认打印到标准输出')
+    args = parser.parse_args(argv)
+
+    records = []
+    for scale in args.scales:
+        num_stations, num_events = parse_scale(scale)
+        for solver in args.solvers:
+            record = run_benchmark(solver, num_stations, num_events, args.per_event_limit,
+                                   args.joint_limit, not args.no_memory, seed=args.seed)
+            records.append(record)
+            print(f"{solver:>12} {scale:>12}: {record['wall_time']:.3f} s, "
+                  f"nfev = {record['nfev']}, 位置误差中位数 = {record['position_median_error']:.2f} m",
+                  flush=True)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': args.seed,
+        },
+        'results': records,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding='utf-8')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""
+整个观测期的多事件联合平差：同时估计全部音爆源和每个监测点的时钟偏差。
+
+``problem4/4-1问题四求解.py`` 用一个 ``time_error_param`` 表示计时误差，
+所有监测点相同，和发生时间 ``t`` 无法区分。实际中各监测点的时钟各自漂移，
+一个监测点的偏差会出现在它记录的每个事件里。这里的残差为
+
+    r[e, n] = 走时(e, n) + t[e] + b[n] - T[e, n]
+
+参数是 E 个事件的 (x, y, z, t) 和 N 个时钟偏差 b。b 整体加一个常数、
+t 整体减去同一个常数时残差不变，因此约定 Σ b = 0。
+
+法方程按参数分块：事件部分是 E 个互不相关的 4×4 块，偏差部分只有 N 维。
+每次 Levenberg-Marquardt 迭代先消去事件块，得到 N×N 的 Schur 补
+S = C - Σ_e B_eᵀ A_e⁻¹ B_e，解出偏差的增量后再逐事件回代。
+事件按块处理，雅可比矩阵只在块内存在，内存占用与块大小和 N² 有关，与事件数无关；
+每次迭代的计算量约为 E·N² 次乘加。
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import v_sound, leftovers_batch, jacobian_columns
+from .telemetry import instrument
+
+
+class BundleSolution(NamedTuple):
+    """联合平差结果。"""
+    x: np.ndarray  # (E, 4) 各事件的 (x, y, z, t)
+    bias: np.ndarray  # (N,) 各监测点的时钟偏差（秒），Σ bias = 0
+    bias_std: np.ndarray  # (N,) 时钟偏差的标准差，按残差估计的到达时间误差计算
+    cost: float  # 残差平方和的一半
+    nit: int  # 迭代次数
+    success: bool  # 是否满足收敛条件
+
+
+def _chunk_terms(x, bias, times, mask, stations, v):
+    """一块事件的残差、雅可比矩阵转置和 4×4 块。"""
+    residual = np.where(mask, leftovers_batch(x, stations, times, v) + bias, 0.0)
+    columns = jacobian_columns(x, stations, v) * mask[:, None, :]  # (K, 4, N)
+    blocks = columns @ np.swapaxes(columns, 1, 2)
+    gradient = columns @ residual[:, :, None]
+    return residual, columns, blocks, gradient[:, :, 0]
+
+
+def _chunk_cost(x, bias, times, mask, stations, v):
+    residual = np.where(mask, leftovers_batch(x, stations, times, v) + bias, 0.0)
+    return 0.5 * np.sum(residual ** 2)
+
+
+@instrument('solve_bundle')
+def solve_bundle(times, stations, initial_guess='closed_form', initial_bias=None, v=v_sound,
+                 max_iterations=30, ftol=1e-10, chunk_size=4096):
+    """
+    联合估计全部事件的位置、发生时间和各监测点的时钟偏差。
+
+    Args:
+        times (ndarray): 形状为 (E, N) 的到达时间，缺失的拾取为 NaN；可以是内存映射。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米）。
+        initial_guess (array_like | str): 形状为 (E, 4) 的事件初值；字符串原样传给
+            ``solve_batch``，默认先按零偏差逐事件求解。
+        initial_bias (array_like): 形状为 (N,) 的时钟偏差初值，默认为零。
+        v (float | SoundSpeedProfile): 声速或声速剖面。
+        max_iterations (int): 最大迭代次数。
+        ftol (float): 代价的相对下降小于该值时停止。
+        chunk_size (int): 每块的事件数。
+
+    Returns:
+        BundleSolution: 联合平差结果。
+    """
+    stations = np.asarray(stations, dtype=float)
+    num_events, num_stations = np.shape(times)
+    bias = (np.zeros(num_stations) if initial_bias is None
+            else np.array(initial_bias, dtype=float))
+    if initial_guess is None or isinstance(initial_guess, str):
+        from .solvers import solve_batch
+
+        x = np.empty((num_events, 4))
+        for start in range(0, num_events, chunk_size):
+            block = np.asarray(times[start:start + chunk_size], dtype=float) - bias
+            x[start:start + chunk_size] = solve_batch(block, stations, initial_guess, v=v).x
+    else:
+        x = np.array(np.broadcast_to(np.asarray(initial_guess, dtype=float), (num_events, 4)))
+    # 偏差的零点移到事件时间上，残差不变
+    x[:, 3] += bias.mean()
+    bias -= bias.mean()
+
+    def chunks():
+        for start in range(0, num_events, chunk_size):
+            block = np.asarray(times[start:start + chunk_size], dtype=float)
+            mask = np.isfinite(block)
+            yield slice(start, start + len(block)), np.where(mask, block, 0.0), mask
+
+    cost = sum(_chunk_cost(x[rows], bias, block, mask, stations, v)
+               for rows, block, mask in chunks())
+    counts = np.zeros(num_stations)
+    for _, _, mask in chunks():
+        counts += mask.sum(axis=0)
+    damping = 1e-3
+    success = False
+    iteration = 0
+    schur = None
+    for iteration in range(1, max_iterations + 1):
+        # 第一遍：消去事件块，累加 Schur 补和右端项
+        schur = np.diag(counts)
+        rhs = np.zeros(num_stations)
+        inverses = np.empty((num_events, 4, 4))
+        steps = np.empty((num_events, 4))  # A_e⁻¹ g_e
+        for rows, block, mask in chunks():
+            residual, columns, blocks, gradient = _chunk_terms(x[rows], bias, block, mask,
+                                                               stations, v)
+            diagonal = np.diagonal(blocks, axis1=1, axis2=2)
+            # 没有拾取的事件对角元为 0，阻尼按 1 计，保证可逆
+            blocks[:, np.arange(4), np.arange(4)] += damping * np.where(diagonal > 0, diagonal, 1.0)
+            inverse = np.linalg.inv(blocks)
+            solved = inverse @ columns  # (K, 4, N) = A_e⁻¹ B_e
+            schur -= np.tensordot(columns, solved, axes=([0, 1], [0, 1]))
+            rhs -= residual.sum(axis=0)
+            rhs += np.einsum('ka,kan->n', gradient, solved)
+            inverses[rows] = inverse
+            steps[rows] = (inverse @ gradient[:, :, None])[:, :, 0]
+        applied = damping * np.maximum(counts, 1.0)
+        schur[np.diag_indices(num_stations)] += applied
+        # Σ b 方向在未加阻尼时奇异，加一个秩一项使方程组可解
+        gauge = np.mean(counts) / num_stations
+        bias_step = np.linalg.solve(schur + gauge, rhs)
+
+        # 第二遍：回代各事件的增量并计算试探点的代价
+        trial_x = np.empty_like(x)
+        trial_bias = bias + bias_step
+        trial_cost = 0.0
+        for rows, block, mask in chunks():
+            columns = jacobian_columns(x[rows], stations, v) * mask[:, None, :]
+            coupling = columns @ bias_step  # B_e δb
+            delta = -steps[rows] - (inverses[rows] @ coupling[:, :, None])[:, :, 0]
+            trial_x[rows] = x[rows] + delta
+            trial_cost += _chunk_cost(trial_x[rows], trial_bias, block, mask, stations, v)
+
+        if trial_cost < cost:
+            decrease = (cost - trial_cost) / max(cost, 1e-300)
+            x, bias, cost = trial_x, trial_bias, trial_cost
+            x[:, 3] += bias.mean()
+            bias -= bias.mean()
+            damping = max(damping / 3, 1e-9)
+            if decrease < ftol:
+                success = True
+                break
+        else:
+            damping *= 4
+            if damping > 1e8:
+                success = cost == 0
+                break
+
+    # 偏差的协方差：σ² 乘以 Schur 补（去掉阻尼）在 Σ b = 0 子空间上的逆，
+    # 即 (S + w·11ᵀ)⁻¹ - 11ᵀ / (w N²)；σ² 由残差和自由度估计
+    dof = counts.sum() - 4 * num_events - (num_stations - 1)
+    variance = 2 * cost / dof if dof > 0 else np.inf
+    if schur is not None:
+        schur[np.diag_indices(num_stations)] -= applied
+        inverse = np.linalg.inv(schur + gauge)
+        diagonal = np.diagonal(inverse) - 1 / (gauge * num_stations ** 2)
+        bias_std = np.sqrt(variance * np.maximum(diagonal, 0.0))
+    else:
+        bias_std = np.full(num_stations, np.inf)
+    return BundleSolution(x=x, bias=bias, bias_std=bias_std, cost=float(cost), nit=iteration,
+                          success=bool(success))
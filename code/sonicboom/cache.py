@@ -0,0 +1,246 @@
+"""
+按内容寻址的求解结果缓存。
+
+各脚本每次运行都从头求解，``3-2问题三求解可视化.py`` 为了画图又把 ``3-1``
+的 ``least_squares`` 重新算一遍。这里以（监测点坐标、到达时间、声速模型、
+求解器及其参数）的哈希为键保存求解结果：同一份数据重复处理、画图或做参数扫描时
+直接读取，不再求解。
+
+键中还包含求解函数所在源文件和本包全部源文件的摘要，改动求解器或它依赖的
+正演模型后旧条目自动失效。
+
+结果分两层保存：进程内按 LRU 保留最近用过的若干项，命中时返回数组的副本；
+磁盘上每项一个 ``.npz`` 文件，命中时更新修改时间，总大小超过上限时按修改时间从旧到新删除。
+能缓存的是字段为数组、标量或 None 的 NamedTuple（``BatchSolution``、``RobustSolution`` 等）。
+"""
+import functools
+import hashlib
+import inspect
+import os
+from collections import OrderedDict
+from importlib import import_module
+from pathlib import Path
+
+import numpy as np
+
+from . import telemetry
+
+# 键的计算方式或存储格式变化时递增，使旧缓存失效
+_cache_version = 2
+
+
+def cache_root():
+    """缓存根目录，可用环境变量 ``SONICBOOM_CACHE`` 指定。"""
+    return Path(os.environ.get('SONICBOOM_CACHE') or Path.home() / '.cache' / 'sonicboom')
+
+
+@functools.lru_cache(maxsize=None)
+def _source_digest(filename):
+    """源文件内容的摘要；读不到源文件（如交互式定义的函数）时为空串。"""
+    try:
+        return hashlib.sha1(Path(filename).read_bytes()).hexdigest()
+    except (OSError, TypeError):
+        return ''
+
+
+@functools.lru_cache(maxsize=1)
+def _package_digest():
+    """本包全部源文件的摘要，求解器调用的其他模块改动后同样使旧条目失效。"""
+    digest = hashlib.sha1()
+    for path in sorted(Path(__file__).resolve().parent.glob('*.py')):
+        digest.update(f'{path.name}:{_source_digest(str(path))};'.encode())
+    return digest.hexdigest()
+
+
+def _feed(digest, value):
+    """把一个值按类型和内容写入哈希。"""
+    if isinstance(value, np.ndarray) or isinstance(value, np.generic):
+        value = np.ascontiguousarray(value)
+        digest.update(f'array:{value.dtype.str}:{value.shape}:'.encode())
+        digest.update(value.tobytes())
+    elif value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        digest.update(f'{type(value).__name__}:{value!r};'.encode())
+    elif isinstance(value, dict):
+        digest.update(f'dict:{len(value)}:'.encode())
+        for key in sorted(value, key=repr):
+            _feed(digest, key)
+            _feed(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}:{len(value)}:'.encode())
+        for item in value:
+            _feed(digest, item)
+    elif callable(value) and hasattr(value, '__qualname__'):
+        # 装饰器包装的函数按原函数所在的源文件计算
+        try:
+            filename = inspect.getsourcefile(inspect.unwrap(value))
+        except TypeError:
+            filename = None
+        digest.update(f'function:{value.__module__}.{value.__qualname__}:'
+                      f'{_source_digest(filename)};'.encode())
+    elif hasattr(value, '__dict__'):
+        # 声速剖面等对象：类名加公开属性，忽略下划线开头的缓存字段
+        digest.update(f'object:{type(value).__module__}.{type(value).__qualname__}:'.encode())
+        _feed(digest, {key: item for key, item in vars(value).items() if not key.startswith('_')})
+    else:
+        digest.update(f'repr:{value!r};'.encode())
+
+
+def cache_key(*parts, **config):
+    """
+    计算缓存键。
+
+    Args:
+        *parts: 参与哈希的值：数组、标量、字符串、容器、函数或普通对象。
+        **config: 求解器参数，按名称排序后参与哈希。
+
+    Returns:
+        str: 十六进制的 SHA-1 摘要。
+    """
+    digest = hashlib.sha1(f'sonicboom-cache:{_cache_version}:{_package_digest()};'.encode())
+    _feed(digest, parts)
+    _feed(digest, config)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    内存加磁盘两层的求解结果缓存。
+
+    Args:
+        directory (str | Path): 磁盘缓存目录，None 表示 ``cache_root() / 'results'``；
+            False 表示只用内存。
+        max_bytes (int): 磁盘缓存的总大小上限。
+        memory_items (int): 内存中保留的最大项数。
+    """
+
+    def __init__(self, directory=None, max_bytes=1 << 30, memory_items=128):
+        if directory is False:
+            self.directory = None
+        else:
+            self.directory = Path(directory) if directory else cache_root() / 'results'
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return self.directory / f'{key}.npz'
+
+    def get(self, key):
+        """取出缓存的结果，没有时返回 None。"""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self._hit(self._copy(self.memory[key]))
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                with np.load(path, allow_pickle=False) as stored:
+                    value = self._restore(stored)
+                os.utime(path)
+            except (FileNotFoundError, KeyError, ValueError, ImportError, AttributeError,
+                    TypeError):
+                # 不存在、写了一半或格式已过时的条目都按未命中处理
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                return self._hit(value)
+        self.misses += 1
+        if telemetry.active() is not None:
+            telemetry.active().count('cache.miss')
+        return None
+
+    def _hit(self, value):
+        self.hits += 1
+        if telemetry.active() is not None:
+            telemetry.active().count('cache.hit')
+        return value
+
+    @staticmethod
+    def _copy(value):
+        """复制数组字段，调用方修改返回的结果不会改动缓存中的条目。"""
+        return type(value)(*(item.copy() if isinstance(item, np.ndarray) else item
+                             for item in value))
+
+    def _remember(self, key, value):
+        self.memory[key] = self._copy(value)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_items:
+            self.memory.popitem(last=False)
+
+    @staticmethod
+    def _restore(stored):
+        module, name = str(stored['__type__']).rsplit(':', 1)
+        cls = getattr(import_module(module), name)
+        missing = set(stored['__none__'].tolist())
+        fields = {}
+        for field in cls._fields:
+            if field in missing:
+                fields[field] = None
+                continue
+            value = stored[field]
+            fields[field] = value.item() if value.ndim == 0 else value
+        return cls(**fields)
+
+    def put(self, key, value):
+        """保存结果；磁盘缓存超过上限时删除最久未用的条目。"""
+        self._remember(key, value)
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        # 先写临时文件再改名，避免并发进程读到写了一半的文件
+        temporary = path.with_suffix(f'.{os.getpid()}.tmp')
+        arrays = {field: np.asarray(item) for field, item in zip(value._fields, value)
+                  if item is not None}
+        # None 不能不经 pickle 保存，只记下字段名
+        missing = np.array([field for field, item in zip(value._fields, value) if item is None],
+                           dtype=str)
+        with open(temporary, 'wb') as handle:
+            np.savez(handle, __type__=f'{type(value).__module__}:{type(value).__qualname__}',
+                     __none__=missing, **arrays)
+        os.replace(temporary, path)
+        self.evict()
+
+    def evict(self):
+        """按修改时间从旧到新删除磁盘条目，直到总大小不超过 ``max_bytes``。"""
+        if self.directory is None or not self.directory.exists():
+            return
+        entries = []
+        for path in self.directory.glob('*.npz'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def call(self, function, *args, **kwargs):
+        """
+        以函数、位置参数和关键字参数为键，命中时直接返回缓存结果，否则调用并保存。
+
+        Args:
+            function (callable): 求解函数，返回字段为数组或标量的 NamedTuple。
+            *args, **kwargs: 传给 ``function`` 的参数，同时参与哈希。
+
+        Returns:
+            求解结果。
+        """
+        key = cache_key(function, *args, **kwargs)
+        value = self.get(key)
+        if value is None:
+            value = function(*args, **kwargs)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """清空内存和磁盘缓存。"""
+        self.memory.clear()
+        if self.directory is not None and self.directory.exists():
+            for path in self.directory.glob('*.npz'):
+                path.unlink(missing_ok=True)
@@ -0,0 +1,374 @@
+"""
+无界面的命令行入口。
+
+在 ``code`` 目录下运行 ``python -m sonicboom <子命令>``。各子命令只导入自己需要的
+模块，定位类子命令不会加载 matplotlib，绘图子命令只写文件、不弹出窗口。
+"""
+import argparse
+import json
+import sys
+
+import numpy as np
+
+
+def _runner(args):
+    """``--cache`` 时经结果缓存调用求解函数，否则直接调用。"""
+    if not getattr(args, 'cache', False):
+        return lambda function, *a, **kw: function(*a, **kw)
+    from .cache import ResultCache
+    return ResultCache().call
+
+
+def _locate(args):
+    from .data import load_dataset
+    from .geometry import locate, project_stations
+    from .solvers import solve_batch
+
+    if args.sound_speed and args.atmosphere == 'standard':
+        sys.exit('--sound-speed 不能与 --atmosphere standard 同时使用，标准大气的声速由剖面给出。')
+    dataset = load_dataset(args.dataset)
+    if dataset.times is None:
+        sys.exit(f'数据集 {args.dataset} 没有到达时间，无法定位。')
+    v = args.sound_speed or dataset.v
+    if args.atmosphere == 'standard':
+        from .atmosphere import standard_atmosphere
+        v = standard_atmosphere()
+    run = _runner(args)
+    if args.raw:
+        # 与原脚本一致，直接在经纬度和高程混合的坐标中求解
+        solution = run(solve_batch, dataset.times, dataset.stations, [110.5, 27.5, 750, 0], v=v)
+    elif args.method == 'closed_form':
+        from .closedform import solve_closed_form
+
+        frame, local = project_stations(dataset.stations)
+        solution = run(solve_closed_form, dataset.times, local, v=v)
+        solution = solution._replace(x=frame.to_geodetic(solution.x))
+    else:
+        initial_guess = {'seeded': 'closed_form', 'grid': 'grid'}.get(args.method)
+        solution = run(locate, dataset.times, dataset.stations, initial_guess, v=v)
+    uncertainty = None
+    if args.save or args.uncertainty:
+        from .uncertainty import linearized_uncertainty
+
+        frame, local = project_stations(dataset.stations)
+        sources = np.column_stack([frame.to_local(solution.x[:, :3]), solution.x[:, 3]])
+        uncertainty = linearized_uncertainty(sources, local, dataset.times, args.error_std, v,
+                                             validate=args.validate, seed=0)
+    if args.save:
+        from .geometry import lat_meters
+        from .results import save_results
+
+        # 协方差换成与经纬度坐标相同的单位
+        scale = np.array([1 / frame.east_scale, 1 / lat_meters, 1.0])
+        save_results(args.save, solution.x, dataset.stations, dataset.names, solution.success,
+                     solution.cost, uncertainty.covariance[:, :3, :3] * scale[:, None] * scale)
+    for i, (x, cost, success) in enumerate(zip(solution.x, solution.cost, solution.success)):
+        record = {'event': i, 'lon': x[0], 'lat': x[1], 'alt': x[2], 't': x[3],
+                  'cost': cost, 'success': bool(success)}
+        if args.uncertainty:
+            record.update({'std': uncertainty.std[i].tolist(),
+                           'ellipsoid': uncertainty.radii[i].tolist()})
+        print(json.dumps({k: (float(val) if isinstance(val, np.floating) else val)
+                          for k, val in record.items()}, ensure_ascii=False))
+    if uncertainty is not None and uncertainty.validated is not None:
+        ratio = uncertainty.monte_carlo_std / uncertainty.std[uncertainty.validated]
+        print(f'# 蒙特卡洛检验 {len(uncertainty.validated)} 个事件，标准差之比（蒙特卡洛/线性化）'
+              f'中位数 x/y/z/t = {np.round(np.nanmedian(ratio, axis=0), 3).tolist()}',
+              file=sys.stderr)
+
+
+def _target_grid(args, local, shape=(8, 8, 3)):
+    """
+    目标区域：监测网水平范围内、``args.altitude`` 高程区间上的规则网格。
+
+    Returns:
+        tuple: (三个方向的坐标轴, 形状为 (Q, 3) 的网格点)。
+    """
+    low, high = local[:, :2].min(axis=0), local[:, :2].max(axis=0)
+    axes = [np.linspace(low[0], high[0], shape[0]), np.linspace(low[1], high[1], shape[1]),
+            np.linspace(args.altitude[0], args.altitude[1], shape[2])]
+    return axes, np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, 3)
+
+
+def _select(args):
+    from .data import load_dataset
+    from .geometry import project_stations
+    from .subset import select_stations
+
+    dataset = load_dataset(args.dataset)
+    _, local = project_stations(dataset.stations)
+    _, targets = _target_grid(args, local)
+    selection = select_stations(local, targets, k=args.k, top=args.top)
+    for subset, score in zip(selection.subsets, selection.scores):
+        print(json.dumps({'stations': [dataset.names[i] for i in subset], 'gdop': float(score)},
+                         ensure_ascii=False))
+    print(f'# {selection.method}: 评价 {selection.evaluated} 个子集，耗时 {selection.elapsed:.3f} s',
+          file=sys.stderr)
+
+
+def _precision(args):
+    from .data import load_dataset
+    from .geometry import project_stations
+    from .precision import precision_map
+
+    dataset = load_dataset(args.dataset)
+    _, local = project_stations(dataset.stations)
+    axes, _ = _target_grid(args, local, args.shape)
+    layouts = {'all': np.ones(len(local), dtype=bool)}
+    if args.without:
+        layouts['without ' + ' '.join(args.without)] = ~np.isin(dataset.names, args.without)
+    for label, active in layouts.items():
+        result = precision_map(local, axes, error_std=args.error_std, v=dataset.v, active=active)
+        error = result.position_error[np.isfinite(result.gdop)]
+        print(json.dumps({'layout': label, 'stations': int(active.sum()),
+                          'gdop_median': float(np.median(result.gdop)),
+                          'error_median': float(np.median(error)),
+                          'error_p95': float(np.percentile(error, 95))}, ensure_ascii=False))
+
+
+def _place(args):
+    from .data import load_dataset
+    from .geometry import project_stations
+    from .placement import place_stations
+
+    dataset = load_dataset(args.dataset)
+    frame, local = project_stations(dataset.stations)
+    # 候选站址：监测网经纬度范围向外扩展后的规则网格，高程取已有监测点的平均值
+    low, high = dataset.stations[:, :2].min(axis=0), dataset.stations[:, :2].max(axis=0)
+    margin = args.margin * (high - low)
+    lon, lat = np.meshgrid(np.linspace(low[0] - margin[0], high[0] + margin[0], args.grid),
+                           np.linspace(low[1] - margin[1], high[1] + margin[1], args.grid))
+    sites = np.column_stack([lon.ravel(), lat.ravel(),
+                             np.full(lon.size, dataset.stations[:, 2].mean())])
+    _, targets = _target_grid(args, local)
+    placement = place_stations(local, frame.to_local(sites), targets, k=args.k)
+    print(json.dumps({'added': 0, 'gdop': placement.baseline}))
+    for i, (index, score) in enumerate(zip(placement.chosen, placement.scores), 1):
+        print(json.dumps({'added': i, 'lon': float(sites[index, 0]), 'lat': float(sites[index, 1]),
+                          'alt': float(sites[index, 2]), 'gdop': float(score)}))
+    print(f'# 评价 {len(sites)} 个候选站址，耗时 {placement.elapsed:.3f} s', file=sys.stderr)
+
+
+def _serve(args):
+    import asyncio
+
+    from .data import load_dataset
+    from .service import LocalizationService
+
+    dataset = load_dataset(args.dataset)
+    service = LocalizationService(dataset.stations, dataset.names, v=args.sound_speed or dataset.v,
+                                  window=args.window, max_batch=args.max_batch,
+                                  event_timeout=args.event_timeout, workers=args.workers)
+    where = args.unix or f'{args.host}:{args.port}'
+    print(f'# 定位服务监听 {where}，监测点 {len(dataset.names)} 个', file=sys.stderr)
+    try:
+        asyncio.run(service.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+def _bundle(args):
+    from .bundle import solve_bundle
+    from .data import load_dataset
+    from .geometry import project_stations
+
+    dataset = load_dataset(args.dataset)
+    if dataset.times is None:
+        sys.exit(f'数据集 {args.dataset} 没有到达时间，无法定位。')
+    frame, local = project_stations(dataset.stations)
+    solution = solve_bundle(dataset.times, local, v=args.sound_speed or dataset.v,
+                            max_iterations=args.max_iterations, chunk_size=args.chunk_size)
+    for name, bias, std in zip(dataset.names, solution.bias, solution.bias_std):
+        print(json.dumps({'station': name, 'bias': float(bias), 'std': float(std)},
+                         ensure_ascii=False))
+    if args.save:
+        from .results import save_results
+
+        save_results(args.save, frame.to_geodetic(solution.x), dataset.stations, dataset.names)
+    print(f'# {len(solution.x)} 个事件，迭代 {solution.nit} 次，代价 {solution.cost:.6g}，'
+          f'{"收敛" if solution.success else "未收敛"}', file=sys.stderr)
+
+
+def _export(args):
+    from .columnar import write_events
+    from .data import load_dataset
+
+    dataset = load_dataset(args.dataset)
+    times = dataset.times if dataset.times is not None else np.empty((0, len(dataset.names)))
+    write_events(args.output, dataset.names, dataset.stations, times, dataset.v)
+    print(f'# 写入 {args.output}：监测点 {len(dataset.names)} 个，事件 {len(times)} 个',
+          file=sys.stderr)
+
+
+def _generate(args):
+    from .synthetic import SyntheticWorkload
+
+    workload = SyntheticWorkload(args.stations, seed=args.seed, noise_std=args.noise_std,
+                                 missing=args.missing, outliers=args.outliers,
+                                 clock_std=args.clock_std, event_rate=args.event_rate)
+    if args.output:
+        workload.write(args.output, args.events, size=args.chunk_size)
+        print(f'# 写入 {args.output}：监测点 {args.stations} 个，事件 {args.events} 个',
+              file=sys.stderr)
+    else:
+        workload.stream(args.events, size=args.chunk_size, rate=args.rate)
+
+
+def _simulate(args):
+    from .simulation import evaluate_device_counts
+
+    summary = evaluate_device_counts(args.counts, num_scenarios=args.scenarios, seed=args.seed,
+                                     error_std=args.error_std)
+    for count, (volatility, converged) in summary.items():
+        print(json.dumps({'devices': count, 'median_volatility': volatility,
+                          'converged': converged}))
+
+
+def _plot(args):
+    from .data import load_dataset
+    from .plotting import plot_network, plot_sources
+
+    if args.results:
+        from .plotting import plot_results
+        plot_results(args.results, output=args.output, mode=args.mode,
+                     max_points=args.max_points)
+        return
+    dataset = load_dataset(args.dataset)
+    if args.sources and dataset.times is not None:
+        from .geometry import locate
+        solution = _runner(args)(locate, dataset.times, dataset.stations, v=dataset.v)
+        plot_sources(solution.x, dataset.stations, output=args.output)
+    else:
+        plot_network(dataset.stations, names=dataset.names, links=True, output=args.output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sonicboom', description='音爆定位命令行工具')
+    parser.add_argument('--telemetry', metavar='PATH',
+                        help='把求解的计数、计时记录以 JSON 行追加到文件，- 表示标准错误')
+    parser.add_argument('--telemetry-events', choices=['none', 'failed', 'all'], default='failed')
+    parser.add_argument('--profile-interval', type=float, help='启用采样分析器，采样间隔（秒）')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_locate = commands.add_parser('locate', help='对题目数据批量定位，输出 JSON 行')
+    parser_locate.add_argument('--dataset', default='problem3',
+                               help='数据集名称，或 export 写入的数据目录')
+    parser_locate.add_argument('--sound-speed', type=float, help='覆盖数据集默认的声速')
+    parser_locate.add_argument('--raw', action='store_true', help='按原脚本在经纬度坐标中直接求解')
+    parser_locate.add_argument('--method', choices=['lm', 'closed_form', 'seeded', 'grid'],
+                               default='lm',
+                               help='lm: 迭代求解；closed_form: 只用闭式解；seeded: 闭式解作初值再迭代；'
+                                    'grid: 走时网格搜索初值再迭代')
+    parser_locate.add_argument('--atmosphere', choices=['constant', 'standard'], default='constant',
+                               help='standard: 按国际标准大气的声速剖面计算走时')
+    parser_locate.add_argument('--cache', action='store_true', help='相同输入直接读取缓存的结果')
+    parser_locate.add_argument('--save', metavar='PATH', help='把结果和不确定度写入 .npz 文件')
+    parser_locate.add_argument('--error-std', type=float, default=0.5,
+                               help='计算不确定度时到达时间误差的标准差（秒）')
+    parser_locate.add_argument('--uncertainty', action='store_true',
+                               help='输出线性化的标准差和 95%% 置信椭球半轴（米、秒）')
+    parser_locate.add_argument('--validate', type=int, default=0, metavar='K',
+                               help='抽取 K 个事件用蒙特卡洛检验线性化的标准差，结果写到标准错误')
+    parser_locate.set_defaults(handler=_locate)
+
+    parser_select = commands.add_parser('select', help='按 GDOP 选择监测点子集')
+    parser_select.add_argument('--dataset', default='problem1')
+    parser_select.add_argument('-k', type=int, default=4)
+    parser_select.add_argument('--top', type=int, default=5)
+    parser_select.add_argument('--altitude', type=float, nargs=2, default=(10000, 15000))
+    parser_select.set_defaults(handler=_select)
+
+    parser_precision = commands.add_parser('precision', help='计算监测网的定位精度下界')
+    parser_precision.add_argument('--dataset', default='problem4')
+    parser_precision.add_argument('--without', nargs='+', help='与去掉这些监测点后的布网比较')
+    parser_precision.add_argument('--altitude', type=float, nargs=2, default=(1000, 20000))
+    parser_precision.add_argument('--shape', type=int, nargs=3, default=(50, 50, 20))
+    parser_precision.add_argument('--error-std', type=float, default=0.5)
+    parser_precision.set_defaults(handler=_precision)
+
+    parser_place = commands.add_parser('place', help='从候选站址中贪心挑选新增监测点')
+    parser_place.add_argument('--dataset', default='problem3')
+    parser_place.add_argument('-k', type=int, default=2)
+    parser_place.add_argument('--grid', type=int, default=60, help='候选站址网格每个方向的点数')
+    parser_place.add_argument('--margin', type=float, default=0.5, help='候选区域向外扩展的比例')
+    parser_place.add_argument('--altitude', type=float, nargs=2, default=(10000, 15000))
+    parser_place.set_defaults(handler=_place)
+
+    parser_serve = commands.add_parser('serve', help='启动常驻的定位服务（JSON 行协议）')
+    parser_serve.add_argument('--dataset', default='problem4', help='提供监测点几何的数据集')
+    parser_serve.add_argument('--sound-speed', type=float, help='覆盖数据集默认的声速')
+    parser_serve.add_argument('--host', default='127.0.0.1')
+    parser_serve.add_argument('--port', type=int, default=8765)
+    parser_serve.add_argument('--unix', metavar='PATH', help='改为监听 Unix 套接字')
+    parser_serve.add_argument('--window', type=float, default=0.005, help='攒批等待时间（秒）')
+    parser_serve.add_argument('--max-batch', type=int, default=1024)
+    parser_serve.add_argument('--event-timeout', type=float, default=0.05,
+                              help='等待同一事件其余拾取的时间（秒）')
+    parser_serve.add_argument('--workers', type=int, default=1, help='工作进程数，0 表示在线程中求解')
+    parser_serve.set_defaults(handler=_serve)
+
+    parser_bundle = commands.add_parser('bundle', help='联合平差：估计全部事件和各监测点的时钟偏差')
+    parser_bundle.add_argument('--dataset', default='problem3',
+                               help='数据集名称，或 export 写入的数据目录')
+    parser_bundle.add_argument('--sound-speed', type=float, help='覆盖数据集默认的声速')
+    parser_bundle.add_argument('--max-iterations', type=int, default=30)
+    parser_bundle.add_argument('--chunk-size', type=int, default=4096, help='每块的事件数')
+    parser_bundle.add_argument('--save', metavar='PATH', help='把事件的定位结果写入 .npz 文件')
+    parser_bundle.set_defaults(handler=_bundle)
+
+    parser_export = commands.add_parser('export', help='把数据集写成按列存储的数据目录')
+    parser_export.add_argument('--dataset', default='problem4')
+    parser_export.add_argument('--output', required=True, help='输出目录，如 problem4.events')
+    parser_export.set_defaults(handler=_export)
+
+    parser_generate = commands.add_parser('generate', help='生成可复现的合成负载')
+    parser_generate.add_argument('--events', type=int, default=100000)
+    parser_generate.add_argument('--stations', type=int, default=20)
+    parser_generate.add_argument('--seed', type=int, default=0)
+    parser_generate.add_argument('--chunk-size', type=int, default=65536, help='每块的事件数')
+    parser_generate.add_argument('--noise-std', type=float, default=0.05, help='拾取噪声（秒）')
+    parser_generate.add_argument('--missing', type=float, default=0.1, help='拾取缺失的概率')
+    parser_generate.add_argument('--outliers', type=float, default=0.01, help='离群拾取的概率')
+    parser_generate.add_argument('--clock-std', type=float, default=0.0, help='时钟偏差（秒）')
+    parser_generate.add_argument('--event-rate', type=float, default=10.0,
+                                 help='模拟时间内每秒的音爆数')
+    parser_generate.add_argument('--output', metavar='DIR',
+                                 help='写入按列存储的数据目录；不给出时以 JSON 行写到标准输出')
+    parser_generate.add_argument('--rate', type=float, help='输出到标准输出时每秒的事件数')
+    parser_generate.set_defaults(handler=_generate)
+
+    parser_simulate = commands.add_parser('simulate', help='问题二的批量场景模拟')
+    parser_simulate.add_argument('--counts', type=int, nargs='+', default=[4, 5, 6, 7])
+    parser_simulate.add_argument('--scenarios', type=int, default=10000)
+    parser_simulate.add_argument('--error-std', type=float, default=0.0)
+    parser_simulate.add_argument('--seed', type=int)
+    parser_simulate.set_defaults(handler=_simulate)
+
+    parser_plot = commands.add_parser('plot', help='把监测点或音爆源绘制到文件')
+    parser_plot.add_argument('--dataset', default='problem3')
+    parser_plot.add_argument('--sources', action='store_true', help='绘制定位得到的音爆源')
+    parser_plot.add_argument('--output', required=True, help='输出文件，如 figure.png')
+    parser_plot.add_argument('--cache', action='store_true', help='读取或保存定位结果的缓存')
+    parser_plot.add_argument('--results', metavar='PATH', help='从 locate --save 写入的文件绘图，不再求解')
+    parser_plot.add_argument('--mode', choices=['auto', 'scatter', 'decimate', 'density'],
+                             default='auto')
+    parser_plot.add_argument('--max-points', type=int, default=50000)
+    parser_plot.set_defaults(handler=_plot)
+
+    parser_bench = commands.add_parser('bench', help='运行求解器基准测试', add_help=False)
+    parser_bench.set_defaults(handler=None)
+
+    args, rest = parser.parse_known_args(argv)
+    if args.command == 'bench':
+        from .bench import main as bench_main
+        bench_main(rest)
+        return
+    if rest:
+        parser.error('无法识别的参数: ' + ' '.join(rest))
+    if args.telemetry:
+        from .telemetry import open_telemetry
+        with open_telemetry(args.telemetry, events=args.telemetry_events,
+                            profile_interval=args.profile_interval):
+            args.handler(args)
+    else:
+        args.handler(args)
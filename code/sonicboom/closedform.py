@@ -0,0 +1,115 @@
+"""
+到达时间方程的闭式解（球面相交法）。
+
+对每个监测点 i，``leftovers()`` 背后的方程为 |p - s_i| = v (T_i - t)，平方后
+
+    |p|² - 2 s_i·p + |s_i|² = v² T_i² - 2 v² T_i t + v² t²
+
+两边的 |p|² - v² t² 对所有监测点相同，各方程减去（有效监测点上的）平均方程后
+即成为 (p, t) 的线性方程组，每个事件只需解一个 4×4 的法方程，
+全部事件堆叠成 (E, 4, 4) 一次求解，无需迭代。
+
+监测点大致共面时，差分后的方程不含垂直于监测面的分量，
+此时只解面内坐标和时间，高度再由原方程 (h - h_i)² = v²(T_i - t)² - |面内距离|² 恢复，
+取监测面上方的解，并把监测点离面的起伏移到右端项后重复几次。
+结果可以直接使用，也可以作为 ``solve_batch`` 的初值。
+"""
+import numpy as np
+
+from .forward import v_sound, leftovers_batch
+from .solvers import BatchSolution
+from .telemetry import instrument
+
+
+def _station_frame(stations, mask):
+    """
+    每个事件有效监测点的质心和主轴坐标系，第三个轴为监测面的法向（朝上）。
+
+    Returns:
+        tuple: (质心 (E, 3), 基 (E, 3, 3) 按列为轴, 各轴上的标准差 (E, 3))。
+    """
+    weight = mask[..., None].astype(float)
+    count = np.maximum(weight.sum(axis=1), 1)
+    centroid = np.sum(stations * weight, axis=-2) / count
+    centred = (stations - centroid[:, None]) * weight
+    scatter = np.swapaxes(centred, 1, 2) @ centred / count[..., None]
+    spread, axes = np.linalg.eigh(scatter)
+    # eigh 按特征值升序，翻转后最后一轴为最小主轴（法向）
+    spread, axes = spread[:, ::-1], axes[:, :, ::-1].copy()
+    axes[:, :, 2] *= np.where(axes[:, 2, 2] < 0, -1.0, 1.0)[:, None]
+    return centroid, axes, np.sqrt(np.maximum(spread, 0))
+
+
+@instrument('solve_closed_form')
+def solve_closed_form(times, stations, v=v_sound, planar_ratio=0.1, iterations=3):
+    """
+    用线性化的到达时间方程一次性求解全部事件。
+
+    Args:
+        times (ndarray): 形状为 (E, N) 的到达时间矩阵，缺失的拾取记为 NaN。
+        stations (ndarray): 形状为 (N, 3) 或 (E, N, 3) 的监测点坐标（米）。
+        v (float | SoundSpeedProfile): 声速；声速剖面按 ``mean_speed()`` 的常声速线性化，
+            残差仍按剖面计算。
+        planar_ratio (float): 监测点在法向上的标准差与最大水平标准差之比低于该值时，
+            按共面处理，高度由原方程恢复。
+        iterations (int): 共面时修正监测点离面起伏的次数。
+
+    Returns:
+        BatchSolution: 各事件的解；``nfev`` 为 0，有效监测点不足
+            （非共面少于 5 个、共面少于 4 个）的事件 ``success`` 为 False。
+    """
+    times = np.atleast_2d(np.asarray(times, dtype=float))
+    profile, v = v, v.mean_speed() if hasattr(v, 'mean_speed') else v
+    num_events, num_stations = times.shape
+    stations = np.broadcast_to(np.asarray(stations, dtype=float), (num_events, num_stations, 3))
+    mask = np.isfinite(times)
+    weight = mask.astype(float)
+    count = weight.sum(axis=1)
+
+    centroid, axes, spread = _station_frame(stations, mask)
+    planar = spread[:, 2] < planar_ratio * spread[:, 0]
+    local = (stations - centroid[:, None]) @ axes  # (E, N, 3)
+
+    # 以最早到达时间为时间原点，并把时间未知量换成距离 v·t，使各列量级相当
+    reference = np.nanmin(np.where(mask, times, np.inf), axis=1)
+    reference = np.where(np.isfinite(reference), reference, 0.0)
+    reach = np.where(mask, v * (times - reference[:, None]), 0.0)  # (E, N)
+
+    def centre(values):
+        mean = np.sum(values * weight, axis=1, keepdims=True) / np.maximum(count, 1)[:, None]
+        return (values - mean) * weight
+
+    design = np.empty((num_events, num_stations, 4))
+    for k in range(3):
+        design[..., k] = -2 * centre(local[..., k])
+    design[..., 3] = 2 * centre(reach)
+    design[planar, :, 2] = 0.0
+    rhs0 = centre(reach ** 2 - np.sum(local ** 2, axis=-1))
+
+    normal = np.swapaxes(design, 1, 2) @ design
+    normal[planar, 2, 2] = 1.0
+    # 监测点不足或共线时法方程奇异，加一个相对很小的阻尼使批量求解不中断
+    normal += 1e-12 * np.trace(normal, axis1=1, axis2=2)[:, None, None] * np.eye(4)
+    projected = np.swapaxes(design, 1, 2)
+    height = np.zeros(num_events)
+    for _ in range(iterations if np.any(planar) else 1):
+        # 共面时把法向分量的贡献 -2 h_i h 移到右端项
+        rhs = rhs0 + np.where(planar[:, None], 2 * centre(local[..., 2]) * height[:, None], 0.0)
+        solution = np.linalg.solve(normal, projected @ rhs[..., None])[..., 0]
+        # (h - h_i)² = (v(T_i - t))² - 面内距离²，取监测面上方的解
+        squared = ((reach - solution[:, 3, None]) ** 2
+                   - (solution[:, 0, None] - local[..., 0]) ** 2
+                   - (solution[:, 1, None] - local[..., 1]) ** 2)
+        candidates = local[..., 2] + np.sqrt(np.maximum(squared, 0.0))
+        height = np.sum(candidates * weight, axis=1) / np.maximum(count, 1)
+        solution[planar, 2] = height[planar]
+
+    x = np.empty((num_events, 4))
+    x[:, :3] = centroid + (axes @ solution[:, :3, None])[..., 0]
+    x[:, 3] = reference + solution[:, 3] / v
+
+    fun = np.where(mask, leftovers_batch(x, stations, np.where(mask, times, 0.0), profile), 0.0)
+    cost = 0.5 * np.sum(fun ** 2, axis=1)
+    success = (count >= np.where(planar, 4, 5)) & np.all(np.isfinite(x), axis=1)
+    return BatchSolution(x=x, cost=cost, fun=fun, nfev=np.zeros(num_events, dtype=int),
+                         success=success)
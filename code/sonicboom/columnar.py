@@ -0,0 +1,184 @@
+"""
+按列存储、以内存映射方式打开的监测点和事件数据。
+
+监测点和到达时间原来写在各脚本的 ``coordinates``、``facilities`` 字典里，
+每个脚本各抄一份，求解前再用列表推导式拼成逐事件的元组。这里把一组数据存成一个目录：
+
+    schema.json     名称、声速、行数和各列的类型与形状
+    stations.npy    (N, 3) 监测点坐标，float64
+    times.bin       (M, N) 到达时间，float64 小端、按行连续存放，缺失的拾取为 NaN
+    <列名>.bin      其他逐事件的列（如模拟数据的真实音爆源），格式同上
+
+各列是不带文件头的定长数组，打开时用 ``np.memmap`` 只读映射，不读入内存；
+切片得到的都是视图，可以直接交给批量求解器。写入时逐块追加到列文件末尾，
+最后写 ``schema.json`` 记录行数，因此 10^7 个拾取的数据也不需要一次放进内存。
+"""
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+# 格式变化时递增
+_format_version = 1
+
+
+class EventTable(NamedTuple):
+    """按列打开的一组数据，数组均为只读的内存映射。"""
+    names: list  # 监测点名称
+    stations: np.ndarray  # (N, 3) 监测点坐标
+    times: np.ndarray  # (M, N) 到达时间
+    v: float  # 声速
+    columns: dict  # 其他逐事件的列，列名 -> (M, ...) 数组
+    metadata: dict  # 写入时附带的说明，如模拟参数
+
+    def chunks(self, size=65536):
+        """
+        按行分块遍历。
+
+        Args:
+            size (int): 每块的事件数。
+
+        Yields:
+            tuple: (起始行号, 到达时间视图, 其他列视图组成的字典)。
+        """
+        for start in range(0, len(self.times), size):
+            stop = start + size
+            yield start, self.times[start:stop], {name: column[start:stop]
+                                                  for name, column in self.columns.items()}
+
+
+class EventWriter:
+    """
+    逐块追加写入按列存储的数据，用作上下文管理器，退出时写入 ``schema.json``。
+
+    Args:
+        path (str | Path): 输出目录，不存在时创建，已有的同名列会被覆盖。
+        names (list): 监测点名称。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        v (float): 声速。
+        metadata (dict): 写入 ``schema.json`` 的附加说明，须可 JSON 序列化。
+    """
+
+    def __init__(self, path, names, stations, v, metadata=None):
+        self.path = Path(path)
+        self.names = [str(name) for name in names]
+        self.stations = np.asarray(stations, dtype=float)
+        self.v = float(v)
+        self.metadata = dict(metadata or {})
+        self.rows = 0
+        self.layout = {}  # 列名 -> (dtype, 每行的形状)
+        self.handles = {}
+        self.path.mkdir(parents=True, exist_ok=True)
+        # 旧的 schema.json 先删掉，写了一半的目录不会被当成完整数据打开
+        (self.path / 'schema.json').unlink(missing_ok=True)
+        np.save(self.path / 'stations.npy', self.stations)
+
+    def append(self, times, **columns):
+        """
+        追加一块事件。
+
+        Args:
+            times (ndarray): 形状为 (K, N) 的到达时间。
+            **columns: 其他逐事件的列，每列形状为 (K, ...)；各块的列名、类型和形状须一致。
+        """
+        times = np.atleast_2d(np.asarray(times, dtype=float))
+        if times.shape[1] != len(self.names):
+            raise ValueError(f'到达时间有 {times.shape[1]} 列，监测点有 {len(self.names)} 个')
+        columns = {'times': times, **{name: np.asarray(value) for name, value in columns.items()}}
+        for name, value in columns.items():
+            if len(value) != len(times):
+                raise ValueError(f'列 {name} 有 {len(value)} 行，到达时间有 {len(times)} 行')
+            layout = (value.dtype.newbyteorder('<'), value.shape[1:])
+            if name not in self.layout:
+                if self.rows:
+                    raise ValueError(f'列 {name} 不在第一块中')
+                self.layout[name] = layout
+                self.handles[name] = open(self.path / f'{name}.bin', 'wb')
+            elif self.layout[name] != layout:
+                raise ValueError(f'列 {name} 的类型或形状与之前的块不一致')
+        if set(columns) != set(self.layout):
+            raise ValueError(f'缺少列 {sorted(set(self.layout) - set(columns))}')
+        for name, value in columns.items():
+            np.ascontiguousarray(value, dtype=self.layout[name][0]).tofile(self.handles[name])
+        self.rows += len(times)
+
+    def close(self):
+        """关闭列文件并写入 ``schema.json``。"""
+        if 'times' not in self.layout:
+            self.append(np.empty((0, len(self.names))))
+        for handle in self.handles.values():
+            handle.close()
+        schema = {
+            'format': 'sonicboom-events', 'version': _format_version,
+            'names': self.names, 'v': self.v, 'rows': self.rows,
+            'columns': {name: {'dtype': dtype.str, 'shape': list(shape)}
+                        for name, (dtype, shape) in self.layout.items()},
+            'metadata': self.metadata,
+        }
+        temporary = self.path / f'schema.{os.getpid()}.tmp'
+        temporary.write_text(json.dumps(schema, ensure_ascii=False, indent=1), encoding='utf-8')
+        os.replace(temporary, self.path / 'schema.json')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # 写入出错时不写 schema.json，目录不会被当成完整数据打开
+            for handle in self.handles.values():
+                handle.close()
+
+
+def write_events(path, names, stations, times, v, **columns):
+    """
+    一次写入整组数据。
+
+    Args:
+        path (str | Path): 输出目录。
+        names (list): 监测点名称。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        times (ndarray): 形状为 (M, N) 的到达时间。
+        v (float): 声速。
+        **columns: 其他逐事件的列。
+    """
+    with EventWriter(path, names, stations, v) as writer:
+        writer.append(times, **columns)
+
+
+def is_event_table(path):
+    """``path`` 是否为本格式的数据目录。"""
+    return (Path(path) / 'schema.json').is_file()
+
+
+def open_events(path):
+    """
+    以内存映射方式打开数据目录。
+
+    Args:
+        path (str | Path): ``EventWriter`` 或 ``write_events`` 写入的目录。
+
+    Returns:
+        EventTable: 各列均为只读视图，打开时不读取数据。
+    """
+    path = Path(path)
+    schema = json.loads((path / 'schema.json').read_text(encoding='utf-8'))
+    if schema.get('format') != 'sonicboom-events' or schema.get('version') != _format_version:
+        raise ValueError(f'{path} 不是版本 {_format_version} 的 sonicboom 事件数据')
+    rows = schema['rows']
+    columns = {}
+    for name, spec in schema['columns'].items():
+        shape = (rows, *spec['shape'])
+        if rows:
+            columns[name] = np.memmap(path / f'{name}.bin', dtype=np.dtype(spec['dtype']),
+                                      mode='r', shape=shape)
+        else:
+            # 长度为零的文件无法映射
+            columns[name] = np.empty(shape, dtype=np.dtype(spec['dtype']))
+    times = columns.pop('times')
+    return EventTable(names=schema['names'], stations=np.load(path / 'stations.npy', mmap_mode='r'),
+                      times=times, v=schema['v'], columns=columns,
+                      metadata=schema.get('metadata', {}))
@@ -0,0 +1,99 @@
+"""
+比赛题目给出的监测点和到达时间数据。
+
+与各问题脚本中的 ``coordinates``、``facilities`` 字典相同，集中放在这里供命令行
+和批量处理使用。监测点坐标为 (经度, 纬度, 高程)。
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+class Dataset(NamedTuple):
+    """一组监测点及其到达时间。"""
+    names: list
+    stations: np.ndarray  # (N, 3) 经度、纬度、高程
+    times: Optional[np.ndarray]  # (M, N) 到达时间，没有到达时间时为 None
+    v: float  # 该问题使用的声速
+
+
+# 问题一预处理及设备数量确定（1-1）
+problem1_coordinates = {
+    'A': (110.241, 27.204, 824),
+    'B': (110.780, 27.456, 727),
+    'C': (110.712, 27.785, 742),
+    'D': (110.251, 27.825, 850),
+    'E': (110.524, 27.617, 786),
+    'F': (110.467, 27.921, 678),
+    'G': (110.047, 27.121, 575),
+}
+
+# 问题一求解（1-2）
+problem1_facilities = {
+    'D': (110.251, 27.825, 850, [258.985]),
+    'E': (110.524, 27.617, 786, [118.443]),
+    'F': (110.467, 27.921, 678, [266.871]),
+    'G': (110.047, 27.121, 575, [163.024]),
+}
+
+# 问题二设备数量确定（2-1）
+problem2_facilities = {
+    'A': (110.241, 27.204, 824),
+    'B': (110.783, 27.456, 727),
+    'C': (110.762, 27.785, 742),
+    'D': (110.251, 28.025, 850),
+    'E': (110.524, 27.617, 786),
+    'F': (110.467, 28.081, 678),
+    'G': (110.047, 27.521, 575),
+}
+
+# 问题三、问题四的监测点和四个音爆源的到达时间（3-1、3-2、3-3、4-1）
+problem3_coordinates = {
+    'A': (110.241, 27.204, 824, [100.767, 164.229, 214.850, 270.065]),
+    'B': (110.783, 27.456, 727, [92.453, 112.220, 169.362, 196.583]),
+    'C': (110.762, 27.785, 742, [75.560, 110.696, 156.936, 188.020]),
+    'D': (110.251, 28.025, 850, [94.653, 141.409, 196.517, 258.985]),
+    'E': (110.524, 27.617, 786, [78.600, 86.216, 118.443, 126.669]),
+    'F': (110.467, 28.081, 678, [67.274, 166.270, 175.482, 266.871]),
+    'G': (110.047, 27.521, 575, [103.738, 163.024, 206.789, 210.306]),
+}
+
+# 问题四新增的监测站（4-1）
+problem4_coordinates = dict(problem3_coordinates, **{
+    'H': (110.3, 27.4, 700, [120.0, 180.0, 240.0, 300.0]),
+    'I': (110.6, 27.9, 780, [110.0, 170.0, 230.0, 290.0]),
+})
+
+datasets = {
+    'problem1': (problem1_coordinates, 340),
+    'problem1-solve': (problem1_facilities, 340),
+    'problem2': (problem2_facilities, 343),
+    'problem3': (problem3_coordinates, 343),
+    'problem4': (problem4_coordinates, 340),
+}
+
+
+def load_dataset(name):
+    """
+    把题目数据整理成数组。
+
+    Args:
+        name (str | Path): ``datasets`` 中的名称，或 ``columnar`` 格式的数据目录。
+
+    Returns:
+        Dataset: 监测点名称、坐标、到达时间和声速；从数据目录读取时坐标和到达时间为内存映射。
+    """
+    if name not in datasets:
+        from .columnar import is_event_table, open_events
+
+        if is_event_table(name):
+            table = open_events(name)
+            return Dataset(names=table.names, stations=table.stations, times=table.times, v=table.v)
+        raise ValueError(f'未知的数据集 {name}，可选 {sorted(datasets)}，或给出 columnar 格式的数据目录')
+    coordinates, v = datasets[name]
+    names = list(coordinates)
+    stations = np.array([coordinates[key][:3] for key in names], dtype=float)
+    times = None
+    if len(next(iter(coordinates.values()))) > 3:
+        times = np.array([coordinates[key][3] for key in names], dtype=float).T
+    return Dataset(names=names, stations=stations, times=times, v=v)
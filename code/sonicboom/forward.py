@@ -0,0 +1,100 @@
+"""
+音爆到达时间的正演模型。
+
+与 ``problem3/3-1问题三位置求解.py`` 中 ``leftovers()`` 的模型一致：
+预测到达时间 = 音爆源到监测点的直线距离 / 声速 + 音爆发生时间。
+所有函数都按事件批量计算，不含逐监测点的 Python 循环。
+``v`` 也可以是 ``atmosphere`` 中的声速剖面对象，此时走时由剖面的走时表插值。
+"""
+import numpy as np
+
+from .telemetry import hot_path
+
+# 声速常量，单位为米/秒
+v_sound = 340
+
+
+def _offsets(sources, stations):
+    """按坐标分量分别广播，避免在长度为 3 的末轴上做归约。"""
+    sources = np.asarray(sources, dtype=float)
+    stations = np.asarray(stations, dtype=float)
+    offsets = [sources[..., k, None] - stations[..., k] for k in range(3)]
+    clearance = np.sqrt(offsets[0] ** 2 + offsets[1] ** 2 + offsets[2] ** 2)
+    return offsets, clearance
+
+
+@hot_path('arrival_times')
+def arrival_times(sources, stations, v=v_sound):
+    """
+    计算音爆源到各监测点的预测到达时间。
+
+    Args:
+        sources (ndarray): 形状为 (..., 4) 的音爆源参数 (x, y, z, t)。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        v (float | SoundSpeedProfile): 声速或声速剖面。
+
+    Returns:
+        ndarray: 形状为 (..., N) 的预测到达时间。
+    """
+    if hasattr(v, 'arrival_times'):
+        return v.arrival_times(sources, stations)
+    _, clearance = _offsets(sources, stations)
+    clearance /= v
+    clearance += np.asarray(sources, dtype=float)[..., 3, None]
+    return clearance
+
+
+def leftovers_batch(sources, stations, times, v=v_sound):
+    """
+    批量计算预测时间与实际时间的残差。
+
+    Args:
+        sources (ndarray): 形状为 (E, 4) 的音爆源参数 (x, y, z, t)。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        times (ndarray): 形状为 (E, N) 的实际到达时间。
+        v (float | SoundSpeedProfile): 声速或声速剖面。
+
+    Returns:
+        ndarray: 形状为 (E, N) 的残差数组。
+    """
+    return arrival_times(sources, stations, v) - times
+
+
+@hot_path('jacobian_columns')
+def jacobian_columns(sources, stations, v=v_sound):
+    """
+    按参数排列的解析雅可比矩阵，即 ``jacobian_batch`` 的转置，便于直接做 JᵀJ。
+
+    Args:
+        sources (ndarray): 形状为 (E, 4) 的音爆源参数 (x, y, z, t)。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        v (float): 声速。
+
+    Returns:
+        ndarray: 形状为 (E, 4, N) 的雅可比矩阵转置。
+    """
+    if hasattr(v, 'jacobian_columns'):
+        return v.jacobian_columns(sources, stations)
+    offsets, clearance = _offsets(sources, stations)
+    # 音爆源与监测点重合时梯度取零，避免除零
+    scale = np.divide(1.0, v * clearance, out=np.zeros_like(clearance), where=clearance > 0)
+    columns = np.empty(clearance.shape[:-1] + (4,) + clearance.shape[-1:])
+    for k in range(3):
+        np.multiply(offsets[k], scale, out=columns[..., k, :])
+    columns[..., 3, :] = 1.0
+    return columns
+
+
+def jacobian_batch(sources, stations, v=v_sound):
+    """
+    残差对 (x, y, z, t) 的解析雅可比矩阵。
+
+    Args:
+        sources (ndarray): 形状为 (E, 4) 的音爆源参数 (x, y, z, t)。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        v (float): 声速。
+
+    Returns:
+        ndarray: 形状为 (E, N, 4) 的雅可比矩阵。
+    """
+    return np.swapaxes(jacobian_columns(sources, stations, v), -1, -2)
@@ -0,0 +1,163 @@
+"""
+监测点选择的遗传算法。
+
+``problem1/1-1_设备数量确定_遗传算法.py`` 用 Python 列表表示染色体，
+每次计算适应度都用 ``combinations`` 重新求两两距离，且没有约束选中的点数。
+这里把种群存为 (种群规模 × 监测点数) 的布尔矩阵：默认适应度（选中点两两距离之和）
+由预先计算的距离矩阵一次矩阵运算得到 mᵀDm / 2；交叉、变异后修复染色体，
+使每个个体恰好选中 ``target_point_count`` 个点。适应度以位掩码为键缓存，
+按最近最少使用淘汰，代价较高的自定义适应度只对新个体计算。适应度越大越好，
+GDOP 越小越好，用它作适应度时须取负：``lambda masks: -gdop_scores(masks, outer)``。
+"""
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+
+class FitnessCache:
+    """以染色体位掩码为键、按 LRU 淘汰的适应度缓存。"""
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate(self, population, fitness):
+        """
+        批量取得适应度，只对缓存中没有的个体调用 ``fitness``。
+
+        Args:
+            population (ndarray): 形状为 (P, N) 的布尔种群矩阵。
+            fitness (callable): 输入 (S, N) 布尔矩阵、返回 (S,) 适应度的函数。
+
+        Returns:
+            ndarray: 形状为 (P,) 的适应度。
+        """
+        keys = [row.tobytes() for row in np.packbits(population, axis=1)]
+        values = np.empty(len(keys))
+        missing = {}
+        for i, key in enumerate(keys):
+            if key in self.data:
+                self.data.move_to_end(key)
+                values[i] = self.data[key]
+                self.hits += 1
+            else:
+                missing.setdefault(key, []).append(i)
+        if missing:
+            first = [rows[0] for rows in missing.values()]
+            computed = fitness(population[first])
+            self.misses += len(first)
+            for (key, rows), value in zip(missing.items(), computed):
+                values[rows] = value
+                self.data[key] = value
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+        return values
+
+
+class GAResult(NamedTuple):
+    """遗传算法结果。"""
+    best: np.ndarray  # 最佳个体选中的监测点下标
+    best_fitness: float
+    history: np.ndarray  # (generations,) 每代最佳适应度
+    cache_hits: int
+    cache_misses: int
+
+
+def distance_fitness(stations):
+    """
+    构造“选中点两两距离之和”的批量适应度函数。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+
+    Returns:
+        callable: 输入 (S, N) 布尔矩阵、返回 (S,) 适应度的函数。
+    """
+    stations = np.asarray(stations, dtype=float)
+    distances = np.sqrt(np.sum((stations[:, None] - stations[None]) ** 2, axis=-1))
+
+    def fitness(masks):
+        masks = masks.astype(float)
+        return 0.5 * np.sum((masks @ distances) * masks, axis=1)
+
+    return fitness
+
+
+def repair(population, count, rng):
+    """
+    把每个个体修复为恰好选中 ``count`` 个点，尽量保留原有的选中点。
+
+    Args:
+        population (ndarray): 形状为 (P, N) 的布尔种群矩阵。
+        count (int): 目标选中点数。
+        rng (Generator): 随机数生成器。
+
+    Returns:
+        ndarray: 修复后的种群矩阵。
+    """
+    # 已选中的点随机键加 1，取键值最大的 count 个：多则随机去掉，少则随机补上
+    keys = rng.random(population.shape) + population
+    top = np.argpartition(-keys, count - 1, axis=1)[:, :count]
+    repaired = np.zeros_like(population)
+    np.put_along_axis(repaired, top, True, axis=1)
+    return repaired
+
+
+def genetic_algorithm(stations, target_point_count=4, population_size=100, generations=100,
+                      mutation_rate=0.05, elite=1, fitness=None, seed=None, cache_size=100000):
+    """
+    用遗传算法选择 ``target_point_count`` 个监测点。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        target_point_count (int): 选中的监测点数。
+        population_size (int): 种群规模。
+        generations (int): 迭代代数。
+        mutation_rate (float): 每个基因的变异概率。
+        elite (int): 直接保留到下一代的最佳个体数。
+        fitness (callable): 自定义批量适应度函数，越大越好（GDOP 等越小越好的指标须取负）；
+            默认使用 ``distance_fitness``。
+        seed (int): 随机种子。
+        cache_size (int): 适应度缓存容量。
+
+    Returns:
+        GAResult: 最佳个体及搜索过程信息。
+    """
+    rng = np.random.default_rng(seed)
+    num_stations = len(stations)
+    if fitness is None:
+        fitness = distance_fitness(stations)
+    cache = FitnessCache(cache_size)
+
+    population = repair(np.zeros((population_size, num_stations), dtype=bool), target_point_count, rng)
+    history = np.empty(generations)
+    for generation in range(generations):
+        scores = cache.evaluate(population, fitness)
+        order = np.argsort(-scores)
+        history[generation] = scores[order[0]]
+
+        # 轮盘赌选择，适应度平移为正数
+        weights = scores - scores.min() + 1e-12
+        num_children = population_size - elite
+        num_pairs = (num_children + 1) // 2
+        parents = rng.choice(population_size, size=(num_pairs, 2), p=weights / weights.sum())
+
+        # 单点交叉
+        point = rng.integers(1, num_stations, size=(num_pairs, 1))
+        left = np.arange(num_stations) < point
+        first, second = population[parents[:, 0]], population[parents[:, 1]]
+        children = np.concatenate([np.where(left, first, second), np.where(left, second, first)])
+        children = children[:num_children]
+
+        # 变异后修复点数约束
+        children ^= rng.random(children.shape) < mutation_rate
+        children = repair(children, target_point_count, rng)
+        population = np.concatenate([population[order[:elite]], children])
+
+    scores = cache.evaluate(population, fitness)
+    best = int(np.argmax(scores))
+    return GAResult(best=np.flatnonzero(population[best]), best_fitness=float(scores[best]),
+                    history=history, cache_hits=cache.hits, cache_misses=cache.misses)
@@ -0,0 +1,114 @@
+"""
+经纬度与局部米制坐标（东-北-天）之间的转换。
+
+各求解脚本把经纬度（度）和高程（米）直接放进同一个欧氏距离，量纲不一致，
+优化变量的尺度也相差数万倍。这里采用 ``problem1/1-1_问题一预处理.py`` 中
+``count_clearance`` 的换算：纬度每度 111.263 km，经度每度 97.304·cos(纬度) km，
+把监测点一次性投影到以监测网中心为原点的局部坐标系，求解全程在米制坐标中进行，
+只在输出时换回经纬度。同一组监测点的投影结果会被缓存。
+"""
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import v_sound
+from .solvers import solve_batch
+
+# 每度纬度、经度（乘以纬度余弦前）对应的米数
+lat_meters = 111.263 * 1000
+lon_meters = 97.304 * 1000
+
+
+class LocalFrame(NamedTuple):
+    """以 (lon0, lat0, alt0) 为原点的局部东-北-天坐标系。"""
+    lon0: float
+    lat0: float
+    alt0: float
+
+    @property
+    def east_scale(self):
+        return lon_meters * np.cos(np.radians(self.lat0))
+
+    def to_local(self, points):
+        """
+        经度、纬度、高程转换为局部坐标（米）。
+
+        Args:
+            points (ndarray): 形状为 (..., 3) 的 (经度, 纬度, 高程)。
+
+        Returns:
+            ndarray: 形状为 (..., 3) 的 (东, 北, 天) 坐标。
+        """
+        points = np.asarray(points, dtype=float)
+        local = np.empty(points.shape)
+        local[..., 0] = (points[..., 0] - self.lon0) * self.east_scale
+        local[..., 1] = (points[..., 1] - self.lat0) * lat_meters
+        local[..., 2] = points[..., 2] - self.alt0
+        return local
+
+    def to_geodetic(self, local):
+        """
+        局部坐标转换回经度、纬度、高程；第 3 列之后的分量（如时间）原样保留。
+
+        Args:
+            local (ndarray): 形状为 (..., K) 的坐标，K >= 3。
+
+        Returns:
+            ndarray: 形状相同的 (经度, 纬度, 高程, ...)。
+        """
+        local = np.asarray(local, dtype=float)
+        points = np.array(local)
+        points[..., 0] = local[..., 0] / self.east_scale + self.lon0
+        points[..., 1] = local[..., 1] / lat_meters + self.lat0
+        points[..., 2] = local[..., 2] + self.alt0
+        return points
+
+
+@lru_cache(maxsize=64)
+def _cached_projection(key, shape):
+    stations = np.frombuffer(key, dtype=float).reshape(shape)
+    lon0, lat0 = stations[:, :2].mean(axis=0)
+    frame = LocalFrame(float(lon0), float(lat0), 0.0)
+    local = frame.to_local(stations)
+    local.flags.writeable = False
+    return frame, local
+
+
+def project_stations(stations):
+    """
+    把监测点投影到局部坐标系，相同的监测点数组只投影一次。
+
+    原点取监测点经纬度的平均值、高程 0，因此局部坐标的“天”分量仍是海拔高程。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的 (经度, 纬度, 高程)。
+
+    Returns:
+        tuple: (LocalFrame, 只读的 (N, 3) 局部坐标数组)。
+    """
+    stations = np.ascontiguousarray(stations, dtype=float)
+    return _cached_projection(stations.tobytes(), stations.shape)
+
+
+def locate(times, stations, initial_guess=None, v=v_sound, **kwargs):
+    """
+    以经纬度输入输出的批量定位，求解在局部米制坐标中进行。
+
+    Args:
+        times (ndarray): 形状为 (E, N) 的到达时间。
+        stations (ndarray): 形状为 (N, 3) 的 (经度, 纬度, 高程)。
+        initial_guess (array_like | str): (经度, 纬度, 高程, 时间) 形式的初始猜测值，默认自动构造；
+            字符串（``'closed_form'``、``'grid'``）原样传给 ``solve_batch``。
+        v (float): 声速。
+        **kwargs: 传给 ``solve_batch`` 的其他参数。
+
+    Returns:
+        BatchSolution: 其中 ``x`` 已换回 (经度, 纬度, 高程, 时间)。
+    """
+    frame, local = project_stations(stations)
+    if initial_guess is not None and not isinstance(initial_guess, str):
+        initial_guess = np.array(initial_guess, dtype=float)
+        initial_guess[..., :3] = frame.to_local(initial_guess[..., :3])
+    solution = solve_batch(times, local, initial_guess, v=v, **kwargs)
+    return solution._replace(x=frame.to_geodetic(solution.x))
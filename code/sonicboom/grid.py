@@ -0,0 +1,201 @@
+"""
+预先计算的走时网格与由粗到细的初值搜索。
+
+各求解器都从手工调好的固定初值出发（3-1、4-1 中的 ``[110.5, 27.5, 750, 0]``，
+3-3 中的 ``x0``），换一组数据就要重新调，有时还会收敛到错误的极小值
+（1-2 因此加了高程和时间惩罚项）。这里为每个监测网预先计算一张走时表：
+区域网格点到各监测点的走时，以 ``.npy`` 形式存盘并以内存映射打开，
+跨进程、跨运行复用。
+
+对事件 e 和网格点 g，最优发生时间 t0 是 (T_e - τ_g) 的均值，残差平方和为
+
+    |T_e|² - 2 T_e·τ_g + |τ_g|² - (ΣT_e - Στ_g)² / n
+
+事件按缺失的监测点分组后，每组对每块网格点只需一次
+(事件 × 监测点) @ (监测点 × 网格点) 的矩阵乘法。
+在粗网格上找到最好的点后，再在其周围逐级加密搜索，结果作为局部求解器的初值。
+"""
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .cache import cache_root
+from .forward import v_sound
+
+# 走时表格式变化时递增，使旧缓存失效
+_grid_version = 1
+
+
+def default_cache_dir():
+    """走时表缓存目录，位于 ``cache_root()`` 之下。"""
+    return cache_root() / 'grids'
+
+
+def _grid_costs(times, table, table_sum, table_sq):
+    """
+    一组观测模式相同（缺失的监测点相同）的事件对一块网格点的残差平方和。
+
+    展开后只有 T·τ 与 ΣT·Στ 两项同时依赖事件和网格点，合成一次矩阵乘法；
+    其余为各网格点或各事件自己的常数。
+    """
+    count = times.shape[1]
+    sum_t = times.sum(axis=1)
+    left = np.column_stack([times, sum_t / count])
+    right = np.column_stack([-2 * table, 2 * table_sum])
+    cost = left @ right.T
+    cost += table_sq - table_sum ** 2 / count
+    cost += (np.sum(times ** 2, axis=1) - sum_t ** 2 / count)[:, None]
+    return cost
+
+
+class TravelTimeGrid:
+    """
+    一个监测网在矩形区域上的走时表。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米）。
+        low, high (array_like): 区域的下、上角点 (x, y, z)。
+        shape (tuple): 三个方向的网格点数。
+        v (float): 声速。
+        cache_dir (str | Path): 走时表缓存目录，None 表示默认目录；False 表示不存盘。
+    """
+
+    def __init__(self, stations, low, high, shape=(25, 25, 13), v=v_sound, cache_dir=None):
+        self.stations = np.ascontiguousarray(stations, dtype=float)
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.shape = tuple(int(n) for n in shape)
+        self.v = v
+        self.axes = [np.linspace(lo, hi, n) for lo, hi, n in zip(self.low, self.high, self.shape)]
+        self.step = (self.high - self.low) / np.maximum(np.array(self.shape) - 1, 1)
+        self.points = np.stack(np.meshgrid(*self.axes, indexing='ij'), axis=-1).reshape(-1, 3)
+        if cache_dir is False:
+            self.table = self._compute()
+        else:
+            self.table = self._load(Path(cache_dir) if cache_dir else default_cache_dir())
+
+    def _compute(self):
+        diff = self.points[:, None, :] - self.stations[None]
+        return (np.sqrt(np.sum(diff ** 2, axis=-1)) / self.v).astype(np.float32)
+
+    def key(self):
+        """由监测点、区域、网格形状和声速确定的缓存键。"""
+        digest = hashlib.sha1()
+        for part in (self.stations, self.low, self.high, np.array(self.shape, dtype=float),
+                     np.array([self.v, _grid_version], dtype=float)):
+            digest.update(np.ascontiguousarray(part, dtype=float).tobytes())
+        return digest.hexdigest()
+
+    def _load(self, cache_dir):
+        path = cache_dir / f'{self.key()}.npy'
+        if not path.exists():
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再改名，避免并发进程读到写了一半的表
+            temporary = path.with_suffix(f'.{os.getpid()}.tmp')
+            table = np.lib.format.open_memmap(temporary, mode='w+', dtype=np.float32,
+                                              shape=(len(self.points), len(self.stations)))
+            for start in range(0, len(self.points), 65536):
+                diff = self.points[start:start + 65536, None, :] - self.stations[None]
+                table[start:start + 65536] = np.sqrt(np.sum(diff ** 2, axis=-1)) / self.v
+            table.flush()
+            del table
+            os.replace(temporary, path)
+        return np.load(path, mmap_mode='r')
+
+    def search(self, times, levels=3, refine=5, event_chunk=1024, grid_chunk=16384):
+        """
+        由粗到细搜索每个事件的初值。
+
+        Args:
+            times (ndarray): 形状为 (E, N) 的到达时间，缺失值为 NaN。
+            levels (int): 粗网格之后的加密层数，每层搜索范围减半。
+            refine (int): 加密搜索时每个方向的点数（奇数）。
+            event_chunk, grid_chunk (int): 分块大小，(事件 × 网格点) 临时矩阵
+                不超过 ``event_chunk × grid_chunk`` 个元素。
+
+        Returns:
+            tuple: (形状为 (E, 4) 的初值, 形状为 (E,) 的残差平方和)。
+        """
+        times = np.atleast_2d(np.asarray(times, dtype=float))
+        if len(times) == 0:
+            return np.empty((0, 4)), np.empty(0)
+        parts = [self._search_chunk(times[start:start + event_chunk], levels, refine, grid_chunk)
+                 for start in range(0, len(times), event_chunk)]
+        guess, cost = zip(*parts)
+        return np.concatenate(guess), np.concatenate(cost)
+
+    def _search_chunk(self, times, levels, refine, grid_chunk):
+        mask = np.isfinite(times)
+        num_events = len(times)
+        rows = np.arange(num_events)
+
+        best_cost = np.full(num_events, np.inf)
+        best_index = np.zeros(num_events, dtype=int)
+        patterns, group = np.unique(mask, axis=0, return_inverse=True)
+        for start in range(0, len(self.points), grid_chunk):
+            block = np.asarray(self.table[start:start + grid_chunk], dtype=float)
+            for k, pattern in enumerate(patterns):
+                members = np.flatnonzero(group.ravel() == k)
+                observed = block[:, pattern]
+                cost = _grid_costs(times[np.ix_(members, pattern)], observed,
+                                   observed.sum(axis=1), np.sum(observed ** 2, axis=1))
+                index = np.argmin(cost, axis=1)
+                cost = cost[np.arange(len(members)), index]
+                better = cost < best_cost[members]
+                best_cost[members[better]] = cost[better]
+                best_index[members[better]] = index[better] + start
+        position = self.points[best_index]
+
+        # 在当前最优点周围的小立方体内逐级加密，第一层覆盖相邻的粗网格点，走时直接计算
+        offsets = np.linspace(-1, 1, refine)
+        cube = np.stack(np.meshgrid(offsets, offsets, offsets, indexing='ij'), axis=-1).reshape(-1, 3)
+        step = self.step * 2
+        weight = mask.astype(float)[:, None]
+        filled = np.where(mask, times, 0.0)[:, None]
+        count = weight.sum(axis=2)
+        for _ in range(levels):
+            step = step / 2
+            candidates = np.clip(position[:, None] + cube * step, self.low, self.high)  # (E, C, 3)
+            distance = sum((candidates[..., j, None] - self.stations[:, j]) ** 2 for j in range(3))
+            residual = (filled - np.sqrt(distance) / self.v) * weight  # (E, C, N)
+            total = residual.sum(axis=2)
+            # 去掉最优发生时刻后的残差平方和
+            cost = np.einsum('ecn,ecn->ec', residual, residual) - total ** 2 / count
+            index = np.argmin(cost, axis=1)
+            position = candidates[rows, index]
+            best_cost = cost[rows, index]
+
+        tau = np.sqrt(np.sum((position[:, None] - self.stations) ** 2, axis=-1)) / self.v
+        t0 = np.sum(np.where(mask, times - tau, 0.0), axis=1) / mask.sum(axis=1)
+        return np.column_stack([position, t0]), best_cost
+
+
+def grid_for_network(stations, altitude=None, margin=0.5, shape=(25, 25, 13), v=v_sound,
+                     cache_dir=None):
+    """
+    按监测网的水平范围（向外扩展 ``margin`` 倍）和给定高程区间构造走时网格。
+
+    监测点大致共面时，监测面上下存在镜像解；网格默认从最高的监测点起算，
+    使初值落在监测网上方。最优点落在最低一层时仍可能滑向镜像解，
+    ``solve_batch`` 对这些事件改用默认初值。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米）。
+        altitude (tuple): 网格的高程范围，默认从最高监测点到 20000 m。
+        margin (float): 水平范围向外扩展的比例。
+        shape (tuple): 三个方向的网格点数。
+        v (float): 声速。
+        cache_dir (str | Path): 见 ``TravelTimeGrid``。
+
+    Returns:
+        TravelTimeGrid: 走时网格。
+    """
+    stations = np.asarray(stations, dtype=float)
+    if altitude is None:
+        altitude = (stations[:, 2].max(), 20000)
+    low, high = stations[:, :2].min(axis=0), stations[:, :2].max(axis=0)
+    pad = margin * (high - low)
+    return TravelTimeGrid(stations, np.append(low - pad, altitude[0]), np.append(high + pad, altitude[1]),
+                          shape, v, cache_dir)
@@ -0,0 +1,186 @@
+"""
+多音爆源联合求解（稀疏雅可比矩阵）。
+
+``problem3/3-3问题三时间求解.py`` 用 SLSQP 拟合一个公共位置和四个音爆时间，
+目标函数是标量残差平方和，梯度靠有限差分，约束用 lambda 不等式表示。
+这里把 M 个音爆源 × N 个监测点的问题写成残差向量：
+
+    r[m, n] = |p[g(m)] - s[n]| / v + t[m] - T[m, n]
+
+其中 g(m) 是音爆源 m 所属的位置组（3-3 中全部音爆源共用一个位置，
+也可以每个音爆源各自一个位置）。每行残差只依赖一个位置组的 3 个坐标和
+一个时间，雅可比矩阵每行恰有 4 个非零元。求解交给 ``least_squares`` 的
+trf 方法和 lsmr 信赖域子问题，每次迭代的代价与非零元个数成正比，
+约束改为变量上下界。
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import v_sound
+from .telemetry import instrument
+
+
+class JointSolution(NamedTuple):
+    """联合求解结果。"""
+    positions: np.ndarray  # (G, 3) 各位置组的坐标
+    times: np.ndarray  # (M,) 各音爆源的发生时间
+    cost: float
+    nfev: int
+    success: bool
+    status: int  # least_squares 的终止状态
+
+
+class JointProblem:
+    """
+    M 个音爆源 × N 个监测点的联合残差模型。
+
+    参数向量的排列为 [p_0, ..., p_{G-1}, t_0, ..., t_{M-1}]，
+    缺失的到达时间（NaN）不产生残差行。
+    """
+
+    def __init__(self, times, stations, groups=None, v=v_sound):
+        self.times = np.atleast_2d(np.asarray(times, dtype=float))
+        self.stations = np.asarray(stations, dtype=float)
+        self.v = v
+        num_sources = self.times.shape[0]
+        if groups is None:
+            groups = np.zeros(num_sources, dtype=int)
+        self.groups = np.asarray(groups, dtype=int)
+        self.num_groups = int(self.groups.max()) + 1
+        self.num_sources = num_sources
+        self.num_params = 3 * self.num_groups + num_sources
+
+        # 每个残差行对应的 (音爆源, 监测点)
+        self.source, self.station = np.nonzero(np.isfinite(self.times))
+        self.observed = self.times[self.source, self.station]
+        num_rows = self.source.size
+        position_cols = 3 * self.groups[self.source, None] + np.arange(3)
+        time_cols = 3 * self.num_groups + self.source
+        self.rows = np.repeat(np.arange(num_rows), 4)
+        self.cols = np.column_stack([position_cols, time_cols]).ravel()
+
+    def split(self, params):
+        """把参数向量拆成 ((G, 3) 位置, (M,) 时间)。"""
+        positions = params[:3 * self.num_groups].reshape(self.num_groups, 3)
+        return positions, params[3 * self.num_groups:]
+
+    def pack(self, positions, times):
+        """把位置和时间合成参数向量。"""
+        return np.concatenate([np.ravel(positions), np.ravel(times)])
+
+    def _diff(self, params):
+        positions, times = self.split(params)
+        diff = positions[self.groups[self.source]] - self.stations[self.station]
+        return diff, np.sqrt(np.sum(diff ** 2, axis=1)), times
+
+    def residuals(self, params):
+        """
+        残差向量。
+
+        Args:
+            params (ndarray): 参数向量。
+
+        Returns:
+            ndarray: 长度为观测数的残差。
+        """
+        _, clearance, times = self._diff(params)
+        return clearance / self.v + times[self.source] - self.observed
+
+    def jacobian(self, params):
+        """
+        稀疏雅可比矩阵，每行 3 个位置导数和 1 个时间导数。
+
+        Args:
+            params (ndarray): 参数向量。
+
+        Returns:
+            csr_matrix: 形状为 (观测数, 参数个数) 的雅可比矩阵。
+        """
+        from scipy.sparse import csr_matrix
+
+        diff, clearance, _ = self._diff(params)
+        clearance = np.where(clearance > 0, clearance, np.inf)
+        values = np.column_stack([diff / (self.v * clearance[:, None]), np.ones(clearance.size)])
+        return csr_matrix((values.ravel(), (self.rows, self.cols)),
+                          shape=(self.source.size, self.num_params))
+
+    def sparsity(self):
+        """雅可比矩阵的非零结构。"""
+        from scipy.sparse import csr_matrix
+
+        return csr_matrix((np.ones(self.rows.size), (self.rows, self.cols)),
+                          shape=(self.source.size, self.num_params))
+
+    def bounds(self, position_bounds=None, time_bounds=None):
+        """
+        构造 ``least_squares`` 的上下界。
+
+        Args:
+            position_bounds (array_like): 形状为 (3, 2) 的 (下界, 上界)，逐坐标分量，
+                所有位置组共用；例如 3-3 中的高程约束为 [[-inf, inf], [-inf, inf], [10000, inf]]。
+            time_bounds (array_like): 形状为 (M, 2) 或 (2,) 的时间上下界。
+
+        Returns:
+            tuple: (下界向量, 上界向量)。
+        """
+        lower = np.full(self.num_params, -np.inf)
+        upper = np.full(self.num_params, np.inf)
+        if position_bounds is not None:
+            position_bounds = np.asarray(position_bounds, dtype=float)
+            lower[:3 * self.num_groups] = np.tile(position_bounds[:, 0], self.num_groups)
+            upper[:3 * self.num_groups] = np.tile(position_bounds[:, 1], self.num_groups)
+        if time_bounds is not None:
+            time_bounds = np.broadcast_to(np.asarray(time_bounds, dtype=float), (self.num_sources, 2))
+            lower[3 * self.num_groups:] = time_bounds[:, 0]
+            upper[3 * self.num_groups:] = time_bounds[:, 1]
+        return lower, upper
+
+
+@instrument('solve_joint')
+def solve_joint(times, stations, groups=None, initial_positions=None, initial_times=None,
+                position_bounds=None, time_bounds=None, v=v_sound, **kwargs):
+    """
+    联合求解多个音爆源的位置和发生时间。
+
+    Args:
+        times (ndarray): 形状为 (M, N) 的到达时间，缺失值为 NaN。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        groups (array_like): 长度为 M 的位置组编号，默认全部音爆源共用一个位置（3-3 的模型）；
+            传入 ``np.arange(M)`` 则每个音爆源各自一个位置。
+        initial_positions (array_like): 形状为 (G, 3) 或 (3,) 的初始位置，默认取监测点中心上空。
+        initial_times (array_like): 形状为 (M,) 的初始时间，默认取各音爆源最早到达时间。
+        position_bounds (array_like): 位置上下界，见 ``JointProblem.bounds``。
+        time_bounds (array_like): 时间上下界，见 ``JointProblem.bounds``。
+        v (float): 声速。
+        **kwargs: 传给 ``least_squares`` 的其他参数。
+
+    Returns:
+        JointSolution: 求解结果。
+    """
+    from scipy.optimize import least_squares
+
+    problem = JointProblem(times, stations, groups, v)
+    if initial_positions is None:
+        initial_positions = np.mean(problem.stations, axis=0)
+        initial_positions[2] += np.max(np.ptp(problem.stations[:, :2], axis=0))
+    if initial_times is None:
+        initial_times = np.nanmin(problem.times, axis=1)
+    positions = np.broadcast_to(np.asarray(initial_positions, dtype=float), (problem.num_groups, 3))
+    x0 = problem.pack(positions, initial_times)
+
+    lower, upper = problem.bounds(position_bounds, time_bounds)
+    x0 = np.clip(x0, lower, upper)
+    # 初始值不能恰好落在边界上
+    margin = 1e-6 * np.maximum(1, np.abs(x0))
+    x0 = np.where(x0 == lower, x0 + margin, x0)
+    x0 = np.where(x0 == upper, x0 - margin, x0)
+
+    options = {'method': 'trf', 'tr_solver': 'lsmr', 'x_scale': 'jac'}
+    options.update(kwargs)
+    result = least_squares(problem.residuals, x0, jac=problem.jacobian, bounds=(lower, upper),
+                           **options)
+    positions, source_times = problem.split(result.x)
+    return JointSolution(positions=positions, times=source_times, cost=float(result.cost),
+                         nfev=int(result.nfev), success=bool(result.success),
+                         status=int(result.status))
@@ -0,0 +1,215 @@
+"""
+问题四的蒙特卡洛误差分析引擎。
+
+``problem4/4-1问题四求解.py`` 中的 ``optimized_places_times()`` 逐次调用
+``least_squares``，通过全局 ``np.random`` 给到达时间加噪声，并把全部结果
+存入列表后取均值。这里改为：
+
+- 每个分块从 ``SeedSequence`` 派生独立的 ``Generator``，一次性生成整块噪声，
+  结果与进程数无关、可复现；
+- 每块试验以无噪声解作为初始值，用 ``solve_batch`` 一次求解；
+- 结果用可合并的流式均值/方差/直方图分位数累加器归约，内存占用与试验次数无关；
+  直方图区间由第一块试验的解确定，坐标是米还是经纬度都适用；
+- 分块可分配到进程池并行计算。
+
+4-1 中的 ``time_error_param`` 与发生时间 ``t`` 不可区分，这里只估计 (x, y, z, t)。
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import v_sound
+from .solvers import solve_batch
+
+
+class StreamingStats:
+    """
+    可合并的流式统计累加器，记录均值、方差和直方图分位数。
+
+    直方图的区间在构造时固定，使各进程的累加器可以直接相加合并；
+    超出区间的值计入两端的箱子，并单独记录最小值和最大值。
+    """
+
+    def __init__(self, low, high, bins=512):
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.bins = bins
+        self.count = 0
+        self.mean = np.zeros(self.low.shape)
+        self.m2 = np.zeros(self.low.shape)
+        self.min = np.full(self.low.shape, np.inf)
+        self.max = np.full(self.low.shape, -np.inf)
+        self.histogram = np.zeros(self.low.shape + (bins,), dtype=np.int64)
+
+    def update(self, samples):
+        """
+        累加一批样本。
+
+        Args:
+            samples (ndarray): 形状为 (S, ...) 的样本，尾部形状与 ``low`` 相同。
+        """
+        samples = np.asarray(samples, dtype=float)
+        n = samples.shape[0]
+        if n == 0:
+            return
+        batch_mean = samples.mean(axis=0)
+        batch_m2 = np.sum((samples - batch_mean) ** 2, axis=0)
+        self._combine(n, batch_mean, batch_m2)
+        self.min = np.minimum(self.min, samples.min(axis=0))
+        self.max = np.maximum(self.max, samples.max(axis=0))
+
+        # 所有参数的箱子编号展平后用一次 bincount 计数
+        width = (self.high - self.low) / self.bins
+        index = np.floor((samples - self.low) / width).astype(np.int64)
+        index = np.clip(index, 0, self.bins - 1)
+        offset = np.arange(self.low.size).reshape(self.low.shape) * self.bins
+        counts = np.bincount((index + offset).ravel(), minlength=self.low.size * self.bins)
+        self.histogram += counts.reshape(self.histogram.shape)
+
+    def merge(self, other):
+        """合并另一个区间相同的累加器。"""
+        if other.count == 0:
+            return self
+        self._combine(other.count, other.mean, other.m2)
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.histogram += other.histogram
+        return self
+
+    def _combine(self, n, mean, m2):
+        # Chan 等人的并行方差合并公式
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.count * n / total)
+        self.count = total
+
+    @property
+    def var(self):
+        return self.m2 / max(self.count - 1, 1)
+
+    def quantile(self, q):
+        """
+        由直方图估计分位数，箱内按线性插值。
+
+        Args:
+            q (array_like): 分位点，取值在 [0, 1]。
+
+        Returns:
+            ndarray: 形状为 (len(q), ...) 的分位数估计。
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        cumulative = np.cumsum(self.histogram, axis=-1)
+        width = (self.high - self.low) / self.bins
+        result = np.empty(q.shape + self.low.shape)
+        for i, qi in enumerate(q):
+            target = qi * self.count
+            k = np.argmax(cumulative >= target, axis=-1)
+            before = np.take_along_axis(cumulative, k[..., None] - 1, axis=-1)[..., 0]
+            before = np.where(k > 0, before, 0)
+            inside = np.take_along_axis(self.histogram, k[..., None], axis=-1)[..., 0]
+            fraction = (target - before) / np.maximum(inside, 1)
+            result[i] = np.clip(self.low + (k + fraction) * width, self.min, self.max)
+        return result
+
+
+class MonteCarloSummary(NamedTuple):
+    """蒙特卡洛试验的汇总结果，参数顺序为 (x, y, z, t)。"""
+    x0: np.ndarray  # (E, 4) 无噪声解
+    count: int  # 试验次数
+    mean: np.ndarray  # (E, 4)
+    std: np.ndarray  # (E, 4)
+    quantiles: np.ndarray  # (Q, E, 4)
+    failures: np.ndarray  # (E,) 未收敛的试验次数
+
+
+def _solve_chunk(seed, num_trials, times, stations, x0, error_std, v, nonnegative):
+    """在一个分块内生成噪声并批量求解，返回 (试验, 事件, 4) 的解和各事件未收敛的次数。"""
+    rng = np.random.default_rng(seed)
+    num_events, num_stations = times.shape
+    noisy = times + rng.normal(0, error_std, size=(num_trials, num_events, num_stations))
+    guess = np.broadcast_to(x0, (num_trials, num_events, 4)).reshape(-1, 4)
+    result = solve_batch(noisy.reshape(-1, num_stations), stations, guess, v=v)
+    x = result.x.reshape(num_trials, num_events, 4)
+    if nonnegative:
+        x = np.maximum(x, 0)  # 与 4-1 中 np.maximum(result.x, 0) 一致
+    failures = np.sum(~result.success.reshape(num_trials, num_events), axis=0)
+    return x, failures
+
+
+def _run_chunk(seed, num_trials, times, stations, x0, error_std, v, nonnegative, low, high, bins):
+    """在一个分块内求解并返回累加器。"""
+    x, failures = _solve_chunk(seed, num_trials, times, stations, x0, error_std, v, nonnegative)
+    stats = StreamingStats(low, high, bins)
+    stats.update(x)
+    return stats, failures
+
+
+def _histogram_bounds(x0, pilot):
+    """
+    由第一块试验的解确定直方图区间，与坐标单位无关（米或经纬度均可）。
+
+    以分位数估计中心范围和离散程度，个别发散的试验不会把区间撑得过宽；
+    范围向两侧各放宽 4 倍离散程度，后续分块的尾部仍落在区间内。
+    """
+    lower, upper, q1, q3 = np.quantile(pilot, [0.001, 0.999, 0.25, 0.75], axis=0)
+    # 四分位距换算为正态分布的标准差；试验太少或解完全相同时按 x0 的量级取一个很小的值
+    spread = np.maximum((q3 - q1) / 1.349, 1e-9 * np.abs(x0) + 1e-12)
+    return np.minimum(lower, x0) - 4 * spread, np.maximum(upper, x0) + 4 * spread
+
+
+def monte_carlo(times, stations, error_std=0.5, num_trials=100, seed=None, chunk_size=4096,
+                workers=None, quantiles=(0.05, 0.5, 0.95), initial_guess=None, v=v_sound,
+                nonnegative=False, bins=512):
+    """
+    对一个或多个音爆源做到达时间噪声的蒙特卡洛分析。
+
+    Args:
+        times (ndarray): 形状为 (N,) 或 (E, N) 的无噪声到达时间。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        error_std (float): 到达时间噪声的标准差（秒）。
+        num_trials (int): 每个音爆源的试验次数。
+        seed (int | SeedSequence): 随机种子，相同种子的结果与进程数无关。
+        chunk_size (int): 每个分块的试验次数，决定单块内存占用。
+        workers (int): 进程池大小；为 1 时在当前进程内顺序计算，None 表示 CPU 核数。
+        quantiles (tuple): 需要估计的分位点。
+        initial_guess (array_like): 无噪声求解的初始值。
+        v (float): 声速。
+        nonnegative (bool): 是否把解截断为非负值（4-1 的做法）。
+        bins (int): 分位数直方图的箱子数。
+
+    Returns:
+        MonteCarloSummary: 各音爆源的统计结果。
+    """
+    times = np.atleast_2d(np.asarray(times, dtype=float))
+    stations = np.asarray(stations, dtype=float)
+    x0 = solve_batch(times, stations, initial_guess, v=v).x
+
+    sizes = [chunk_size] * (num_trials // chunk_size)
+    if num_trials % chunk_size:
+        sizes.append(num_trials % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    # 第一块在当前进程中求解，直方图区间由它的结果确定，再分发其余分块
+    pilot, failures = _solve_chunk(seeds[0], sizes[0], times, stations, x0, error_std, v,
+                                   nonnegative)
+    low, high = _histogram_bounds(x0, pilot)
+    stats = StreamingStats(low, high, bins)
+    stats.update(pilot)
+    args = [(s, n, times, stations, x0, error_std, v, nonnegative, low, high, bins)
+            for s, n in zip(seeds[1:], sizes[1:])]
+
+    if workers == 1 or len(args) <= 1:
+        chunks = (_run_chunk(*a) for a in args)
+        for chunk_stats, chunk_failures in chunks:
+            stats.merge(chunk_stats)
+            failures += chunk_failures
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_stats, chunk_failures in pool.map(_run_chunk, *zip(*args)):
+                stats.merge(chunk_stats)
+                failures += chunk_failures
+
+    return MonteCarloSummary(x0=x0, count=stats.count, mean=stats.mean, std=np.sqrt(stats.var),
+                             quantiles=stats.quantile(quantiles), failures=failures)
@@ -0,0 +1,88 @@
+"""
+监测网扩建：从候选站址中逐个挑选新增监测点。
+
+``problem4/4-1问题四求解.py`` 手工加入了 H (110.3, 27.4) 和 I (110.6, 27.9)。
+这里在目标区域的一组点上维护已有监测网的 P = (HᵀH)⁻¹（与 ``subset`` 中的
+几何矩阵相同），加入候选点 c 只是一次秩一更新：
+
+    trace((F + hhᵀ)⁻¹) = trace(P) - |P h|² / (1 + hᵀ P h)
+
+所有候选点的新 GDOP 由一次批量的矩阵-向量乘法得到，不需要重新求逆；
+选中一个点后再用 Sherman–Morrison 公式更新各目标点的 P。
+"""
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from .subset import station_geometry, station_outer_products
+
+
+class Placement(NamedTuple):
+    """贪心扩建的结果。"""
+    chosen: np.ndarray  # (K,) 依次选中的候选点下标
+    scores: np.ndarray  # (K,) 每次加入后目标区域上的 GDOP 统计值
+    baseline: float  # 扩建前的 GDOP 统计值
+    elapsed: float  # 耗时（秒）
+
+
+def _reduce(gdop, reduce):
+    return gdop.max(axis=0) if reduce == 'max' else gdop.mean(axis=0)
+
+
+def place_stations(stations, candidates, targets, k=2, reduce='mean', chunk_size=1024, ridge=1e-9):
+    """
+    贪心地从候选站址中选出 k 个新增监测点，使目标区域上的 GDOP 最小。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的已有监测点坐标（米），经纬度数据先用
+            ``project_stations`` 投影。
+        candidates (ndarray): 形状为 (C, 3) 的候选站址。
+        targets (ndarray): 形状为 (Q, 3) 的目标区域点。
+        k (int): 新增监测点个数。
+        reduce (str): 目标点上的汇总方式，'mean' 或 'max'。
+        chunk_size (int): 每批评价的候选点数，临时数组为 Q × chunk_size × 4。
+        ridge (float): 加在信息矩阵上的相对阻尼，已有监测点不足 4 个时使其可逆。
+
+    Returns:
+        Placement: 选中的候选点及每一步的得分。
+    """
+    start = time.perf_counter()
+    stations = np.asarray(stations, dtype=float)
+    candidates = np.asarray(candidates, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+
+    info = station_outer_products(stations, targets).sum(axis=0)
+    info += ridge * max(len(stations), 1) * np.eye(4)
+    inverse = np.linalg.inv(info)  # (Q, 4, 4)
+    trace = np.trace(inverse, axis1=1, axis2=2)
+    baseline = float(_reduce(np.sqrt(trace), reduce))
+
+    available = np.ones(len(candidates), dtype=bool)
+    chosen, scores = [], []
+    for _ in range(min(k, len(candidates))):
+        best_score, best_index = np.inf, -1
+        for begin in range(0, len(candidates), chunk_size):
+            block = station_geometry(candidates[begin:begin + chunk_size], targets)  # (Q, M, 4)
+            projected = block @ inverse  # P 对称，(Q, M, 4) 的每行即 P h
+            gain = np.sum(projected ** 2, axis=2) / (1 + np.sum(projected * block, axis=2))
+            score = _reduce(np.sqrt(np.maximum(trace[:, None] - gain, 0.0)), reduce)
+            score[~available[begin:begin + chunk_size]] = np.inf
+            index = int(np.argmin(score))
+            if score[index] < best_score:
+                best_score, best_index = score[index], begin + index
+        if best_index < 0:
+            break
+
+        # Sherman–Morrison：P ← P - P h hᵀ P / (1 + hᵀ P h)
+        h = station_geometry(candidates[best_index:best_index + 1], targets)[:, 0]
+        projected = (inverse @ h[..., None])[..., 0]
+        inverse -= (projected[:, :, None] * projected[:, None, :]
+                    / (1 + np.sum(projected * h, axis=1))[:, None, None])
+        trace = np.trace(inverse, axis1=1, axis2=2)
+        available[best_index] = False
+        chosen.append(best_index)
+        scores.append(float(best_score))
+
+    return Placement(chosen=np.array(chosen, dtype=int), scores=np.array(scores),
+                     baseline=baseline, elapsed=time.perf_counter() - start)
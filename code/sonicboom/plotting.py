@@ -0,0 +1,222 @@
+"""
+监测点和音爆源的三维绘图。
+
+matplotlib 只在调用绘图函数时导入；给定输出文件时使用无界面的 Agg 后端
+直接保存，不调用 ``plt.show()``，可以在没有显示器的批量计算节点上运行。
+同类元素都用一次 ``scatter`` 或一个线段集合绘制，不逐点循环。
+
+``plot_results`` 从 ``results.save_results`` 写入的文件绘图，与求解过程分离。
+点数很多时先抽稀或按三维网格计数后再画，10^6 个点也能在几秒内输出；
+不确定度椭球按主轴批量生成线框，全部放进一个线段集合。
+"""
+import numpy as np
+
+
+def _pyplot(output):
+    import matplotlib
+    if output is not None:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _finish(plt, fig, output):
+    if output is None:
+        plt.show()
+    else:
+        fig.savefig(output, bbox_inches='tight')
+        plt.close(fig)
+
+
+def plot_network(stations, names=None, highlight=None, links=False, output=None,
+                 title='Monitoring coordinates and Approximate clearances'):
+    """
+    绘制监测点，可选地标出选中的监测点并连接全部监测点对。
+
+    对应 ``1-1_问题一预处理.py`` 与 ``1-1_设备数量确定.py`` 中的图。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的 (经度, 纬度, 高程)。
+        names (list): 监测点名称，用于标注。
+        highlight (array_like): 需要以红色大点标出的监测点下标。
+        links (bool): 是否用虚线连接所有监测点对。
+        output (str): 输出文件路径（PNG、PDF 等）；为 None 时弹出窗口显示。
+        title (str): 图标题。
+    """
+    plt = _pyplot(output)
+    stations = np.asarray(stations, dtype=float)
+    fig = plt.figure(figsize=(10, 8))
+    ax = fig.add_subplot(111, projection='3d')
+    ax.scatter(stations[:, 0], stations[:, 1], stations[:, 2], color='gray', s=40)
+    if highlight is not None:
+        chosen = stations[np.asarray(highlight)]
+        ax.scatter(chosen[:, 0], chosen[:, 1], chosen[:, 2], color='red', s=100)
+    if names is not None:
+        for name, (x, y, z) in zip(names, stations):
+            ax.text(x, y, z, name)
+    if links:
+        from mpl_toolkits.mplot3d.art3d import Line3DCollection
+        first, second = np.triu_indices(len(stations), k=1)
+        segments = np.stack([stations[first], stations[second]], axis=1)
+        ax.add_collection3d(Line3DCollection(segments, colors='gray', linestyles=':'))
+
+    ax.set_xlabel('Longitude')
+    ax.set_ylabel('Latitude')
+    ax.set_zlabel('Elevation (m)')
+    ax.set_title(title)
+    _finish(plt, fig, output)
+
+
+def plot_sources(sources, stations=None, output=None):
+    """
+    绘制求解得到的音爆源位置，对应 ``3-2问题三求解可视化.py`` 中的图。
+
+    Args:
+        sources (ndarray): 形状为 (M, 4) 的 (经度, 纬度, 高程, 时间)。
+        stations (ndarray): 可选，形状为 (N, 3) 的监测点，一并绘出。
+        output (str): 输出文件路径；为 None 时弹出窗口显示。
+    """
+    plt = _pyplot(output)
+    sources = np.asarray(sources, dtype=float)
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+    ax.scatter(sources[:, 0], sources[:, 1], sources[:, 2], c=np.arange(len(sources)),
+               cmap='tab10', s=100, label='Sonic boom sources')
+    if stations is not None:
+        stations = np.asarray(stations, dtype=float)
+        ax.scatter(stations[:, 0], stations[:, 1], stations[:, 2], color='gray', marker='^',
+                   label='Monitoring stations')
+    ax.set_xlabel('Longitude')
+    ax.set_ylabel('Latitude')
+    ax.set_zlabel('Elevation (m)')
+    ax.legend()
+    _finish(plt, fig, output)
+
+
+def decimate(points, max_points, seed=0):
+    """
+    随机抽取不超过 ``max_points`` 行，返回按原顺序排列的下标。
+
+    Args:
+        points (ndarray): 形状为 (M, ...) 的数组。
+        max_points (int): 最多保留的行数。
+        seed (int): 随机数种子，同样的输入总是得到同样的抽样。
+
+    Returns:
+        ndarray: 保留的行下标。
+    """
+    count = len(points)
+    if count <= max_points:
+        return np.arange(count)
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(count, size=max_points, replace=False))
+
+
+def density_bins(points, bins=32):
+    """
+    把点云按三维规则网格计数，只返回非空的格子。
+
+    Args:
+        points (ndarray): 形状为 (M, 3) 的点。
+        bins (int): 每个方向的格子数。
+
+    Returns:
+        tuple: (非空格子中心 (B, 3), 每格的点数 (B,))。
+    """
+    points = np.asarray(points, dtype=float)[:, :3]
+    counts, edges = np.histogramdd(points, bins=bins)
+    index = np.nonzero(counts)
+    centres = np.column_stack([(edge[i] + edge[i + 1]) / 2 for edge, i in zip(edges, index)])
+    return centres, counts[index]
+
+
+def ellipsoid_segments(centres, covariances, scale=2.0, resolution=24):
+    """
+    不确定度椭球的线框：每个椭球画三个主平面上的椭圆。
+
+    Args:
+        centres (ndarray): 形状为 (K, 3) 的椭球中心。
+        covariances (ndarray): 形状为 (K, 3, 3) 的协方差矩阵。
+        scale (float): 半轴长度取标准差的倍数。
+        resolution (int): 每个椭圆的线段数。
+
+    Returns:
+        ndarray: 形状为 (K * 3 * resolution, 2, 3) 的线段端点。
+    """
+    centres = np.asarray(centres, dtype=float)[:, :3]
+    variance, axes = np.linalg.eigh(np.asarray(covariances, dtype=float))
+    # 各主轴方向乘以对应的标准差
+    radii = axes * (scale * np.sqrt(np.maximum(variance, 0.0)))[:, None, :]
+    angle = np.linspace(0, 2 * np.pi, resolution + 1)
+    circle = np.stack([np.cos(angle), np.sin(angle)], axis=-1)  # (R + 1, 2)
+    planes = [(0, 1), (0, 2), (1, 2)]
+    # (K, 3 个平面, R + 1, 3)
+    rings = np.stack([circle @ np.swapaxes(radii[:, :, list(pair)], 1, 2) for pair in planes], axis=1)
+    rings += centres[:, None, None, :]
+    return np.stack([rings[:, :, :-1], rings[:, :, 1:]], axis=3).reshape(-1, 2, 3)
+
+
+def plot_results(results, output=None, mode='auto', max_points=50000, bins=32, ellipsoids=True,
+                 scale=2.0, max_ellipsoids=500, title='Localized sonic boom sources'):
+    """
+    从存储的定位结果绘图，可以在不重新求解的情况下在另一个进程中运行。
+
+    Args:
+        results (LocalizationResults | str | Path): 定位结果或 ``save_results`` 写入的文件。
+        output (str): 输出文件路径（PNG、PDF 等）；为 None 时弹出窗口显示。
+        mode (str): 'scatter' 画全部点，'decimate' 随机抽稀到 ``max_points``，
+            'density' 按网格计数后画非空格子；'auto' 在点数超过 ``max_points`` 时用 'density'。
+        max_points (int): 'auto' 与 'decimate' 模式下直接绘制的最大点数。
+        bins (int): 'density' 模式每个方向的格子数。
+        ellipsoids (bool): 结果中有协方差时是否绘制不确定度椭球。
+        scale (float): 椭球半轴取标准差的倍数。
+        max_ellipsoids (int): 最多绘制的椭球个数，超过时抽稀。
+        title (str): 图标题。
+    """
+    if not isinstance(results, tuple):
+        from .results import load_results
+        results = load_results(results)
+    plt = _pyplot(output)
+    sources = np.asarray(results.sources, dtype=float)
+    success = np.asarray(results.success, dtype=bool)
+    if mode == 'auto':
+        mode = 'density' if len(sources) > max_points else 'scatter'
+    if mode == 'density' and not success.any():
+        # 没有成功的解时密度图无从统计，改为抽稀后画出失败的解
+        mode = 'decimate'
+
+    fig = plt.figure(figsize=(10, 8))
+    ax = fig.add_subplot(111, projection='3d')
+    if mode == 'density':
+        centres, counts = density_bins(sources[success], bins)
+        points = ax.scatter(centres[:, 0], centres[:, 1], centres[:, 2], c=np.log10(counts),
+                            cmap='viridis', s=4 + 36 * counts / counts.max(), depthshade=False,
+                            label=f'Sources ({success.sum()} in {len(counts)} bins)')
+        fig.colorbar(points, ax=ax, shrink=0.6, label='log10(count)')
+    else:
+        keep = decimate(sources, max_points) if mode == 'decimate' else np.arange(len(sources))
+        shown = sources[keep]
+        good = success[keep]
+        ax.scatter(shown[good, 0], shown[good, 1], shown[good, 2], color='tab:blue', s=8,
+                   depthshade=False, label='Sources')
+        if np.any(~good):
+            ax.scatter(shown[~good, 0], shown[~good, 1], shown[~good, 2], color='tab:red',
+                       marker='x', s=12, label='Failed fits')
+
+    if ellipsoids and results.covariance is not None:
+        from mpl_toolkits.mplot3d.art3d import Line3DCollection
+        valid = np.flatnonzero(success & np.all(np.isfinite(results.covariance), axis=(1, 2)))
+        valid = valid[decimate(valid, max_ellipsoids)]
+        segments = ellipsoid_segments(sources[valid], results.covariance[valid], scale)
+        ax.add_collection3d(Line3DCollection(segments, colors='tab:orange', linewidths=0.5,
+                                             alpha=0.6))
+
+    stations = np.asarray(results.stations, dtype=float)
+    ax.scatter(stations[:, 0], stations[:, 1], stations[:, 2], color='gray', marker='^', s=40,
+               label='Monitoring stations')
+    ax.set_xlabel('Longitude')
+    ax.set_ylabel('Latitude')
+    ax.set_zlabel('Elevation (m)')
+    ax.set_title(title)
+    ax.legend()
+    _finish(plt, fig, output)
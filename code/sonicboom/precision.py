@@ -0,0 +1,139 @@
+"""
+监测网的定位精度图：线性化的 Cramér–Rao 下界与 GDOP。
+
+``problem4/4-1问题四求解.py`` 为判断加入监测点 H、I 是否有帮助，
+在固定数据上反复加噪声并重新求解。到达时间误差独立、服从 N(0, σ_n²) 时，
+音爆源 (x, y, z, v·t) 的 Fisher 信息矩阵为 Σ_n h_n h_nᵀ / (v σ_n)²，
+其中 h_n = [指向监测点 n 的单位向量, 1]（与 ``subset`` 中的几何矩阵相同），
+其逆即线性化的协方差下界，只依赖监测网几何，不需要任何求解。
+
+三维网格按块计算，每块的几何矩阵和 4×4 求逆都是批量运算，
+临时数组只与块大小有关；结果可以直接写入 ``.npy`` 内存映射文件，
+10^7 个网格点也不需要把结果整个放在内存里。
+"""
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import v_sound, jacobian_columns
+
+
+class PrecisionMap(NamedTuple):
+    """网格上的定位精度，数组的前三维与 ``axes`` 对应。"""
+    axes: list  # 三个方向的网格坐标
+    gdop: np.ndarray  # (X, Y, Z) 几何精度因子，几何退化处为 inf
+    std: np.ndarray  # (X, Y, Z, 4) x, y, z（米）和 t（秒）的标准差下界
+
+    @property
+    def position_error(self):
+        """三维位置误差的均方根下界（米）。"""
+        return np.sqrt(np.sum(self.std[..., :3].astype(float) ** 2, axis=-1))
+
+
+def _geometry(points, stations):
+    """形状为 (Q, 4, N) 的 h_n，按参数排列；即 v = 1、时间参数为 v·t 时的 ``jacobian_columns``。"""
+    return jacobian_columns(np.column_stack([points, np.zeros(len(points))]), stations, v=1.0)
+
+
+def _inverse(info):
+    """批量求逆，行列式相对于迹过小的矩阵视为退化，返回 (逆矩阵, 退化标记)。"""
+    scale = np.trace(info, axis1=-2, axis2=-1) / 4
+    degenerate = ~(np.linalg.det(info) > 1e-12 * scale ** 4)
+    info[degenerate] = np.eye(4)
+    inverse = np.linalg.inv(info)
+    inverse[degenerate] = np.inf
+    return inverse, degenerate
+
+
+def crb_covariance(sources, stations, error_std=0.5, v=v_sound):
+    """
+    若干音爆源位置上 (x, y, z, t) 的协方差下界。
+
+    Args:
+        sources (ndarray): 形状为 (Q, 3) 的音爆源位置（米），多出的时间列会被忽略。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米）。
+        error_std (float | ndarray): 到达时间误差的标准差，标量或形状为 (N,) 的逐监测点值。
+        v (float): 声速。
+
+    Returns:
+        ndarray: 形状为 (Q, 4, 4) 的协方差矩阵，几何退化处为 inf。
+    """
+    points = np.atleast_2d(np.asarray(sources, dtype=float))[:, :3]
+    stations = np.asarray(stations, dtype=float)
+    columns = _geometry(points, stations)
+    weight = np.broadcast_to(1.0 / (v * np.asarray(error_std, dtype=float)) ** 2,
+                             (len(stations),))
+    info = columns @ np.swapaxes(columns * weight, 1, 2)
+    covariance, _ = _inverse(info)
+    # 第四个参数是 v·t，换回秒
+    covariance[:, 3, :3] /= v
+    covariance[:, :3, 3] /= v
+    covariance[:, 3, 3] /= v ** 2
+    return covariance
+
+
+def precision_map(stations, axes, error_std=0.5, v=v_sound, active=None, chunk_size=65536,
+                  output=None):
+    """
+    计算监测网在三维网格上的 GDOP 和标准差下界。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米），经纬度数据先用
+            ``project_stations`` 投影。
+        axes (sequence): 三个一维数组，网格在 x、y、z 方向的坐标。
+        error_std (float | ndarray): 到达时间误差的标准差，标量或形状为 (N,) 的逐监测点值。
+        v (float): 声速。
+        active (ndarray): 形状为 (N,) 的布尔掩码，只用其中为 True 的监测点，
+            便于比较不同的布网方案。
+        chunk_size (int): 每块的网格点数。
+        output (str | Path): 若给出，结果写入该目录下的 ``gdop.npy`` 和 ``std.npy``
+            并以内存映射返回。
+
+    Returns:
+        PrecisionMap: 网格上的精度，数组为 float32。
+    """
+    stations = np.asarray(stations, dtype=float)
+    error_std = np.broadcast_to(np.asarray(error_std, dtype=float), (len(stations),))
+    if active is not None:
+        active = np.asarray(active, dtype=bool)
+        stations, error_std = stations[active], error_std[active]
+    axes = [np.asarray(axis, dtype=float) for axis in axes]
+    shape = tuple(len(axis) for axis in axes)
+
+    if output is None:
+        gdop = np.empty(shape, dtype=np.float32)
+        std = np.empty(shape + (4,), dtype=np.float32)
+    else:
+        output = Path(output)
+        output.mkdir(parents=True, exist_ok=True)
+        gdop = np.lib.format.open_memmap(output / 'gdop.npy', mode='w+', dtype=np.float32,
+                                         shape=shape)
+        std = np.lib.format.open_memmap(output / 'std.npy', mode='w+', dtype=np.float32,
+                                        shape=shape + (4,))
+    flat_gdop, flat_std = gdop.reshape(-1), std.reshape(-1, 4)
+
+    # 误差相同时 GDOP 与协方差共用一次求逆，否则协方差另做一次加权求逆
+    uniform = np.all(error_std == error_std[0])
+    weight = 1.0 / error_std ** 2
+    unit = np.array([v, v, v, 1.0])
+    total = flat_gdop.size
+    for start in range(0, total, chunk_size):
+        index = np.unravel_index(np.arange(start, min(start + chunk_size, total)), shape)
+        points = np.column_stack([axes[k][index[k]] for k in range(3)])
+        columns = _geometry(points, stations)
+        inverse, _ = _inverse(columns @ np.swapaxes(columns, 1, 2))
+        variance = np.diagonal(inverse, axis1=1, axis2=2)
+        flat_gdop[start:start + len(points)] = np.sqrt(variance.sum(axis=1))
+        if uniform:
+            variance = variance * error_std[0] ** 2
+        else:
+            weighted, _ = _inverse(columns @ np.swapaxes(columns * weight, 1, 2))
+            variance = np.diagonal(weighted, axis1=1, axis2=2)
+        # 位置以 v·σ 为单位，时间参数 v·t 换回秒后与 σ 同单位
+        flat_std[start:start + len(points)] = np.sqrt(variance) * unit
+
+    if output is not None:
+        gdop.flush()
+        std.flush()
+    return PrecisionMap(axes=axes, gdop=gdop, std=std)
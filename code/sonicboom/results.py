@@ -0,0 +1,64 @@
+"""
+定位结果的存取。
+
+``3-2问题三求解可视化.py`` 必须和求解在同一个进程里运行。定位结果存成 ``.npz``
+后，画图、统计等后续处理只读文件，不再依赖求解过程。
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+
+class LocalizationResults(NamedTuple):
+    """一次定位的结果，坐标单位由写入方决定（经纬度或局部米制坐标）。"""
+    sources: np.ndarray  # (M, 4) 音爆源 (x, y, z, t)
+    stations: np.ndarray  # (N, 3) 监测点
+    names: list  # 监测点名称，可为空列表
+    success: np.ndarray  # (M,) 是否收敛
+    cost: np.ndarray  # (M,) 残差代价
+    covariance: np.ndarray  # (M, 3, 3) 位置协方差，与坐标同单位；未计算时为 None
+
+
+def save_results(path, sources, stations, names=None, success=None, cost=None, covariance=None):
+    """
+    把定位结果写入 ``.npz`` 文件。
+
+    Args:
+        path (str | Path): 输出文件路径。
+        sources (ndarray): 形状为 (M, 4) 的音爆源参数。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标。
+        names (list): 监测点名称。
+        success (ndarray): 形状为 (M,) 的收敛标记，默认全部为 True。
+        cost (ndarray): 形状为 (M,) 的残差代价。
+        covariance (ndarray): 形状为 (M, 3, 3) 的位置协方差。
+    """
+    sources = np.atleast_2d(np.asarray(sources, dtype=float))
+    arrays = {
+        'sources': sources,
+        'stations': np.asarray(stations, dtype=float),
+        'names': np.array(list(names) if names is not None else [], dtype=str),
+        'success': (np.ones(len(sources), dtype=bool) if success is None
+                    else np.asarray(success, dtype=bool)),
+        'cost': np.full(len(sources), np.nan) if cost is None else np.asarray(cost, dtype=float),
+    }
+    if covariance is not None:
+        arrays['covariance'] = np.asarray(covariance, dtype=float)
+    with open(path, 'wb') as handle:
+        np.savez(handle, **arrays)
+
+
+def load_results(path):
+    """
+    读取 ``save_results`` 写入的文件。
+
+    Args:
+        path (str | Path): 文件路径。
+
+    Returns:
+        LocalizationResults: 定位结果。
+    """
+    with np.load(path, allow_pickle=False) as stored:
+        return LocalizationResults(
+            sources=stored['sources'], stations=stored['stations'],
+            names=stored['names'].tolist(), success=stored['success'], cost=stored['cost'],
+            covariance=stored['covariance'] if 'covariance' in stored.files else None)
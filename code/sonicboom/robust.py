@@ -0,0 +1,113 @@
+"""
+基于随机抽样一致（RANSAC）的抗差定位。
+
+问题三、四的求解把全部监测点一起做最小二乘，一个错误的到达时间拾取
+（误检的音爆、时钟故障）就会拖偏整个解；4-1 也只把噪声建模为高斯抖动。
+这里对每个事件取若干个 4 监测点的最小子集，所有事件的所有子集一起交给
+``solve_batch`` 批量求解，按残差阈值统计每个假设的一致集，取最好的假设后
+只用内点重新拟合，并返回每个事件的内点掩码。
+"""
+from itertools import combinations
+from math import comb
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import v_sound, leftovers_batch
+from .solvers import solve_batch
+from .telemetry import instrument
+
+
+class RobustSolution(NamedTuple):
+    """抗差定位结果。"""
+    x: np.ndarray  # (E, 4) 用内点重新拟合的 (x, y, z, t)
+    inliers: np.ndarray  # (E, N) 内点掩码
+    cost: np.ndarray  # (E,) 内点残差代价
+    success: np.ndarray  # (E,) 内点不少于 min_inliers 且重新拟合收敛
+
+
+def minimal_subsets(num_stations, num_subsets, rng, size=4):
+    """
+    生成最小监测点子集；全部组合数不超过 ``num_subsets`` 时穷举。
+
+    Args:
+        num_stations (int): 监测点数 N。
+        num_subsets (int): 子集个数上限。
+        rng (Generator): 随机数生成器。
+        size (int): 子集大小。
+
+    Returns:
+        ndarray: 形状为 (K, size) 的监测点下标。
+    """
+    if comb(num_stations, size) <= num_subsets:
+        return np.array(list(combinations(range(num_stations), size)), dtype=int)
+    keys = rng.random((num_subsets, num_stations))
+    return np.sort(np.argpartition(keys, size, axis=1)[:, :size], axis=1)
+
+
+def _solve_chunk(times, stations, subsets, threshold, min_inliers, v, max_nfev, refits):
+    num_events, num_stations = times.shape
+    num_subsets = len(subsets)
+
+    # 全部事件 × 全部子集的最小子集拟合，一次批量求解
+    sub_times = times[:, subsets].reshape(-1, subsets.shape[1])
+    sub_stations = np.broadcast_to(stations[subsets], (num_events,) + subsets.shape + (3,))
+    valid = np.all(np.isfinite(sub_times), axis=1)
+    hypotheses = solve_batch(np.where(valid[:, None], sub_times, 0.0),
+                             sub_stations.reshape(-1, subsets.shape[1], 3), v=v,
+                             max_nfev=max_nfev).x.reshape(num_events, num_subsets, 4)
+
+    # 一致集评分：截断残差平方和（MSAC），内点数相同时偏向残差小的假设
+    residuals = np.abs(leftovers_batch(hypotheses.reshape(-1, 4), stations,
+                                       np.repeat(times, num_subsets, axis=0), v))
+    residuals = residuals.reshape(num_events, num_subsets, num_stations)
+    residuals = np.where(np.isfinite(residuals), residuals, np.inf)
+    score = np.sum(np.minimum(residuals, threshold) ** 2, axis=2)
+    score = np.where(valid.reshape(num_events, num_subsets), score, np.inf)
+    best = np.argmin(score, axis=1)
+    rows = np.arange(num_events)
+    x = hypotheses[rows, best]
+    inliers = residuals[rows, best] <= threshold
+
+    # 只用内点重新拟合，再按新解更新内点
+    for _ in range(refits):
+        solution = solve_batch(np.where(inliers, times, np.nan), stations, x, v=v)
+        x = solution.x
+        inliers = np.abs(leftovers_batch(x, stations, times, v)) <= threshold
+        inliers &= np.isfinite(times)
+    solution = solve_batch(np.where(inliers, times, np.nan), stations, x, v=v)
+    success = solution.success & (inliers.sum(axis=1) >= min_inliers)
+    return solution.x, inliers, solution.cost, success
+
+
+@instrument('solve_robust')
+def solve_robust(times, stations, threshold=0.5, num_subsets=64, min_inliers=5, v=v_sound,
+                 seed=None, chunk_size=1024, max_nfev=30, refits=1):
+    """
+    批量抗差定位。
+
+    Args:
+        times (ndarray): 形状为 (E, N) 的到达时间，缺失值为 NaN。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米）。
+        threshold (float): 判为内点的残差阈值（秒）。
+        num_subsets (int): 每个事件抽取的最小子集数。
+        min_inliers (int): 判定定位成功所需的最少内点数。
+        v (float): 声速。
+        seed (int): 子集抽样的随机种子。
+        chunk_size (int): 每批处理的事件数，限制 (事件 × 子集 × 监测点) 临时数组的大小。
+        max_nfev (int): 最小子集拟合的最大迭代次数。
+        refits (int): 内点重新拟合并更新内点的轮数。
+
+    Returns:
+        RobustSolution: 各事件的解和内点掩码。
+    """
+    times = np.atleast_2d(np.asarray(times, dtype=float))
+    stations = np.asarray(stations, dtype=float)
+    rng = np.random.default_rng(seed)
+    subsets = minimal_subsets(stations.shape[0], num_subsets, rng)
+
+    parts = [_solve_chunk(times[start:start + chunk_size], stations, subsets, threshold,
+                          min_inliers, v, max_nfev, refits)
+             for start in range(0, len(times), chunk_size)]
+    x, inliers, cost, success = (np.concatenate(p) for p in zip(*parts))
+    return RobustSolution(x=x, inliers=inliers, cost=cost, success=success)
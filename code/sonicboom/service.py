@@ -0,0 +1,248 @@
+"""
+常驻的 asyncio 定位服务，按微批次调用批量求解器。
+
+原来定位一次要改脚本里的 ``coordinates`` 字典再重新运行。本服务在本地 TCP 或
+Unix 套接字上接收 JSON 行消息，监测点几何只在启动时加载一次：
+
+    {"event": 7, "station": "A", "time": 100.767}        单个拾取
+    {"event": 7, "arrivals": {"A": 100.767, "B": 112.2}}  一次给出多个拾取
+    {"event": 7, "end": true}                            该事件不会再有拾取
+
+同一连接上同一 ``event`` 的拾取归为一个事件：全部监测点到齐、收到 ``end``，
+或距第一个拾取超过 ``event_timeout`` 时事件完成，之后到达的该事件的拾取返回错误。
+完成的事件在 ``window`` 内攒成
+一个微批次（最多 ``max_batch`` 个），整批交给工作进程池中的 ``solve_batch``，
+结果逐行写回发送该事件的连接。同时在求解的批次不超过工作进程数，
+求解器忙时到达的事件留到下一批，负载越高批次越大，不会积压大量小批次：
+
+    {"event": 7, "lon": ..., "lat": ..., "alt": ..., "t": ..., "cost": ..., "success": true}
+
+工作进程在启动时载入监测点，之后每批只传到达时间矩阵。
+"""
+import asyncio
+import json
+import os
+import signal
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from .forward import v_sound
+from .geometry import project_stations
+from .solvers import solve_batch
+
+# 工作进程中常驻的监测点几何：(LocalFrame 或 None, 局部坐标, 声速, 求解参数)
+_worker = None
+
+
+def _worker_init(frame, local, v, options):
+    global _worker
+    _worker = (frame, local, v, options)
+
+
+def _worker_solve(times):
+    """在工作进程中求解一个微批次，返回 (x, cost, success)。"""
+    frame, local, v, options = _worker
+    solution = solve_batch(times, local, initial_guess='closed_form', v=v, **options)
+    x = solution.x if frame is None else frame.to_geodetic(solution.x)
+    return x, solution.cost, solution.success
+
+
+class LocalizationService:
+    """
+    微批次定位服务。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的监测点，经纬度（``geodetic=True``）或米制坐标。
+        names (list): 监测点名称，消息中的 ``station`` 字段按名称查找。
+        v (float | SoundSpeedProfile): 声速或声速剖面。
+        geodetic (bool): 监测点是否为经纬度；是则在局部坐标中求解、以经纬度输出。
+        window (float): 攒批的最长等待时间（秒）。
+        max_batch (int): 每个微批次的最大事件数，攒满立即提交。
+        event_timeout (float): 事件从第一个拾取起等待其余拾取的时间（秒）。
+        min_stations (int): 事件至少需要的拾取数，不足的事件返回错误。
+        workers (int): 工作进程数；0 表示在本进程的线程中求解。
+        max_nfev (int): 传给 ``solve_batch`` 的最大残差函数调用次数。
+        history (int): 记住的已完成事件数，用于拒绝这些事件迟到的拾取。
+    """
+
+    def __init__(self, stations, names, v=v_sound, geodetic=True, window=0.005, max_batch=1024,
+                 event_timeout=0.05, min_stations=4, workers=1, max_nfev=50, history=65536):
+        stations = np.asarray(stations, dtype=float)
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        frame, local = project_stations(stations) if geodetic else (None, stations)
+        self.window = window
+        self.max_batch = max_batch
+        self.event_timeout = event_timeout
+        self.min_stations = min_stations
+        self.history = history
+        initargs = (frame, np.array(local), v, {'max_nfev': max_nfev})
+        if workers:
+            self.executor = ProcessPoolExecutor(workers, initializer=_worker_init,
+                                                initargs=initargs)
+        else:
+            _worker_init(*initargs)
+            self.executor = ThreadPoolExecutor(1)
+        self.slots = max(workers, 1)
+        self.pending = {}  # (连接, 事件) -> [到达时间, 超时句柄]
+        self.ready = []  # 已完成、等待提交的 (连接, 事件, 到达时间)
+        self.completed = OrderedDict()  # 最近完成的 (连接, 事件)，按完成顺序
+        self.flush_handle = None
+        self.batches = set()
+        self.server = None
+
+    def receive(self, message, writer):
+        """
+        处理一条消息。先检查整条消息：不是对象、缺少 ``event`` 或 ``time``、到达时间
+        不是数值时抛出 TypeError、KeyError 或 ValueError，不改动未完成的事件。
+        """
+        if not isinstance(message, dict):
+            raise TypeError('消息须为 JSON 对象')
+        event = message.get('event')
+        if event is None:
+            # 没有事件编号的拾取无法与同一连接上的其他拾取区分，不能归为一个事件
+            raise ValueError('缺少 event')
+        key = (writer, event)
+        hash(key)
+        arrivals = message.get('arrivals', {})
+        if not isinstance(arrivals, dict):
+            raise TypeError('arrivals 须为 监测点 -> 到达时间 的对象')
+        if 'station' in message:
+            arrivals = {**arrivals, message['station']: message['time']}
+        for station, time in arrivals.items():
+            if isinstance(time, bool) or not isinstance(time, (int, float)):
+                raise ValueError(f'监测点 {station} 的到达时间不是数值：{time!r}')
+
+        if key in self.completed:
+            # 事件已经求解或返回错误，迟到的拾取不再开始一个新事件；单独的 end 直接忽略
+            if arrivals:
+                self._reply(writer, {'event': event, 'error': '事件已完成，忽略迟到的拾取'})
+            return
+        if key not in self.pending:
+            timer = asyncio.get_running_loop().call_later(self.event_timeout, self._complete, key)
+            self.pending[key] = [np.full(len(self.names), np.nan), timer]
+        times = self.pending[key][0]
+        for station, time in arrivals.items():
+            if station not in self.index:
+                self._reply(writer, {'event': event, 'error': f'未知的监测点 {station}'})
+                continue
+            times[self.index[station]] = time
+        if message.get('end') or np.all(np.isfinite(times)):
+            self._complete(key)
+
+    def _complete(self, key):
+        entry = self.pending.pop(key, None)
+        if entry is None:
+            return
+        times, timer = entry
+        timer.cancel()
+        self.completed[key] = None
+        if len(self.completed) > self.history:
+            self.completed.popitem(last=False)
+        writer, event = key
+        if np.isfinite(times).sum() < self.min_stations:
+            self._reply(writer, {'event': event, 'error': f'拾取少于 {self.min_stations} 个'})
+            return
+        self.ready.append((writer, event, times))
+        if len(self.ready) >= self.max_batch:
+            self._flush()
+        elif self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+
+    def _flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        # 工作进程都在忙时不提交，等某一批完成后再把这段时间攒下的事件一起提交
+        while self.ready and len(self.batches) < self.slots:
+            batch, self.ready = self.ready[:self.max_batch], self.ready[self.max_batch:]
+            task = asyncio.ensure_future(self._solve(batch))
+            self.batches.add(task)
+            task.add_done_callback(self._done)
+
+    def _done(self, task):
+        self.batches.discard(task)
+        if self.ready:
+            self._flush()
+
+    async def _solve(self, batch):
+        times = np.stack([times for _, _, times in batch])
+        loop = asyncio.get_running_loop()
+        try:
+            x, cost, success = await loop.run_in_executor(self.executor, _worker_solve, times)
+        except Exception as error:  # 求解失败时整批返回错误，不让客户端一直等待
+            for writer, event, _ in batch:
+                self._reply(writer, {'event': event, 'error': f'求解失败：{error}'})
+            return
+        writers = set()
+        for (writer, event, _), row, value, ok in zip(batch, x.tolist(), cost.tolist(),
+                                                       success.tolist()):
+            self._reply(writer, {'event': event, 'lon': row[0], 'lat': row[1], 'alt': row[2],
+                                 't': row[3], 'cost': value, 'success': ok})
+            writers.add(writer)
+        for writer in writers:
+            if not writer.is_closing():
+                await writer.drain()
+
+    @staticmethod
+    def _reply(writer, record):
+        if not writer.is_closing():
+            writer.write((json.dumps(record, ensure_ascii=False) + '\n').encode())
+
+    async def handle(self, reader, writer):
+        """一个客户端连接：逐行读取消息，连接关闭时提交其未完成的事件。"""
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    self._reply(writer, {'error': '无法解析的消息'})
+                    continue
+                try:
+                    self.receive(message, writer)
+                except (KeyError, TypeError, ValueError, AttributeError) as error:
+                    # 格式不对的消息只回复错误，连接和其他事件不受影响
+                    record = {'error': f'格式错误的消息：{error}'}
+                    if isinstance(message, dict) and 'event' in message:
+                        record['event'] = message['event']
+                    self._reply(writer, record)
+        finally:
+            for key in [key for key in self.pending if key[0] is writer]:
+                self._complete(key)
+            for key in [key for key in self.completed if key[0] is writer]:
+                del self.completed[key]
+            self._flush()
+            while any(not task.done() for task in self.batches):
+                await asyncio.wait(list(self.batches))
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        """开始监听；``path`` 给出时使用 Unix 套接字。"""
+        # 先让工作进程启动并完成一次求解，第一批请求不必等待进程创建和模块导入
+        times = np.zeros((1, len(self.names)))
+        await asyncio.get_running_loop().run_in_executor(self.executor, _worker_solve, times)
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path=path)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+    async def serve_forever(self, host='127.0.0.1', port=8765, path=None):
+        """监听直到收到 SIGINT 或 SIGTERM，退出前关闭工作进程。"""
+        server = await self.start(host, port, path)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            self.close()
+            if path is not None and os.path.exists(path):
+                os.unlink(path)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
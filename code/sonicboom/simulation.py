@@ -0,0 +1,166 @@
+"""
+问题二设备数量验证的批量模拟。
+
+``problem2`` 的两个脚本每次只模拟一个随机场景：``count_arrival_times`` 逐个
+残骸循环并读取全局 ``num_debris``，残骸位置用无上限的 ``while True`` 拒绝采样。
+这里把 S 个场景 × D 个残骸 × N 个监测点作为一个张量生成：
+
+- 残骸水平位置直接在可行圆盘内均匀采样，不做拒绝；
+- 到达时间用 ``arrival_times`` 广播计算；
+- 全部 S × D 个事件交给 ``solve_batch`` 一次求解。
+
+正演模型统一为三维距离（与 ``2-2`` 一致）。
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import v_sound, arrival_times
+from .solvers import solve_batch
+
+
+class ScenarioBatch(NamedTuple):
+    """一批模拟场景及求解结果。"""
+    stations: np.ndarray  # (S, N, 3)
+    places: np.ndarray  # (S, D, 3) 残骸真实位置
+    times: np.ndarray  # (S, D) 残骸真实发生时间
+    arrivals: np.ndarray  # (S, D, N) 模拟到达时间
+    estimates: np.ndarray  # (S, D, 4) 求解得到的 (x, y, z, t)
+    volatility: np.ndarray  # (S,) 与脚本相同的波动性指标
+    success: np.ndarray  # (S,) 场景内全部残骸均收敛
+
+
+def feasible_disc(stations, radius):
+    """
+    求包含于每个监测点水平圆盘（半径 ``radius``）内的一个圆盘。
+
+    圆心取监测点水平包围盒的中心，半径为 ``radius`` 减去圆心到最远监测点的距离，
+    该圆盘内任意一点到所有监测点的水平距离都小于 ``radius``。
+
+    Args:
+        stations (ndarray): 形状为 (..., N, 3) 的监测点坐标。
+        radius (float): 残骸到各监测点的最大水平距离。
+
+    Returns:
+        tuple: (形状为 (..., 2) 的圆心, 形状为 (...,) 的半径；不可行时半径为负)。
+    """
+    horizontal = np.asarray(stations, dtype=float)[..., :2]
+    center = (horizontal.min(axis=-2) + horizontal.max(axis=-2)) / 2
+    farthest = np.max(np.linalg.norm(horizontal - center[..., None, :], axis=-1), axis=-1)
+    return center, radius - farthest
+
+
+def sample_debris(rng, stations, num_debris, radius=1000, altitude=(0, 1000), time_range=(0, 100)):
+    """
+    在可行区域内直接采样残骸位置和发生时间。
+
+    Args:
+        rng (Generator): 随机数生成器。
+        stations (ndarray): 形状为 (S, N, 3) 的各场景监测点坐标。
+        num_debris (int): 每个场景的残骸数 D。
+        radius (float): 残骸到各监测点的最大水平距离。
+        altitude (tuple): 残骸高程范围。
+        time_range (tuple): 残骸发生时间范围。
+
+    Returns:
+        tuple: (places (S, D, 3), times (S, D), feasible (S,))。
+    """
+    num_scenarios = stations.shape[0]
+    center, disc = feasible_disc(stations, radius)
+    # 极坐标下半径取 sqrt(u)，保证圆盘内均匀分布
+    r = np.sqrt(rng.random((num_scenarios, num_debris))) * np.maximum(disc, 0)[:, None]
+    theta = rng.random((num_scenarios, num_debris)) * 2 * np.pi
+    places = np.empty((num_scenarios, num_debris, 3))
+    places[..., 0] = center[:, None, 0] + r * np.cos(theta)
+    places[..., 1] = center[:, None, 1] + r * np.sin(theta)
+    places[..., 2] = rng.uniform(*altitude, size=(num_scenarios, num_debris))
+    times = rng.uniform(*time_range, size=(num_scenarios, num_debris))
+    return places, times, disc > 0
+
+
+def choose_stations(rng, pool, num_scenarios, num_stations):
+    """
+    为每个场景从监测点池中无放回地随机选出 ``num_stations`` 个监测点。
+
+    Args:
+        rng (Generator): 随机数生成器。
+        pool (ndarray): 形状为 (P, 3) 的候选监测点。
+        num_scenarios (int): 场景数 S。
+        num_stations (int): 每个场景的监测点数 N。
+
+    Returns:
+        ndarray: 形状为 (S, N, 3) 的监测点坐标。
+    """
+    pool = np.asarray(pool, dtype=float)
+    picks = np.argsort(rng.random((num_scenarios, len(pool))), axis=1)[:, :num_stations]
+    return pool[picks]
+
+
+def simulate(num_scenarios, num_stations, num_debris=4, pool=None, box=1000, radius=1000,
+             altitude=(0, 1000), time_range=(0, 100), error_std=0.0, seed=None, v=v_sound):
+    """
+    生成一批场景并批量求解残骸的位置和时间。
+
+    Args:
+        num_scenarios (int): 场景数 S。
+        num_stations (int): 每个场景的监测点数 N。
+        num_debris (int): 每个场景的残骸数 D。
+        pool (ndarray): 候选监测点（米制坐标），给定时按 ``2-1`` 的方式随机选取子集；
+            否则按 ``2-2`` 的方式在边长 ``box`` 的立方体内随机生成监测点。
+        box (float): 随机生成监测点的立方体边长。
+        radius (float): 残骸到各监测点的最大水平距离，默认与 ``2-1`` 相同取 1000；
+            ``np.inf`` 表示不约束，此时残骸采样范围比监测点向外扩出 ``2 * box``。
+        altitude (tuple): 残骸高程范围。
+        time_range (tuple): 残骸发生时间范围。
+        error_std (float): 到达时间噪声的标准差。
+        seed (int): 随机种子。
+        v (float): 声速。
+
+    Returns:
+        ScenarioBatch: 模拟数据及求解结果。不可行的场景（可行圆盘为空）残骸均位于圆心。
+    """
+    rng = np.random.default_rng(seed)
+    if pool is None:
+        stations = rng.random((num_scenarios, num_stations, 3)) * box
+    else:
+        stations = choose_stations(rng, pool, num_scenarios, num_stations)
+    if np.isinf(radius):
+        # 圆盘采样需要有限半径，取一个覆盖监测网并向外扩出 2 * box 的半径
+        radius = 2 * box + np.max(np.ptp(stations[..., :2], axis=1))
+    places, times, feasible = sample_debris(rng, stations, num_debris, radius, altitude, time_range)
+
+    sources = np.concatenate([places, times[..., None]], axis=-1)
+    arrivals = arrival_times(sources, stations[:, None], v)
+    if error_std:
+        arrivals = arrivals + rng.normal(0, error_std, arrivals.shape)
+
+    per_event = np.repeat(stations, num_debris, axis=0)
+    solution = solve_batch(arrivals.reshape(-1, num_stations), per_event, v=v)
+    estimates = solution.x.reshape(num_scenarios, num_debris, 4)
+    volatility = (np.mean((places - estimates[..., :3]) ** 2, axis=(1, 2))
+                  + np.mean((times - estimates[..., 3]) ** 2, axis=1))
+    success = np.all(solution.success.reshape(num_scenarios, num_debris), axis=1) & feasible
+    return ScenarioBatch(stations=stations, places=places, times=times, arrivals=arrivals,
+                         estimates=estimates, volatility=volatility, success=success)
+
+
+def evaluate_device_counts(counts=range(4, 8), num_scenarios=10000, seed=None, **kwargs):
+    """
+    对不同设备数量各模拟一批场景，比较波动性。
+
+    Args:
+        counts (iterable): 待比较的设备数量。
+        num_scenarios (int): 每个设备数量的场景数。
+        seed (int): 随机种子，各设备数量使用派生的独立子种子。
+        **kwargs: 传给 ``simulate`` 的其他参数。
+
+    Returns:
+        dict: 设备数量 -> (波动性中位数, 收敛比例)。
+    """
+    counts = list(counts)
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    summary = {}
+    for count, child in zip(counts, seeds):
+        batch = simulate(num_scenarios, count, seed=child, **kwargs)
+        summary[count] = (float(np.median(batch.volatility)), float(np.mean(batch.success)))
+    return summary
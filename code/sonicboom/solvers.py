@@ -0,0 +1,159 @@
+"""
+批量音爆源定位求解器。
+
+``problem3``/``problem4`` 的脚本对每个音爆源分别调用 ``least_squares``，
+并使用有限差分雅可比矩阵。这里把所有事件堆叠成 (E, N) 的到达时间矩阵，
+用带解析雅可比矩阵的 Levenberg-Marquardt 迭代一次性求解全部事件，
+每步只需一次批量的 4×4 线性方程组求解。阻尼为 λI，与 ``least_squares`` 默认不缩放参数一致。
+
+到达时间互相矛盾时（如题目数据），残差平方和可能有多个局部极小，监测点处还不光滑；
+此时即使初值相同，也可能与 ``least_squares`` 停在不同的极小点。
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import v_sound, leftovers_batch, jacobian_columns
+from .telemetry import instrument
+
+
+class BatchSolution(NamedTuple):
+    """批量求解结果，字段含义与 ``least_squares`` 返回值对应。"""
+    x: np.ndarray  # (E, 4) 音爆源参数 (x, y, z, t)
+    cost: np.ndarray  # (E,) 残差平方和的一半
+    fun: np.ndarray  # (E, N) 最终残差
+    nfev: np.ndarray  # (E,) 残差函数调用次数
+    success: np.ndarray  # (E,) 是否满足收敛条件
+
+
+def default_initial_guess(stations, times):
+    """
+    以监测点中心上空和最早到达时间构造初始猜测值。
+
+    音爆源位于监测网上空，初始高程取监测点平均高程加上监测网的水平跨度，
+    避免从监测点平面出发时收敛到地面以下的镜像解。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 或 (E, N, 3) 的监测点坐标。
+        times (ndarray): 形状为 (E, N) 的到达时间，缺失值为 NaN。
+
+    Returns:
+        ndarray: 形状为 (E, 4) 的初始猜测值。
+    """
+    stations = np.asarray(stations, dtype=float)
+    times = np.atleast_2d(np.asarray(times, dtype=float))
+    guess = np.empty((times.shape[0], 4))
+    guess[:, :3] = np.mean(stations, axis=-2)
+    guess[:, 2] += np.max(np.ptp(stations[..., :2], axis=-2), axis=-1)
+    guess[:, 3] = np.nanmin(times, axis=1)
+    return guess
+
+
+def _masked_leftovers(x, stations, times, mask, v):
+    return np.where(mask, leftovers_batch(x, stations, times, v), 0.0)
+
+
+@instrument('solve_batch')
+def solve_batch(times, stations, initial_guess=None, v=v_sound, max_nfev=200,
+                ftol=1e-8, xtol=1e-8, gtol=1e-8):
+    """
+    一次性求解多个音爆事件的位置和时间。
+
+    Args:
+        times (ndarray): 形状为 (E, N) 的到达时间矩阵，缺失的拾取记为 NaN。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标，或 (E, N, 3) 的逐事件坐标。
+        initial_guess (array_like | str): 初始猜测值，形状为 (4,) 或 (E, 4)；
+            默认使用 ``default_initial_guess``；``'closed_form'`` 表示用
+            ``solve_closed_form`` 的闭式解作初值，闭式解失败的事件仍用默认初值；
+            ``'grid'`` 表示在 ``grid_for_network`` 的走时网格上由粗到细搜索初值，
+            落在最低一层网格的事件仍用默认初值。
+        v (float): 声速。
+        max_nfev (int): 每个事件允许的最大残差函数调用次数。
+        ftol, xtol, gtol (float): 与 ``least_squares`` 含义相同的收敛阈值。
+
+    Returns:
+        BatchSolution: 各事件的求解结果。
+    """
+    times = np.atleast_2d(np.asarray(times, dtype=float))
+    stations = np.asarray(stations, dtype=float)
+    num_events = times.shape[0]
+    mask = np.isfinite(times)
+    times = np.where(mask, times, 0.0)
+    if isinstance(initial_guess, str) and initial_guess == 'closed_form':
+        from .closedform import solve_closed_form
+
+        seed = solve_closed_form(np.where(mask, times, np.nan), stations, v)
+        initial_guess = np.where(seed.success[:, None], seed.x,
+                                 default_initial_guess(stations, np.where(mask, times, np.nan)))
+    elif isinstance(initial_guess, str) and initial_guess == 'grid':
+        if stations.ndim != 2:
+            raise ValueError('网格初值要求所有事件共用一组监测点')
+        from .grid import grid_for_network
+
+        # 网格走时按常声速计算，声速剖面取调和平均声速
+        speed = v.mean_speed() if hasattr(v, 'mean_speed') else v
+        grid = grid_for_network(stations, v=speed)
+        seed = grid.search(np.where(mask, times, np.nan))[0]
+        # 最优点落在最低一层网格（监测点高程）时，上下镜像解难以区分，
+        # 加密也离不开这一层，由此出发常收敛到地面以下，改用默认初值
+        floor = seed[:, 2] < grid.low[2] + grid.step[2]
+        initial_guess = np.where(floor[:, None], default_initial_guess(stations, np.where(mask, times, np.nan)),
+                                 seed)
+    elif initial_guess is None:
+        initial_guess = default_initial_guess(stations, np.where(mask, times, np.nan))
+    x = np.array(np.broadcast_to(np.asarray(initial_guess, dtype=float), (num_events, 4)))
+
+    def station_rows(idx):
+        return stations if stations.ndim == 2 else stations[idx]
+
+    fun = _masked_leftovers(x, stations, times, mask, v)
+    cost = 0.5 * np.sum(fun ** 2, axis=1)
+    nfev = np.ones(num_events, dtype=int)
+    success = np.zeros(num_events, dtype=bool)
+    damping = np.full(num_events, 1e-3)
+    active = np.arange(num_events)
+
+    while active.size:
+        st = station_rows(active)
+        jac_t = jacobian_columns(x[active], st, v)
+        jac_t *= mask[active, None, :]
+        grad = (jac_t @ fun[active, :, None])[..., 0]
+        hess = jac_t @ np.swapaxes(jac_t, 1, 2)
+        # 梯度足够小即视为收敛
+        converged = np.max(np.abs(grad), axis=1) <= gtol
+        stopped = np.zeros(active.size, dtype=bool)
+
+        # 每个事件独立调整阻尼，拒绝的步长放大阻尼后重新尝试
+        pending = ~converged
+        while np.any(pending):
+            rows = np.flatnonzero(pending)
+            idx = active[rows]
+            lhs = hess[rows] + damping[idx, None, None] * np.eye(4)
+            step = -np.linalg.solve(lhs, grad[rows, :, None])[..., 0]
+            x_new = x[idx] + step
+            fun_new = _masked_leftovers(x_new, station_rows(idx), times[idx], mask[idx], v)
+            cost_new = 0.5 * np.sum(fun_new ** 2, axis=1)
+            nfev[idx] += 1
+
+            accepted = cost_new <= cost[idx]
+            acc = idx[accepted]
+            small_f = cost[acc] - cost_new[accepted] <= ftol * cost[acc]
+            small_x = (np.linalg.norm(step[accepted], axis=1)
+                       <= xtol * (xtol + np.linalg.norm(x[acc], axis=1)))
+            x[acc] = x_new[accepted]
+            fun[acc] = fun_new[accepted]
+            cost[acc] = cost_new[accepted]
+            damping[acc] = np.maximum(damping[acc] / 3.0, 1e-12)
+            damping[idx[~accepted]] *= 10.0
+
+            converged[rows[accepted]] = small_f | small_x
+            pending[rows[accepted]] = False
+            stalled = ~accepted & ((damping[idx] > 1e12) | (nfev[idx] >= max_nfev))
+            stopped[rows[stalled]] = True
+            pending[rows[stalled]] = False
+
+        success[active[converged]] = True
+        stopped |= nfev[active] >= max_nfev
+        active = active[~(converged | stopped)]
+
+    return BatchSolution(x=x, cost=cost, fun=fun, nfev=nfev, success=success)
@@ -0,0 +1,172 @@
+"""
+监测点子集选择。
+
+``problem1/1-1_设备数量确定.py`` 按两两距离之和贪心地挑选 4 个监测点，
+遗传算法版本则随机搜索子集。这里改用几何精度因子（GDOP）评价子集：
+在目标区域的一组点上计算到达时间模型的几何矩阵 H = [单位方向向量, 1]，
+GDOP = sqrt(trace((HᵀH)⁻¹))。各点、各监测点的 hhᵀ 预先计算，
+任意子集的 HᵀH 只是一次 (子集 × 监测点) 掩码矩阵与外积的矩阵乘法。
+小规模监测网穷举全部 k 子集，大规模监测网用贪心加单点交换的局部搜索。
+"""
+import time
+from itertools import combinations
+from math import comb
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import jacobian_batch
+
+
+class SubsetSelection(NamedTuple):
+    """子集选择结果，按得分从好到差排列。"""
+    subsets: np.ndarray  # (n, k) 监测点下标
+    scores: np.ndarray  # (n,) 目标区域上的 GDOP 统计值
+    method: str  # 'exhaustive' 或 'swap'
+    evaluated: int  # 评价过的子集数
+    elapsed: float  # 搜索耗时（秒）
+
+
+def station_geometry(stations, targets):
+    """
+    各目标点到各监测点的几何行 h = [单位方向向量, 1]。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米）。
+        targets (ndarray): 形状为 (Q, 3) 的目标区域点。
+
+    Returns:
+        ndarray: 形状为 (Q, N, 4) 的几何行。
+    """
+    targets = np.asarray(targets, dtype=float)
+    sources = np.concatenate([targets, np.zeros((len(targets), 1))], axis=1)
+    # 雅可比矩阵的位置列乘以声速即单位方向向量，时间列取 1（以距离计的时钟项）
+    return jacobian_batch(sources, stations, v=1.0)
+
+
+def station_outer_products(stations, targets):
+    """
+    计算每个目标点、每个监测点的 hhᵀ。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米）。
+        targets (ndarray): 形状为 (Q, 3) 的目标区域点。
+
+    Returns:
+        ndarray: 形状为 (N, Q, 4, 4) 的外积。
+    """
+    geometry = station_geometry(stations, targets)
+    return np.einsum('qnk,qnl->nqkl', geometry, geometry)
+
+
+def gdop_scores(masks, outer, reduce='mean'):
+    """
+    批量计算子集的 GDOP 得分。
+
+    Args:
+        masks (ndarray): 形状为 (S, N) 的子集掩码。
+        outer (ndarray): ``station_outer_products`` 的结果。
+        reduce (str): 目标点上的汇总方式，'mean' 或 'max'。
+
+    Returns:
+        ndarray: 形状为 (S,) 的得分，几何退化的子集为 inf。
+    """
+    num_stations, num_targets = outer.shape[:2]
+    info = (np.asarray(masks, dtype=float) @ outer.reshape(num_stations, -1))
+    info = info.reshape(-1, num_targets, 4, 4)
+    # 行列式相对于迹的尺度过小的矩阵视为退化
+    scale = np.trace(info, axis1=-2, axis2=-1) / 4
+    degenerate = np.linalg.det(info) <= 1e-12 * scale ** 4
+    info[degenerate] = np.eye(4)
+    gdop = np.sqrt(np.trace(np.linalg.inv(info), axis1=-2, axis2=-1))
+    gdop[degenerate] = np.inf
+    return gdop.max(axis=1) if reduce == 'max' else gdop.mean(axis=1)
+
+
+def _masks(subsets, num_stations):
+    masks = np.zeros((len(subsets), num_stations))
+    np.put_along_axis(masks, np.asarray(subsets), 1.0, axis=1)
+    return masks
+
+
+def select_stations(stations, targets, k=4, top=10, method='auto', max_exhaustive=50000,
+                    chunk_size=4096, reduce='mean', max_rounds=100):
+    """
+    在目标区域上选择 GDOP 最小的 k 个监测点。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米），经纬度数据先用
+            ``project_stations`` 投影。
+        targets (ndarray): 形状为 (Q, 3) 的目标区域点。
+        k (int): 子集大小，至少为 4。
+        top (int): 返回的最优子集个数。
+        method (str): 'exhaustive'、'swap' 或 'auto'（子集数不超过 ``max_exhaustive`` 时穷举）。
+        max_exhaustive (int): 'auto' 模式下穷举的子集数上限。
+        chunk_size (int): 每批评价的子集数。
+        reduce (str): 目标点上的汇总方式，'mean' 或 'max'。
+        max_rounds (int): 交换搜索的最大轮数。
+
+    Returns:
+        SubsetSelection: 最优的若干子集及得分。
+    """
+    start = time.perf_counter()
+    stations = np.asarray(stations, dtype=float)
+    num_stations = len(stations)
+    outer = station_outer_products(stations, targets)
+    if method == 'auto':
+        method = 'exhaustive' if comb(num_stations, k) <= max_exhaustive else 'swap'
+
+    seen = {}
+    if method == 'exhaustive':
+        generator = combinations(range(num_stations), k)
+        while True:
+            chunk = np.array([c for _, c in zip(range(chunk_size), generator)], dtype=int)
+            if chunk.size == 0:
+                break
+            scores = gdop_scores(_masks(chunk, num_stations), outer, reduce)
+            # 只保留当前最好的 top 个，内存与子集总数无关
+            best = np.argsort(scores)[:top]
+            seen.update(zip(map(tuple, chunk[best]), scores[best]))
+            if len(seen) > 4 * top:
+                seen = dict(sorted(seen.items(), key=lambda item: item[1])[:top])
+        evaluated = comb(num_stations, k)
+    else:
+        evaluated = 0
+        # 贪心前向选择：每次加入使 GDOP 最小的监测点；不足 4 个时按信息矩阵迹挑选
+        current = []
+        while len(current) < k:
+            rest = np.setdiff1d(np.arange(num_stations), current)
+            candidates = np.column_stack([np.tile(current, (len(rest), 1)), rest]).astype(int)
+            masks = _masks(candidates, num_stations)
+            if len(current) + 1 < 4:
+                scores = -np.trace(outer[rest], axis1=-2, axis2=-1).sum(axis=1)
+            else:
+                scores = gdop_scores(masks, outer, reduce)
+            evaluated += len(rest)
+            current.append(int(rest[np.argmin(scores)]))
+        current = np.sort(current)
+        best_score = gdop_scores(_masks(current[None], num_stations), outer, reduce)[0]
+        seen[tuple(current)] = best_score
+
+        # 单点交换：一次评价全部 k × (N - k) 个邻居，取最好的改进
+        for _ in range(max_rounds):
+            rest = np.setdiff1d(np.arange(num_stations), current)
+            out_pos, new = np.meshgrid(np.arange(k), rest, indexing='ij')
+            neighbours = np.repeat(current[None], out_pos.size, axis=0)
+            neighbours[np.arange(out_pos.size), out_pos.ravel()] = new.ravel()
+            neighbours.sort(axis=1)
+            scores = np.concatenate([
+                gdop_scores(_masks(neighbours[i:i + chunk_size], num_stations), outer, reduce)
+                for i in range(0, len(neighbours), chunk_size)])
+            evaluated += len(neighbours)
+            order = np.argsort(scores)[:top]
+            seen.update(zip(map(tuple, neighbours[order]), scores[order]))
+            if scores[order[0]] >= best_score:
+                break
+            current, best_score = neighbours[order[0]], scores[order[0]]
+
+    ranked = sorted(seen.items(), key=lambda item: item[1])[:top]
+    return SubsetSelection(subsets=np.array([s for s, _ in ranked], dtype=int),
+                           scores=np.array([score for _, score in ranked]),
+                           method=method, evaluated=evaluated,
+                           elapsed=time.perf_counter() - start)
@@ -0,0 +1,201 @@
+"""
+可复现的合成负载：监测网、残骸轨迹、音爆事件和带噪声的拾取，按块流式生成。
+
+``problem2`` 的模拟数据用未设种子的全局 ``np.random`` 在内存中生成
+（``np.random.rand(num_debris, 3) * 1000``、随机挑选的监测点子集），每次运行后即丢弃。
+这里在 ``arrival_times`` 正演模型上生成：
+
+- 监测网：监测网中心附近均匀分布的监测点，以经纬度保存，可选每个监测点一个时钟偏差；
+- 残骸轨迹：高空起始、水平速度随机，按匀速加重力下落，每条轨迹间隔若干秒产生几次音爆；
+- 拾取：真实到达时间加高斯噪声，按概率缺失，少量拾取加上大的随机偏移作为离群值。
+
+第 k 块的随机数由 ``SeedSequence(seed, spawn_key=(1, k))`` 生成，与其他块无关：
+相同的种子和块大小总是得到相同的数据，各块也可以分开生成。结果可以写成 ``columnar``
+格式（附带真实音爆源、轨迹编号和离群标记），或以定位服务的 JSON 行协议按给定速率输出。
+"""
+import json
+import math
+import sys
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import v_sound, arrival_times
+from .geometry import LocalFrame, project_stations
+
+
+class WorkloadChunk(NamedTuple):
+    """一块合成事件，坐标为局部米制坐标。"""
+    start: int  # 第一个事件的全局编号
+    times: np.ndarray  # (K, N) 拾取时间，缺失为 NaN
+    sources: np.ndarray  # (K, 4) 真实的 (x, y, z, t)
+    track: np.ndarray  # (K,) 所属轨迹编号
+    outliers: np.ndarray  # (K, N) 是否为离群拾取
+
+
+class SyntheticWorkload:
+    """
+    合成负载生成器。
+
+    Args:
+        num_stations (int): 监测点数。
+        seed (int): 随机种子。
+        extent (float): 监测网的水平范围（米），监测点分布在边长为 ``extent`` 的正方形内。
+        origin (tuple): 监测网中心的 (经度, 纬度)。
+        v (float): 声速。
+        booms_per_track (int): 每条残骸轨迹的音爆次数。
+        boom_interval (tuple): 同一轨迹相邻两次音爆的时间间隔范围（秒）。
+        altitude (tuple): 轨迹起始高程范围（米）。
+        speed (tuple): 初始水平速度范围（m/s）。
+        event_rate (float): 模拟时间内平均每秒的音爆数，决定事件发生时间的疏密。
+        noise_std (float): 拾取噪声的标准差（秒）。
+        missing (float): 每个拾取缺失的概率。
+        outliers (float): 每个拾取为离群值的概率。
+        outlier_scale (float): 离群偏移的最大绝对值（秒），在 ±outlier_scale 内均匀分布。
+        clock_std (float): 各监测点时钟偏差的标准差（秒），0 表示没有偏差。
+        gravity (float): 重力加速度。
+    """
+
+    def __init__(self, num_stations=20, seed=0, extent=60000.0, origin=(110.5, 27.5), v=v_sound,
+                 booms_per_track=4, boom_interval=(5.0, 60.0), altitude=(10000.0, 20000.0),
+                 speed=(50.0, 400.0), event_rate=10.0, noise_std=0.05, missing=0.1,
+                 outliers=0.01, outlier_scale=5.0, clock_std=0.0, gravity=9.81):
+        self.seed = seed
+        self.v = v
+        self.extent = extent
+        self.booms_per_track = booms_per_track
+        self.boom_interval = boom_interval
+        self.altitude = altitude
+        self.speed = speed
+        self.event_rate = event_rate
+        self.noise_std = noise_std
+        self.missing = missing
+        self.outliers = outliers
+        self.outlier_scale = outlier_scale
+        self.clock_std = clock_std
+        self.gravity = gravity
+
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,)))
+        local = np.column_stack([rng.uniform(-extent / 2, extent / 2, (num_stations, 2)),
+                                 rng.uniform(200.0, 1000.0, num_stations)])
+        self.names = [f'S{i:03d}' for i in range(num_stations)]
+        self.stations = LocalFrame(origin[0], origin[1], 0.0).to_geodetic(local)
+        # 到达时间在求解器使用的同一个局部坐标系中计算，保证真实值与求解结果可比
+        self.frame, self.local = project_stations(self.stations)
+        self.clock_bias = rng.normal(0.0, clock_std, num_stations) if clock_std else np.zeros(
+            num_stations)
+
+    def metadata(self):
+        """生成参数和真实时钟偏差，随数据一起保存。"""
+        return {
+            'generator': 'sonicboom.synthetic', 'seed': self.seed, 'extent': self.extent,
+            'booms_per_track': self.booms_per_track, 'boom_interval': list(self.boom_interval),
+            'altitude': list(self.altitude), 'speed': list(self.speed),
+            'event_rate': self.event_rate, 'noise_std': self.noise_std, 'missing': self.missing,
+            'outliers': self.outliers, 'outlier_scale': self.outlier_scale,
+            'clock_std': self.clock_std, 'gravity': self.gravity,
+            'clock_bias': self.clock_bias.tolist(),
+        }
+
+    def chunk(self, index, size):
+        """
+        生成第 ``index`` 块，包含 ``size`` 个事件。
+
+        Args:
+            index (int): 块编号。
+            size (int): 每块的事件数。
+
+        Returns:
+            WorkloadChunk: 按发生时间排序的事件。
+        """
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(1, index)))
+        booms = self.booms_per_track
+        num_tracks = -(-size // booms)
+        # 本块的轨迹在模拟时间 [index, index + 1) × size / event_rate 内开始
+        span = size / self.event_rate
+        start = rng.uniform(index * span, (index + 1) * span, num_tracks)
+        position = np.column_stack([rng.uniform(-self.extent / 2, self.extent / 2, (num_tracks, 2)),
+                                    rng.uniform(*self.altitude, num_tracks)])
+        heading = rng.uniform(0.0, 2 * np.pi, num_tracks)
+        speed = rng.uniform(*self.speed, num_tracks)
+        velocity = np.column_stack([speed * np.cos(heading), speed * np.sin(heading),
+                                    np.zeros(num_tracks)])
+
+        # 每条轨迹的音爆时刻：相对起始时间的累积间隔，第一次音爆在起始时刻
+        gaps = rng.uniform(*self.boom_interval, (num_tracks, booms))
+        gaps[:, 0] = 0.0
+        elapsed = np.cumsum(gaps, axis=1)  # (T, B)
+        sources = np.empty((num_tracks, booms, 4))
+        sources[..., :3] = position[:, None] + velocity[:, None] * elapsed[..., None]
+        sources[..., 2] -= 0.5 * self.gravity * elapsed ** 2
+        # 落到低于起始高程下限一半的音爆抬到该高度，避免穿过地面
+        sources[..., 2] = np.maximum(sources[..., 2], self.altitude[0] / 2)
+        sources[..., 3] = start[:, None] + elapsed
+        track = np.repeat(index * num_tracks + np.arange(num_tracks), booms)
+        sources, track = sources.reshape(-1, 4)[:size], track[:size]
+        order = np.argsort(sources[:, 3], kind='stable')
+        sources, track = sources[order], track[order]
+
+        times = arrival_times(sources, self.local, self.v) + self.clock_bias
+        times += rng.normal(0.0, self.noise_std, times.shape)
+        outliers = rng.random(times.shape) < self.outliers
+        times[outliers] += rng.uniform(-self.outlier_scale, self.outlier_scale,
+                                       np.count_nonzero(outliers))
+        missing = rng.random(times.shape) < self.missing
+        times[missing] = np.nan
+        return WorkloadChunk(start=index * size, times=times, sources=sources, track=track,
+                             outliers=outliers & ~missing)
+
+    def chunks(self, num_events, size=65536):
+        """依次生成共 ``num_events`` 个事件的各块。"""
+        for index in range(-(-num_events // size)):
+            chunk = self.chunk(index, size)
+            keep = min(size, num_events - index * size)
+            if keep < size:
+                chunk = WorkloadChunk(chunk.start, chunk.times[:keep], chunk.sources[:keep],
+                                      chunk.track[:keep], chunk.outliers[:keep])
+            yield chunk
+
+    def write(self, path, num_events, size=65536):
+        """
+        写成 ``columnar`` 格式。真实音爆源以 (经度, 纬度, 高程, 时间) 保存在 ``sources`` 列，
+        另有 ``track``、``outliers`` 两列，生成参数和时钟偏差保存在 ``metadata`` 中。
+
+        Args:
+            path (str | Path): 输出目录。
+            num_events (int): 事件总数。
+            size (int): 每块的事件数，与种子一起决定生成的数据。
+        """
+        from .columnar import EventWriter
+
+        metadata = dict(self.metadata(), chunk_size=size)
+        with EventWriter(path, self.names, self.stations, self.v, metadata=metadata) as writer:
+            for chunk in self.chunks(num_events, size):
+                writer.append(chunk.times, sources=self.frame.to_geodetic(chunk.sources),
+                              track=chunk.track, outliers=chunk.outliers)
+
+    def stream(self, num_events, size=65536, rate=None, output=None):
+        """
+        以定位服务的 JSON 行协议输出，每个事件一行 ``{"event": i, "arrivals": {...}}``，
+        缺失的拾取不出现。
+
+        Args:
+            num_events (int): 事件总数。
+            size (int): 每块的事件数。
+            rate (float): 每秒输出的事件数，None 表示不限速。
+            output (file): 输出的文本文件，默认为标准输出。
+        """
+        output = output or sys.stdout
+        begin = time.perf_counter()
+        for chunk in self.chunks(num_events, size):
+            for offset, row in enumerate(chunk.times.tolist()):
+                event = chunk.start + offset
+                if rate:
+                    delay = begin + event / rate - time.perf_counter()
+                    if delay > 0:
+                        output.flush()
+                        time.sleep(delay)
+                arrivals = {name: value for name, value in zip(self.names, row) if not math.isnan(value)}
+                output.write(json.dumps({'event': event, 'arrivals': arrivals}) + '\n')
+        output.flush()
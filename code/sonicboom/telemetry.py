@@ -0,0 +1,288 @@
+"""
+求解过程的计数、计时和结构化记录。
+
+各脚本调用 ``minimize``/``least_squares`` 后只看结果，``3-3`` 失败时也只打印
+"Optimization failed."。本模块给本包的求解器和残差函数加上计数器与计时器：
+未启用时每次调用只多一次 ``None`` 判断；在 ``with Telemetry(...)`` 内，
+每次求解输出一条汇总记录，失败或迭代次数过多的事件逐条输出，
+退出时输出计数器和计时器的总计。记录为 JSON 行，每行一个对象，``kind`` 字段区分类型。
+
+可选的采样分析器用 ``SIGPROF`` 定时中断，统计本包内最内层栈帧的位置，
+用来查看残差等热点函数的耗时分布；只能在主线程的 Unix 进程中使用。
+蒙特卡洛等在子进程中运行的求解不会被记录。
+"""
+import functools
+import json
+import os
+import signal
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+
+import numpy as np
+
+# 当前启用的记录器，None 表示未启用
+_active = None
+
+# 是否已在某个被记录的求解器内部：内层求解器（如 solve_robust 调用的 solve_batch）
+# 只累计计时，不再输出 solve 记录，避免同一次求解被记录多次
+_inside = ContextVar('sonicboom_telemetry_inside', default=False)
+
+_package_dir = str(Path(__file__).resolve().parent)
+
+
+def active():
+    """当前启用的 ``Telemetry``，未启用时为 None。"""
+    return _active
+
+
+def _plain(value):
+    """把 NumPy 标量和数组转换成可 JSON 序列化的值。"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class SamplingProfiler:
+    """
+    定时采样当前的调用栈，按本包内最内层栈帧的位置计数。
+
+    Args:
+        interval (float): 采样间隔（秒，进程 CPU 时间）。
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._previous = None
+
+    def _sample(self, signum, frame):
+        while frame is not None and not frame.f_code.co_filename.startswith(_package_dir):
+            frame = frame.f_back
+        if frame is None:
+            self.samples['<其他>'] += 1
+        else:
+            code = frame.f_code
+            self.samples[f'{Path(code.co_filename).name}:{frame.f_lineno} {code.co_name}'] += 1
+
+    def start(self):
+        self._previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous or signal.SIG_DFL)
+
+    def top(self, count=20):
+        """采样数最多的若干位置。"""
+        return [{'location': location, 'samples': samples}
+                for location, samples in self.samples.most_common(count)]
+
+
+class Telemetry:
+    """
+    计数、计时并输出 JSON 行记录。
+
+    Args:
+        sink (str | Path | file): 输出文件路径或已打开的文本文件；None 表示只保存在 ``records`` 中。
+        events (str): 逐事件记录的范围：'none'、'failed'（失败或迭代过多的事件）或 'all'。
+        slow_nfev (int): 残差函数调用次数不少于该值的事件视为迭代过多。
+        profile_interval (float): 若给出，启用采样分析器，单位为秒。
+    """
+
+    def __init__(self, sink=None, events='failed', slow_nfev=None, profile_interval=None):
+        self.events = events
+        self.slow_nfev = slow_nfev
+        self.records = []
+        self.counters = Counter()
+        self.timers = defaultdict(lambda: [0, 0.0])
+        self.calls = 0
+        self.profiler = SamplingProfiler(profile_interval) if profile_interval else None
+        self._owned = isinstance(sink, (str, Path))
+        self._sink = open(sink, 'a', encoding='utf-8') if self._owned else sink
+        self._previous = None
+
+    def emit(self, kind, **fields):
+        """输出一条记录。"""
+        record = {'kind': kind, 'time': time.time(), **fields}
+        if self._sink is None:
+            self.records.append(record)
+        else:
+            self._sink.write(json.dumps(record, ensure_ascii=False, default=_plain) + '\n')
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def add_time(self, name, elapsed):
+        timer = self.timers[name]
+        timer[0] += 1
+        timer[1] += elapsed
+
+    @contextmanager
+    def timer(self, name):
+        """累计一段代码的调用次数和耗时。"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def solver_call(self, name, result, elapsed):
+        """
+        记录一次求解：一条汇总记录，以及按 ``events`` 筛选的逐事件记录。
+
+        ``result`` 可以是本包的 ``BatchSolution``、``JointSolution``、``RobustSolution``，
+        也可以是 SciPy 的 ``OptimizeResult``，取其中的 nfev、nit、status、success、cost 字段。
+        """
+        self.calls += 1
+        self.add_time(name, elapsed)
+        fields = {}
+        for key in ('nfev', 'nit', 'status', 'success', 'cost'):
+            value = getattr(result, key, None)
+            if value is None and isinstance(result, dict):
+                value = result.get(key)
+            if value is not None and not callable(value):
+                fields[key] = np.asarray(value)
+
+        success = fields.get('success')
+        per_event = success is not None and success.ndim == 1
+        summary = {'solver': name, 'call': self.calls, 'elapsed': elapsed}
+        if per_event:
+            summary['events'] = len(success)
+            summary['success_rate'] = float(success.mean()) if len(success) else None
+            for key in ('nfev', 'nit'):
+                if key in fields:
+                    summary[key + '_mean'] = float(fields[key].mean()) if fields[key].size else None
+                    summary[key + '_max'] = int(fields[key].max()) if fields[key].size else None
+            if 'cost' in fields and fields['cost'].size:
+                summary['cost_median'] = float(np.median(fields['cost']))
+        else:
+            summary.update({key: value.item() if value.ndim == 0 else value
+                            for key, value in fields.items()})
+        self.emit('solve', **summary)
+
+        if not per_event or self.events == 'none':
+            return
+        selected = np.ones(len(success), dtype=bool) if self.events == 'all' else ~success
+        if self.slow_nfev is not None and 'nfev' in fields:
+            selected |= fields['nfev'] >= self.slow_nfev
+        for index in np.flatnonzero(selected):
+            self.emit('event', solver=name, call=self.calls, event=int(index),
+                      **{key: value[index].item() for key, value in fields.items()
+                         if value.ndim == 1})
+
+    def summary(self):
+        """输出计数器和计时器的总计。"""
+        self.emit('summary', counters=dict(self.counters),
+                  timers={name: {'calls': calls, 'elapsed': total}
+                          for name, (calls, total) in self.timers.items()})
+        if self.profiler is not None:
+            self.emit('profile', interval=self.profiler.interval, top=self.profiler.top())
+
+    def __enter__(self):
+        global _active
+        self._previous, _active = _active, self
+        if self.profiler is not None:
+            self.profiler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+        if self.profiler is not None:
+            self.profiler.stop()
+        _active = self._previous
+        self.summary()
+        if self._owned:
+            self._sink.close()
+        elif self._sink is not None:
+            self._sink.flush()
+
+
+def instrument(name):
+    """
+    求解器装饰器：启用记录时计时并调用 ``Telemetry.solver_call``。
+    嵌套在另一个被记录的求解器内的调用只计入计时器。
+
+    Args:
+        name (str): 记录中的求解器名称。
+    """
+    def decorator(solver):
+        @functools.wraps(solver)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return solver(*args, **kwargs)
+            telemetry = _active
+            outer = not _inside.get()
+            token = _inside.set(True)
+            start = time.perf_counter()
+            try:
+                result = solver(*args, **kwargs)
+            finally:
+                _inside.reset(token)
+            elapsed = time.perf_counter() - start
+            if outer:
+                telemetry.solver_call(name, result, elapsed)
+            else:
+                telemetry.add_time(name, elapsed)
+            return result
+        return wrapper
+    return decorator
+
+
+def hot_path(name):
+    """
+    残差等热点函数的装饰器：启用记录时累计调用次数、计算的行数和耗时。
+
+    Args:
+        name (str): 计数器和计时器的名称。
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(sources, *args, **kwargs):
+            if _active is None:
+                return function(sources, *args, **kwargs)
+            telemetry = _active
+            start = time.perf_counter()
+            result = function(sources, *args, **kwargs)
+            telemetry.add_time(name, time.perf_counter() - start)
+            telemetry.count(name + '.rows', int(np.prod(np.shape(sources)[:-1])))
+            return result
+        return wrapper
+    return decorator
+
+
+def traced(name, solver):
+    """
+    包装一个 SciPy 风格的求解函数（如各脚本中的 ``least_squares``），
+    使其调用也进入当前的记录。
+
+    Args:
+        name (str): 记录中的求解器名称。
+        solver (callable): 返回 ``OptimizeResult`` 的函数。
+
+    Returns:
+        callable: 包装后的函数。
+    """
+    return instrument(name)(solver)
+
+
+def open_telemetry(path, **kwargs):
+    """命令行使用的便捷函数：路径为 '-' 时写到标准错误。"""
+    return Telemetry(sys.stderr if str(path) == '-' else path, **kwargs)
+
+
+def telemetry_from_env(**kwargs):
+    """
+    各脚本使用的便捷函数：环境变量 ``SONICBOOM_TELEMETRY`` 给出路径时启用记录，
+    否则返回空的上下文管理器。
+
+    Args:
+        **kwargs: 传给 ``Telemetry`` 的其他参数。
+    """
+    path = os.environ.get('SONICBOOM_TELEMETRY')
+    return open_telemetry(path, **kwargs) if path else nullcontext()
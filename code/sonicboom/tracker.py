@@ -0,0 +1,164 @@
+"""
+下落残骸的逐次跟踪（迭代扩展卡尔曼滤波）。
+
+``3-1``/``3-3`` 把同一残骸的四次音爆当作互相独立的定位，或者当作同一个静止位置。
+实际中音爆依次到达，来自同一个下落的残骸。这里用弹道运动模型（匀速加重力，
+白噪声加速度作为过程噪声）描述残骸的状态 (x, y, z, vx, vy, vz)，
+每收到一组监测点到达时间就做一次更新，只用上一次的状态和协方差，
+计算量与历史长度无关。
+
+每次音爆的发生时刻 τ 未知：先把状态外推到预测的发生时刻 t̂，
+再把 τ 作为第 7 个分量加入状态，残骸在 τ 时的位置为 p + u(τ - t̂) - g(τ - t̂)²/2 ê_z，
+量测方程就是 ``arrival_times``，雅可比矩阵由 ``jacobian_columns`` 按链式法则得到。
+迭代几次高斯-牛顿步后，把后验状态换算到 τ 时刻。
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from .forward import v_sound, arrival_times, jacobian_columns
+from .solvers import solve_batch
+
+
+class TrackState(NamedTuple):
+    """一次更新后的跟踪状态。"""
+    time: float  # 最近一次音爆的发生时刻
+    state: np.ndarray  # (6,) 位置和速度
+    covariance: np.ndarray  # (6, 6) 状态协方差
+    innovation: float  # 归一化新息平方（NIS），用于发现异常量测
+    stations: int  # 本次使用的监测点数
+
+
+class BallisticTracker:
+    """
+    弹道运动模型的迭代扩展卡尔曼滤波跟踪器。
+
+    Args:
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米）。
+        v (float | SoundSpeedProfile): 声速或声速剖面。
+        error_std (float): 到达时间误差的标准差（秒）。
+        acceleration_std (float): 过程噪声的加速度谱密度平方根（m/s^1.5），
+            描述空气阻力、风等未建模的加速度。
+        gravity (float): 重力加速度，0 表示匀速模型。
+        velocity_std (float): 第一次定位时速度的先验标准差（m/s）。
+        iterations (int): 每次更新的高斯-牛顿迭代次数。
+    """
+
+    def __init__(self, stations, v=v_sound, error_std=0.5, acceleration_std=5.0, gravity=9.81,
+                 velocity_std=300.0, iterations=5):
+        self.stations = np.asarray(stations, dtype=float)
+        self.v = v
+        self.error_std = error_std
+        self.acceleration_std = acceleration_std
+        self.gravity = gravity
+        self.velocity_std = velocity_std
+        self.iterations = iterations
+        self.last = None
+
+    def _propagate(self, state, dt):
+        """状态外推 dt 秒，返回新状态和状态转移矩阵。"""
+        transition = np.eye(6)
+        transition[:3, 3:] = dt * np.eye(3)
+        moved = transition @ state
+        moved[2] -= 0.5 * self.gravity * dt ** 2
+        moved[5] -= self.gravity * dt
+        return moved, transition
+
+    def _process_noise(self, dt):
+        """白噪声加速度模型的离散过程噪声。"""
+        q = self.acceleration_std ** 2
+        dt = abs(dt)
+        block = q * np.array([[dt ** 3 / 3, dt ** 2 / 2], [dt ** 2 / 2, dt]])
+        return np.kron(block, np.eye(3))
+
+    def predict(self, time):
+        """
+        预测 ``time`` 时刻的状态。
+
+        Returns:
+            tuple: (形状为 (6,) 的状态, 形状为 (6, 6) 的协方差)。
+        """
+        if self.last is None:
+            raise RuntimeError('跟踪器尚未初始化')
+        dt = time - self.last.time
+        state, transition = self._propagate(self.last.state, dt)
+        covariance = transition @ self.last.covariance @ transition.T + self._process_noise(dt)
+        return state, covariance
+
+    def _initialize(self, times, mask):
+        fix = solve_batch(times[None], self.stations, initial_guess='closed_form', v=self.v)
+        x = fix.x[0]
+        jac = jacobian_columns(x[None], self.stations[mask], self.v)[0]  # (4, n)
+        # 第一次定位的位置协方差取线性化的 Cramér–Rao 界
+        covariance = self.error_std ** 2 * np.linalg.pinv(jac @ jac.T)
+        state = np.concatenate([x[:3], np.zeros(3)])
+        prior = np.zeros((6, 6))
+        prior[:3, :3] = covariance[:3, :3]
+        prior[3:, 3:] = self.velocity_std ** 2 * np.eye(3)
+        residual = fix.fun[0][mask] / self.error_std
+        self.last = TrackState(time=float(x[3]), state=state, covariance=prior,
+                               innovation=float(residual @ residual), stations=int(mask.sum()))
+        return self.last
+
+    def update(self, times):
+        """
+        用一组到达时间更新跟踪状态，第一次调用时用单次定位初始化。
+
+        Args:
+            times (ndarray): 形状为 (N,) 的到达时间，缺失值为 NaN。
+
+        Returns:
+            TrackState: 更新后的状态。
+        """
+        times = np.asarray(times, dtype=float)
+        mask = np.isfinite(times)
+        if self.last is None:
+            return self._initialize(times, mask)
+        observed, stations = times[mask], self.stations[mask]
+
+        # 预测的发生时刻：使到达时间残差均值为零的不动点
+        guess = self.last.time
+        for _ in range(3):
+            state, _ = self.predict(guess)
+            travel = arrival_times(np.append(state[:3], 0.0), stations, self.v)
+            guess = float(np.mean(observed - travel))
+        prior_state, prior_covariance = self.predict(guess)
+
+        # 增广状态 (x, y, z, vx, vy, vz, τ)，τ 的先验取一个很宽的分布
+        prior = np.append(prior_state, guess)
+        covariance = np.zeros((7, 7))
+        covariance[:6, :6] = prior_covariance
+        covariance[6, 6] = 1e6
+        noise = self.error_std ** 2 * np.eye(len(observed))
+        estimate = prior.copy()
+        for _ in range(self.iterations):
+            dt = estimate[6] - guess
+            position = (estimate[:3] + estimate[3:6] * dt
+                        - np.array([0.0, 0.0, 0.5 * self.gravity * dt ** 2]))
+            velocity = estimate[3:6] - np.array([0.0, 0.0, self.gravity * dt])
+            source = np.append(position, estimate[6])
+            columns = jacobian_columns(source[None], stations, self.v)[0]  # (4, n)
+            jac = np.empty((len(observed), 7))
+            jac[:, :3] = columns[:3].T
+            jac[:, 3:6] = columns[:3].T * dt
+            jac[:, 6] = columns[:3].T @ velocity + columns[3]
+            predicted = arrival_times(source, stations, self.v)
+            # 迭代扩展卡尔曼滤波：在当前估计处线性化，相对先验求增益
+            innovation = observed - predicted - jac @ (prior - estimate)
+            system = jac @ covariance @ jac.T + noise
+            gain = np.linalg.solve(system, jac @ covariance).T
+            estimate = prior + gain @ innovation
+
+        posterior = (np.eye(7) - gain @ jac) @ covariance
+        # 把状态从 t̂ 换算到估计的发生时刻 τ
+        dt = estimate[6] - guess
+        state, transition = self._propagate(estimate[:6], dt)
+        mapping = np.zeros((6, 7))
+        mapping[:, :6] = transition
+        mapping[:3, 6] = state[3:]
+        mapping[5, 6] = -self.gravity
+        self.last = TrackState(time=float(estimate[6]), state=state,
+                               covariance=mapping @ posterior @ mapping.T,
+                               innovation=float(innovation @ np.linalg.solve(system, innovation)),
+                               stations=len(observed))
+        return self.last
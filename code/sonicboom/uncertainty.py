@@ -0,0 +1,140 @@
+"""
+线性化的定位不确定度：由解处的雅可比矩阵直接给出协方差和置信椭球。
+
+``problem4/4-1问题四求解.py`` 为估计到达时间误差的影响，对每个音爆源加噪声后
+重新求解 100 次，最后只报告均值。到达时间误差独立、服从 N(0, σ²) 时，
+解附近的线性化协方差为 (Jᵀ W J)⁻¹，W = diag(1/σ_n²)，J 为到达时间对
+(x, y, z, t) 的雅可比矩阵（``jacobian_columns``，声速剖面同样适用）。
+所有事件的 4×4 信息矩阵和求逆一次批量完成，代价与一次迭代相当；
+缺失的拾取不参与计算。``precision.crb_covariance`` 是同一公式在网格点上的版本。
+
+需要时可以抽取少量事件做缩减的蒙特卡洛，检查线性化在远场、几何较差处是否仍然可靠。
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .forward import v_sound, jacobian_columns, leftovers_batch
+from .precision import _inverse
+
+
+class Uncertainty(NamedTuple):
+    """各事件解的不确定度，位置单位为米、时间单位为秒。"""
+    covariance: np.ndarray  # (E, 4, 4) (x, y, z, t) 的协方差，几何退化处为 inf
+    std: np.ndarray  # (E, 4) 标准差
+    radii: np.ndarray  # (E, 3) 位置置信椭球的半轴长度，从小到大
+    axes: np.ndarray  # (E, 3, 3) 半轴方向，第 k 列对应 radii[:, k]
+    confidence: float  # 置信椭球的置信水平
+    validated: Optional[np.ndarray]  # (K,) 做了蒙特卡洛检验的事件编号
+    monte_carlo_std: Optional[np.ndarray]  # (K, 4) 蒙特卡洛得到的标准差
+
+
+def _confidence_scale(confidence, dof=3):
+    """χ² 分布的分位数的平方根：标准差到置信椭球半轴的倍数。"""
+    from scipy.stats import chi2
+
+    return float(np.sqrt(chi2.ppf(confidence, dof)))
+
+
+def _residual_variance(sources, stations, times, mask, v):
+    """由残差估计的逐事件到达时间方差，拾取不超过 4 个的事件为 inf。"""
+    residual = np.where(mask, leftovers_batch(sources, stations, np.where(mask, times, 0.0), v), 0.0)
+    dof = mask.sum(axis=1) - 4
+    return np.divide(np.sum(residual ** 2, axis=1), dof, out=np.full(len(sources), np.inf),
+                     where=dof > 0)
+
+
+def linearized_covariance(sources, stations, times=None, error_std=0.5, v=v_sound):
+    """
+    解处 (x, y, z, t) 的线性化协方差。
+
+    Args:
+        sources (ndarray): 形状为 (E, 4) 的解（米、秒）。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米）。
+        times (ndarray): 形状为 (E, N) 的到达时间，只用来确定缺失的拾取（NaN）；
+            ``error_std`` 为 None 时还用来计算残差。
+        error_std (float | ndarray | None): 到达时间误差的标准差，标量或形状为 (N,) 的逐监测点值；
+            None 表示由各事件的残差估计，即以 残差平方和 / (拾取数 - 4) 作为方差。
+        v (float | SoundSpeedProfile): 声速或声速剖面。
+
+    Returns:
+        ndarray: 形状为 (E, 4, 4) 的协方差，拾取不足或几何退化的事件为 inf。
+    """
+    sources = np.atleast_2d(np.asarray(sources, dtype=float))
+    stations = np.asarray(stations, dtype=float)
+    columns = jacobian_columns(sources, stations, v)  # (E, 4, N)
+    mask = (np.ones((len(sources), len(stations)), dtype=bool) if times is None
+            else np.isfinite(np.atleast_2d(times)))
+    if error_std is None:
+        if times is None:
+            raise ValueError('由残差估计误差时需要给出到达时间')
+        weight = mask / _residual_variance(sources, stations, times, mask, v)[:, None]
+    else:
+        weight = mask / np.broadcast_to(np.asarray(error_std, dtype=float) ** 2, (len(stations),))
+    info = columns @ np.swapaxes(columns * weight[:, None, :], 1, 2)
+
+    # 位置和时间的量级相差约 v 倍，先按对角元归一化再判断退化、求逆
+    diagonal = np.sqrt(np.diagonal(info, axis1=1, axis2=2))
+    scale = np.divide(1.0, diagonal, out=np.zeros_like(diagonal), where=diagonal > 0)
+    normalized = info * scale[:, :, None] * scale[:, None, :]
+    normalized[np.any(diagonal == 0, axis=1) | ~np.all(np.isfinite(normalized), axis=(1, 2))] = 0.0
+    inverse, degenerate = _inverse(normalized)
+    covariance = inverse * scale[:, :, None] * scale[:, None, :]
+    covariance[degenerate] = np.inf
+    return covariance
+
+
+def linearized_uncertainty(sources, stations, times=None, error_std=0.5, v=v_sound,
+                           confidence=0.95, validate=0, num_trials=200, seed=None):
+    """
+    各事件的线性化协方差和位置置信椭球，可选用缩减的蒙特卡洛检验。
+
+    Args:
+        sources (ndarray): 形状为 (E, 4) 的解（米、秒）。
+        stations (ndarray): 形状为 (N, 3) 的监测点坐标（米）。
+        times (ndarray): 形状为 (E, N) 的到达时间；蒙特卡洛检验时必须给出。
+        error_std (float | ndarray | None): 见 ``linearized_covariance``。
+        v (float | SoundSpeedProfile): 声速或声速剖面。
+        confidence (float): 置信椭球的置信水平。
+        validate (int): 随机抽取做蒙特卡洛检验的事件数，0 表示不检验。
+        num_trials (int): 每个检验事件的蒙特卡洛试验次数。
+        seed (int): 抽样和噪声的随机种子。
+
+    Returns:
+        Uncertainty: 协方差、标准差、置信椭球及检验结果。
+    """
+    sources = np.atleast_2d(np.asarray(sources, dtype=float))
+    covariance = linearized_covariance(sources, stations, times, error_std, v)
+    std = np.sqrt(np.diagonal(covariance, axis1=1, axis2=2))
+
+    position = covariance[:, :3, :3]
+    finite = np.all(np.isfinite(position), axis=(1, 2))
+    variance = np.full((len(sources), 3), np.inf)
+    axes = np.broadcast_to(np.eye(3), (len(sources), 3, 3)).copy()
+    variance[finite], axes[finite] = np.linalg.eigh(position[finite])
+    radii = _confidence_scale(confidence) * np.sqrt(np.maximum(variance, 0.0))
+
+    validated = monte_carlo_std = None
+    if validate:
+        if times is None:
+            raise ValueError('蒙特卡洛检验需要给出到达时间')
+        from .montecarlo import monte_carlo
+
+        times = np.atleast_2d(np.asarray(times, dtype=float))
+        seeds = np.random.SeedSequence(seed).spawn(2)
+        rng = np.random.default_rng(seeds[0])
+        validated = np.sort(rng.choice(len(sources), size=min(validate, len(sources)),
+                                       replace=False))
+        # 蒙特卡洛引擎只支持统一的噪声水平：逐监测点的误差或由残差估计的误差取均方根
+        if error_std is None:
+            variance = _residual_variance(sources[validated], stations, times[validated],
+                                          np.isfinite(times[validated]), v)
+            noise = float(np.sqrt(np.mean(variance[np.isfinite(variance)])))
+        else:
+            noise = float(np.sqrt(np.mean(np.asarray(error_std, dtype=float) ** 2)))
+        summary = monte_carlo(times[validated], stations, error_std=noise, num_trials=num_trials,
+                              seed=int(seeds[1].generate_state(1)[0]), workers=1, initial_guess=sources[validated], v=v)
+        monte_carlo_std = summary.std
+    return Uncertainty(covariance=covariance, std=std, radii=radii, axes=axes,
+                       confidence=confidence, validated=validated,
+                       monte_carlo_std=monte_carlo_std)
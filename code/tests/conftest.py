@@ -0,0 +1,5 @@
+"""测试从任意目录运行时都能导入 ``code`` 目录下的 ``sonicboom``。"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
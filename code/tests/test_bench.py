@@ -0,0 +1,15 @@
+"""基准测试中各脚本求解路径的正确性。"""
+import numpy as np
+import pytest
+
+from sonicboom.bench import solvers, synthetic_dataset
+from sonicboom.solvers import default_initial_guess
+
+
+@pytest.mark.parametrize('name', ['script-3-1', 'script-4-1'])
+def test_script_recovers_synthetic_sources(name):
+    stations, sources, times = synthetic_dataset(7, 8, error_std=0.0, seed=0)
+    estimates, _ = solvers[name](stations, times, default_initial_guess(stations, times), 340)
+    np.testing.assert_allclose(estimates[:, :3], sources[:, :3], atol=1e-3)
+    # 4-1 的 time_error_param 与 t 合并后才是发生时间
+    np.testing.assert_allclose(estimates[:, 3], sources[:, 3], atol=1e-6)
@@ -0,0 +1,31 @@
+"""走时网格初值搜索。"""
+import numpy as np
+import pytest
+
+from sonicboom.bench import synthetic_dataset
+from sonicboom.solvers import solve_batch
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('SONICBOOM_CACHE', str(tmp_path))
+
+
+def wrong_basin(solution, sources, tolerance=1000):
+    return int(np.sum(np.linalg.norm(solution.x[:, :3] - sources[:, :3], axis=1) > tolerance))
+
+
+def test_grid_seed_does_not_add_wrong_basins():
+    # 这组数据中有事件的最优粗网格点落在监测点高程上，由此出发会收敛到地面以下的镜像解
+    stations, sources, times = synthetic_dataset(10, 2000, error_std=0.05, seed=2)
+    default = solve_batch(times, stations, v=340)
+    grid = solve_batch(times, stations, initial_guess='grid', v=340)
+    assert wrong_basin(grid, sources) <= wrong_basin(default, sources)
+    assert np.all(grid.x[:, 2] > stations[:, 2].max())
+
+
+@pytest.mark.parametrize('initial_guess', [None, 'closed_form', 'grid'])
+def test_solve_batch_without_events(initial_guess):
+    stations, _, _ = synthetic_dataset(6, 1)
+    solution = solve_batch(np.empty((0, 6)), stations, initial_guess=initial_guess, v=340)
+    assert solution.x.shape == (0, 4)
@@ -0,0 +1,51 @@
+"""微批次定位服务的消息处理。"""
+import asyncio
+import json
+
+import numpy as np
+
+from sonicboom import LocalizationService, arrival_times, load_dataset, project_stations
+
+
+def exchange(messages, replies):
+    """启动服务，在一个连接上依次发送消息并读取 ``replies`` 行回复。"""
+    dataset = load_dataset('problem4')
+    _, local = project_stations(dataset.stations)
+    times = arrival_times(np.array([1000.0, 2000.0, 9000.0, 5.0]), local, dataset.v).tolist()
+    picks = dict(zip(dataset.names, times))
+
+    async def run():
+        service = LocalizationService(dataset.stations, dataset.names, dataset.v, workers=0)
+        server = await service.start(port=0)
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        lines = []
+        for message in messages(picks):
+            writer.write((json.dumps(message) + '\n').encode())
+            await writer.drain()
+            # 等上一条消息触发的求解写回，保证迟到的拾取在事件完成之后到达
+            await asyncio.sleep(0.1)
+        for _ in range(replies):
+            lines.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+        writer.close()
+        server.close()
+        service.close()
+        return lines
+
+    return asyncio.run(run())
+
+
+def test_late_picks_after_completion_are_rejected():
+    def messages(picks):
+        # 迟到的拾取足够定位，若开始新事件会得到第二个定位结果
+        late = {name: picks[name] for name in 'ABCD'}
+        return [{'event': 1, 'arrivals': picks}, {'event': 1, 'arrivals': late}, {'event': 1, 'end': True}]
+
+    replies = exchange(messages, 2)
+    assert replies[0]['event'] == 1 and 'lon' in replies[0]
+    assert replies[1]['event'] == 1 and 'error' in replies[1]
+
+
+def test_message_without_event_is_rejected():
+    replies = exchange(lambda picks: [{'arrivals': picks}, {'event': 2, 'arrivals': picks}], 2)
+    assert 'error' in replies[0] and 'event' not in replies[0]
+    assert replies[1]['event'] == 2 and 'lon' in replies[1]
@@ -0,0 +1,12 @@
+"""问题二的批量场景模拟。"""
+import numpy as np
+
+from sonicboom.simulation import feasible_disc, simulate
+
+
+def test_debris_within_default_radius():
+    batch = simulate(200, 5, seed=0)
+    feasible = feasible_disc(batch.stations, 1000)[1] > 0
+    horizontal = np.linalg.norm(batch.places[:, :, None, :2] - batch.stations[:, None, :, :2], axis=-1)
+    assert feasible.any()
+    assert np.all(horizontal[feasible] < 1000)
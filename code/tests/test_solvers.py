@@ -0,0 +1,27 @@
+"""批量求解器与闭式初值。"""
+import numpy as np
+from scipy.optimize import least_squares
+
+from sonicboom.bench import synthetic_dataset
+from sonicboom.closedform import solve_closed_form
+from sonicboom.forward import leftovers_batch
+from sonicboom.solvers import default_initial_guess, solve_batch
+
+
+def test_solve_batch_matches_least_squares():
+    stations, _, times = synthetic_dataset(7, 64, error_std=0.01, seed=0)
+    guess = default_initial_guess(stations, times)
+    solution = solve_batch(times, stations, guess, v=340)
+    reference = [least_squares(leftovers_batch, x0, args=(stations, event_times, 340))
+                 for event_times, x0 in zip(times, guess)]
+    np.testing.assert_allclose(solution.x[:, :3], [result.x[:3] for result in reference], atol=1e-2)
+    np.testing.assert_allclose(solution.x[:, 3], [result.x[3] for result in reference], atol=1e-5)
+    np.testing.assert_allclose(solution.cost, [result.cost for result in reference], rtol=1e-6, atol=1e-12)
+
+
+def test_closed_form_recovers_noiseless_sources():
+    stations, sources, times = synthetic_dataset(7, 64, error_std=0.0, seed=1)
+    seed = solve_closed_form(times, stations, 340)
+    assert np.all(seed.success)
+    np.testing.assert_allclose(seed.x[:, :3], sources[:, :3], atol=0.1)
+    np.testing.assert_allclose(seed.x[:, 3], sources[:, 3], atol=1e-3)